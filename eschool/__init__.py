@@ -0,0 +1,65 @@
+# eschool/__init__.py
+# Application factory. Import paket ini murah: tidak ada koneksi MongoDB,
+# folder, thread, atau `requests` yang dibuat sampai create_app() dipanggil,
+# dan client MongoDB baru dibuka di worker saat query pertama (setelah fork).
+import atexit
+
+from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from .config import Config, ROOT_DIR
+
+
+def flush_buffers(app):
+    """Tulis log audit & komentar yang masih tertampung di proses ini."""
+    from .audit import flush_audit_log
+    from .content import flush_comment_buffer
+
+    with app.app_context():
+        for flush in (flush_audit_log, flush_comment_buffer):
+            try:
+                flush()
+            except Exception:
+                app.logger.exception("Failed to flush %s", flush.__name__)
+
+
+def create_app(config_overrides=None):
+    app = Flask(__name__, root_path=ROOT_DIR)
+    app.config.from_object(Config)
+    if config_overrides:
+        app.config.update(config_overrides)
+    if app.config["TRUSTED_PROXIES"]:
+        n = app.config["TRUSTED_PROXIES"]
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=n, x_proto=n, x_host=n)
+
+    from . import (
+        uploads, assets, cache, monitoring, security,
+        indexes, search, content, commands
+    )
+    from . import public, materials, auth, admin
+    from .db import close_client
+
+    uploads.init_app(app)
+    assets.init_app(app)
+    cache.init_app(app)
+    monitoring.init_app(app)
+    security.init_app(app)
+    indexes.init_app(app)
+    search.init_app(app)
+    content.init_app(app)
+    commands.init_app(app)
+
+    app.register_blueprint(public.bp)
+    app.register_blueprint(materials.bp)
+    app.register_blueprint(auth.bp)
+    app.register_blueprint(admin.bp)
+
+    atexit.register(flush_buffers, app)
+
+    if app.config["ENSURE_INDEXES"]:
+        with app.app_context():
+            indexes.ensure_indexes()
+            # jangan wariskan client (dan thread monitornya) ke worker hasil fork
+            close_client()
+
+    return app
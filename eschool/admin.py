@@ -0,0 +1,1379 @@
+# eschool/admin.py
+import os
+import io
+import re
+import csv
+import json
+from os.path import splitext
+from datetime import datetime, timezone, timedelta
+
+import click
+from bson.objectid import ObjectId
+from flask import (
+    Blueprint, current_app, render_template, request,
+    redirect, url_for, session, flash,
+    abort, Response, stream_with_context
+)
+from werkzeug.utils import secure_filename
+
+from .audit import log_admin_action, notifications_watermark, unread_messages_query, unread_logs_query
+from .auth import superadmin_required
+from .cache import invalidate_singletons
+from .content import (
+    MEDIA_NEWEST_FIRST, ensure_media, sync_media, remove_media,
+    category_stats_added, category_stats_removed, category_stats_edited,
+    make_image_variants, remove_image_variants
+)
+from .db import db
+from .monitoring import profile_history
+from .pagination import encode_cursor, decode_cursor, keyset_filter, get_page_arg, paginate, regex_search
+from .search import search_collection, search_terms_for, invalidate_search_cache
+from .security import PasswordBusy, hash_password, check_password
+from .uploads import allowed_image, save_upload
+
+bp = Blueprint("admin", __name__, cli_group=None)
+
+
+# ---------------------------------- #
+# 6) ADMIN: NOTIFIKASI & DASHBOARD   #
+# ---------------------------------- #
+@bp.app_context_processor
+def inject_notifications():
+    if "admin_id" not in session:
+        return {}
+
+    current_admin_id = ObjectId(session["admin_id"])
+    watermark = notifications_watermark(current_admin_id)
+
+    latest_messages = db.contact_messages.find(unread_messages_query(current_admin_id, watermark)).sort("created_at", -1).limit(3)
+    latest_logs = db.admin_logs.find(unread_logs_query(current_admin_id, watermark)).sort("timestamp", -1).limit(3)
+
+    notifications = []
+
+    for msg in latest_messages:
+        notifications.append({
+            "type": "message",
+            "id": msg["_id"],
+            "title": f"{msg.get('name')} mengirim pesan",
+            "content": msg.get('message', '')[:50] + ("..." if len(msg.get('message', '')) > 50 else ""),
+            "icon": "ti ti-mail",
+            "time": msg.get("created_at"),
+            "badge": "Pesan Baru",
+            "badge_class": "bg-light-primary"
+        })
+
+    for log in latest_logs:
+        notifications.append({
+            "type": "log",
+            "id": log["_id"],
+            "title": f"{log.get('username')} melakukan {log.get('action')}",
+            "content": log.get("description", ""),
+            "icon": "ti ti-activity",
+            "time": log.get("timestamp"),
+            "badge": "Aktivitas Admin",
+            "badge_class": "bg-light-success"
+        })
+
+    return dict(notifications=notifications)
+
+
+@bp.route("/notifications/mark_all_read")
+def mark_all_notifications_read():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    # Cukup majukan watermark admin ini
+    db.admin.update_one(
+        {"_id": ObjectId(session["admin_id"])},
+        {"$set": {"notifications_read_at": datetime.now(timezone.utc)}}
+    )
+
+    return redirect(request.referrer or url_for('admin.dashboard'))
+
+
+@bp.route("/notifications/read/<kind>/<item_id>")
+def mark_notification_read(kind, item_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    targets = {
+        "message": (db.contact_messages, "admin.admin_contact"),
+        "log":     (db.admin_logs,       "admin.admin_logs"),
+    }
+    if kind not in targets or not ObjectId.is_valid(item_id):
+        abort(404)
+
+    collection, endpoint = targets[kind]
+    collection.update_one(
+        {"_id": ObjectId(item_id)},
+        {"$addToSet": {"read_by": ObjectId(session["admin_id"])}}
+    )
+    return redirect(url_for(endpoint))
+
+
+@bp.cli.command("migrate-notifications")
+def migrate_notifications_command():
+    """Konversi array unread_by lama menjadi watermark per admin."""
+    collections = [(db.contact_messages, "created_at"), (db.admin_logs, "timestamp")]
+    now = datetime.now(timezone.utc)
+
+    for admin in db.admin.find({}, {"_id": 1}):
+        admin_id = admin["_id"]
+
+        # watermark = tepat sebelum item tertua yang masih belum dibaca
+        oldest = [
+            doc[field]
+            for coll, field in collections
+            for doc in coll.find({"unread_by": admin_id}, {field: 1}).sort(field, 1).limit(1)
+        ]
+        watermark = min(oldest) - timedelta(milliseconds=1) if oldest else now
+
+        # item setelah watermark yang sudah dibaca → override sparse read_by
+        for coll, field in collections:
+            coll.update_many(
+                {field: {"$gt": watermark}, "unread_by": {"$exists": True, "$ne": admin_id}},
+                {"$addToSet": {"read_by": admin_id}}
+            )
+        db.admin.update_one({"_id": admin_id}, {"$set": {"notifications_read_at": watermark}})
+        click.echo(f"{admin_id}: watermark {watermark.isoformat()}")
+
+    for coll, _ in collections:
+        res = coll.update_many({"unread_by": {"$exists": True}}, {"$unset": {"unread_by": ""}})
+        click.echo(f"{coll.name}: unread_by removed from {res.modified_count} document(s)")
+
+
+@bp.route("/admin/debug/queries")
+@superadmin_required
+def debug_queries():
+    return render_template(
+        "admin/debug_queries.html",
+        active_page="debug_queries",
+        profiles=list(profile_history()),
+        slow_ms=current_app.config["SLOW_REQUEST_MS"]
+    )
+
+
+@bp.route("/dashboard")
+def dashboard():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+    
+    total_classes         = db.classes.count_documents({})
+    total_extracurricular = db.extracurricular.count_documents({})
+    total_publications    = db.publications.count_documents({})
+    total_teachers        = db.teachers.count_documents({})
+    total_admins          = db.admin.count_documents({"is_blocked": False})
+    total_materials       = db.materials.count_documents({})
+    total_gallery         = db.gallery.count_documents({})
+    total_contacts        = db.contact_messages.count_documents({})
+
+    latest_notifications = list(db.contact_messages.find().sort("created_at", -1).limit(5))
+    recent_admin_logs    = list(db.admin_logs.find().sort("timestamp", -1).limit(5))
+
+    return render_template(
+        "admin/index.html",
+        active_page="dashboard",
+        total_classes=total_classes,
+        total_extracurricular=total_extracurricular,
+        total_publications=total_publications,
+        total_teachers=total_teachers,
+        total_admins=total_admins,
+        total_materials=total_materials,
+        total_gallery=total_gallery,
+        total_contacts=total_contacts,
+        latest_notifications=latest_notifications,
+        recent_admin_logs=recent_admin_logs
+    )
+
+
+# ------------------------- #
+# 7) ADMIN: MANAJEMEN GURU  #
+# ------------------------- #
+@bp.route("/admin_teachers")
+def admin_teachers():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    # ── ambil keyword pencarian ─────────────────────────
+    search = request.args.get("search", "").strip()
+
+    # ── pencarian (text index) / pagination ─────────────
+    if search:
+        result = search_collection("teachers", search, [("name", 1)], get_page_arg(), per_page=5)
+    else:
+        result = paginate(db.teachers, {}, [("name", 1)], get_page_arg(), per_page=5)
+
+    return render_template(
+        "admin/teachers.html",
+        active_page="teachers",
+        teachers=result["items"],
+        teachers_display=result["items"],
+        page=result["page"],
+        total_pages=result["total_pages"],
+        per_page=result["per_page"],
+        search=search
+    )
+
+
+@bp.route("/teachers/add", methods=["POST"])
+def add_teacher():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    teacher_id_input = request.form.get("teacher_id").strip()
+    name = request.form.get("name").strip()
+    position = request.form.get("position").strip()
+    email = request.form.get("email").strip()
+    phone = request.form.get("phone").strip()
+    instagram = request.form.get("instagram").strip()
+    facebook = request.form.get("facebook").strip()
+    linkedin = request.form.get("linkedin").strip()
+
+    # Cek duplikasi teacher_id
+    existing = db.teachers.find_one({"teacher_id": teacher_id_input})
+    if existing:
+        flash(f"Teacher ID '{teacher_id_input}' is already in use.", "danger")
+        return redirect(url_for("admin.admin_teachers"))
+
+    avatar_filename = None
+    if "avatar" in request.files:
+        file = request.files["avatar"]
+        if file and file.filename:
+            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            _, ext = splitext(secure_filename(file.filename))
+            new_filename = f"{timestamp}{ext}"
+            save_path = os.path.join(current_app.config["UPLOAD_FOLDER_TEACHERS"], new_filename)
+            save_upload(file, save_path)
+            avatar_filename = new_filename
+
+    teacher_doc = {
+        "teacher_id": teacher_id_input,
+        "name": name,
+        "position": position,
+        "email": email,
+        "phone": phone,
+        "instagram": instagram,
+        "facebook": facebook,
+        "linkedin": linkedin,
+        "avatar": avatar_filename,
+        "created_at": datetime.now(timezone.utc)
+    }
+    teacher_doc["search_terms"] = search_terms_for("teachers", teacher_doc)
+
+    db.teachers.insert_one(teacher_doc)
+    invalidate_search_cache()
+    log_admin_action(
+        session["admin_id"],
+        session["admin_username"],
+        f"Added teacher (teacher_id: {teacher_id_input})"
+    )
+    flash("Teacher successfully added.", "success")
+    return redirect(url_for("admin.admin_teachers"))
+
+
+@bp.route("/teachers/edit/<orig_teacher_id>", methods=["POST"])
+def edit_teacher(orig_teacher_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    teacher = db.teachers.find_one({"teacher_id": orig_teacher_id})
+    if not teacher:
+        flash("Teacher not found.", "danger")
+        return redirect(url_for("admin.admin_teachers"))
+
+    new_teacher_id = request.form.get("teacher_id").strip()
+    name = request.form.get("name").strip()
+    position = request.form.get("position").strip()
+    email = request.form.get("email").strip()
+    phone = request.form.get("phone").strip()
+    instagram = request.form.get("instagram").strip()
+    facebook = request.form.get("facebook").strip()
+    linkedin = request.form.get("linkedin").strip()
+
+    # Jika teacher_id berubah → cek duplikasi
+    if new_teacher_id != orig_teacher_id:
+        existing = db.teachers.find_one({"teacher_id": new_teacher_id})
+        if existing:
+            flash(f"Teacher ID '{new_teacher_id}' is already in use.", "danger")
+            return redirect(url_for("admin.admin_teachers"))
+
+    avatar = teacher.get("avatar")
+    if "avatar" in request.files:
+        file = request.files["avatar"]
+        if file and file.filename:
+            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            _, ext = splitext(secure_filename(file.filename))
+            new_filename = f"{timestamp}{ext}"
+            save_path = os.path.join(current_app.config["UPLOAD_FOLDER_TEACHERS"], new_filename)
+            save_upload(file, save_path)
+            avatar = new_filename
+
+    update = {
+        "teacher_id": new_teacher_id,
+        "name": name,
+        "position": position,
+        "email": email,
+        "phone": phone,
+        "instagram": instagram,
+        "facebook": facebook,
+        "linkedin": linkedin,
+        "avatar": avatar,
+        "updated_at": datetime.now(timezone.utc)
+    }
+    update["search_terms"] = search_terms_for("teachers", {**teacher, **update})
+
+    db.teachers.update_one({"teacher_id": orig_teacher_id}, {"$set": update})
+    invalidate_search_cache()
+    log_admin_action(
+        session["admin_id"],
+        session["admin_username"],
+        f"Edited teacher (orig_teacher_id: {orig_teacher_id}, new_teacher_id: {new_teacher_id})"
+    )
+    flash("Teacher updated successfully.", "success")
+    return redirect(url_for("admin.admin_teachers"))
+
+
+@bp.route("/teachers/delete/<teacher_id>", methods=["POST"])
+def delete_teacher(teacher_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    db.teachers.delete_one({"teacher_id": teacher_id})
+    invalidate_search_cache()
+    log_admin_action(
+        session["admin_id"],
+        session["admin_username"],
+        f"Deleted teacher (teacher_id: {teacher_id})"
+    )
+    flash("Teacher deleted successfully.", "success")
+    return redirect(url_for("admin.admin_teachers"))
+
+
+# ----------------------------------------- #
+# 8) ADMIN: MANAJEMEN NEWS & ARTICLES       #
+# ----------------------------------------- #
+@bp.route("/admin_news_articles")
+def admin_news_articles():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    # ── ambil keyword pencarian ───────────────────────
+    search = request.args.get("search", "").strip()
+
+    # ── pencarian (text index) / pagination ───────────
+    newest_first = [("created_at", -1), ("_id", -1)]
+    if search:
+        result = search_collection("publications", search, newest_first, get_page_arg(), per_page=5)
+    else:
+        result = paginate(db.publications, {}, newest_first, get_page_arg(), per_page=5)
+
+    return render_template(
+        "admin/news_articles.html",
+        active_page="news_articles",
+        articles=result["items"],
+        articles_display=result["items"],
+        page=result["page"],
+        per_page=result["per_page"],
+        total_pages=result["total_pages"],
+        search=search
+    )
+
+
+@bp.route("/articles/add", methods=["POST"])
+def add_article():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    title = request.form.get("title").strip()
+    category = request.form.get("category").strip()
+    content = request.form.get("content")  # HTML dari contenteditable
+
+    # **Hanya satu gambar feature**
+    feature_image = None
+    image_info = {"width": None, "height": None, "variants": []}
+    if "feature_image" in request.files:
+        file = request.files["feature_image"]
+        if file and file.filename:
+            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            _, ext = splitext(secure_filename(file.filename))
+            filename = f"{timestamp}{ext}"
+            save_path = os.path.join(current_app.config["UPLOAD_FOLDER_PUBLICATIONS"], filename)
+            save_upload(file, save_path)
+            feature_image = filename
+            image_info = make_image_variants(current_app.config["UPLOAD_FOLDER_PUBLICATIONS"], filename)
+
+    # **Menangani lampiran (attachment)**
+    attachment = None
+    if "attachment" in request.files:
+        file_att = request.files["attachment"]
+        if file_att and file_att.filename:
+            timestamp2 = datetime.now().strftime("%Y%m%d%H%M%S")
+            _, ext_att = splitext(secure_filename(file_att.filename))
+            filename_att = f"{timestamp2}_att{ext_att}"
+            save_path_att = os.path.join(current_app.config["UPLOAD_FOLDER_PUBLICATIONS"], filename_att)
+            save_upload(file_att, save_path_att)
+            attachment = filename_att
+
+    new_doc = {
+        "title": title,
+        "category": category,
+        "content": content,
+        "feature_image": feature_image,
+        "feature_image_width": image_info["width"],
+        "feature_image_height": image_info["height"],
+        "feature_image_variants": image_info["variants"],
+        "attachment": attachment,  # Simpan nama file lampiran
+        "author": session.get("admin_username"),
+        "comment_count": 0,
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
+    }
+    new_doc["search_terms"] = search_terms_for("publications", new_doc)
+    inserted = db.publications.insert_one(new_doc)
+    invalidate_search_cache()
+    category_stats_added(new_doc)
+    sync_media("publication", new_doc)
+    log_admin_action(
+        session["admin_id"],
+        session["admin_username"],
+        f"Added article (ID: {inserted.inserted_id})"
+    )
+    flash("Article added successfully.", "success")
+    return redirect(url_for("admin.admin_news_articles"))
+
+
+@bp.route("/articles/edit/<article_id>", methods=["POST"])
+def edit_article(article_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    try:
+        obj_id = ObjectId(article_id)
+    except:
+        flash("Invalid article ID.", "danger")
+        return redirect(url_for("admin.admin_news_articles"))
+
+    existing = db.publications.find_one({"_id": obj_id})
+    if not existing:
+        flash("Article not found.", "danger")
+        return redirect(url_for("admin.admin_news_articles"))
+
+    title = request.form.get("title").strip()
+    category = request.form.get("category").strip()
+    content = request.form.get("content")
+
+    # Ambil nama file lama (jika ada)
+    feature_image = existing.get("feature_image")
+    attachment = existing.get("attachment")
+
+    image_update = {}
+
+    # Jika ada upload baru untuk feature_image, simpan dan timpa
+    if "feature_image" in request.files:
+        file = request.files["feature_image"]
+        if file and file.filename:
+            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            _, ext = splitext(secure_filename(file.filename))
+            filename = f"{timestamp}{ext}"
+            save_path = os.path.join(current_app.config["UPLOAD_FOLDER_PUBLICATIONS"], filename)
+            save_upload(file, save_path)
+            feature_image = filename
+            image_info = make_image_variants(current_app.config["UPLOAD_FOLDER_PUBLICATIONS"], filename)
+            image_update = {
+                "feature_image_width": image_info["width"],
+                "feature_image_height": image_info["height"],
+                "feature_image_variants": image_info["variants"]
+            }
+
+    # Jika ada upload baru untuk lampiran (attachment), simpan dan timpa
+    if "attachment" in request.files:
+        file_att = request.files["attachment"]
+        if file_att and file_att.filename:
+            timestamp2 = datetime.now().strftime("%Y%m%d%H%M%S")
+            _, ext_att = splitext(secure_filename(file_att.filename))
+            filename_att = f"{timestamp2}_att{ext_att}"
+            save_path_att = os.path.join(current_app.config["UPLOAD_FOLDER_PUBLICATIONS"], filename_att)
+            save_upload(file_att, save_path_att)
+            attachment = filename_att
+
+    update = {
+        "title": title,
+        "category": category,
+        "content": content,
+        "feature_image": feature_image,
+        "attachment": attachment,
+        "updated_at": datetime.now(timezone.utc),
+        **image_update
+    }
+    update["search_terms"] = search_terms_for("publications", {**existing, **update})
+
+    db.publications.update_one({"_id": obj_id}, {"$set": update})
+    invalidate_search_cache()
+    category_stats_edited(existing.get("category"), category)
+    sync_media("publication", {**existing, **update})
+    log_admin_action(
+        session["admin_id"],
+        session["admin_username"],
+        f"Edited article (ID: {article_id})"
+    )
+    flash("Article updated successfully.", "success")
+    return redirect(url_for("admin.admin_news_articles"))
+
+
+@bp.route("/articles/delete/<article_id>", methods=["POST"])
+def delete_article(article_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    try:
+        obj_id = ObjectId(article_id)
+    except:
+        flash("Invalid article ID.", "danger")
+        return redirect(url_for("admin.admin_news_articles"))
+
+    deleted = db.publications.find_one_and_delete({"_id": obj_id}, {"category": 1})
+    if deleted:
+        invalidate_search_cache()
+        category_stats_removed(deleted.get("category"))
+        remove_media(obj_id)
+    log_admin_action(
+        session["admin_id"],
+        session["admin_username"],
+        f"Deleted article (ID: {article_id})"
+    )
+    flash("Article deleted successfully.", "success")
+    return redirect(url_for("admin.admin_news_articles"))
+
+
+# --------------------------------- #
+# 9) ADMIN: MANAJEMEN GALLERY       #
+# --------------------------------- #
+@bp.route("/admin_gallery")
+def admin_gallery():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    # ── ambil keyword pencarian ──────────────────────
+    search = request.args.get("search", "").strip().lower()
+
+    # ── pencarian / pagination dari koleksi media ───
+    ensure_media()
+    if search:
+        result = search_collection("media", search, MEDIA_NEWEST_FIRST, get_page_arg(), per_page=5)
+    else:
+        result = paginate(db.media, {}, MEDIA_NEWEST_FIRST, get_page_arg(), per_page=5)
+
+    return render_template(
+        "admin/gallery.html",
+        galleries=result["items"],
+        page=result["page"],
+        total_pages=result["total_pages"],
+        search=search
+    )
+
+
+@bp.route("/add_gallery", methods=["POST"])
+def add_gallery():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    file = request.files.get("image_file")
+    title = request.form.get("title", "").strip()
+
+    if file and file.filename:
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        _, ext = os.path.splitext(secure_filename(file.filename))
+        filename = f"{timestamp}{ext}"
+        save_path = os.path.join(current_app.config["UPLOAD_FOLDER_GALLERY"], filename)
+        save_upload(file, save_path)
+        image_info = make_image_variants(current_app.config["UPLOAD_FOLDER_GALLERY"], filename)
+
+        gallery_doc = {
+            "filename": filename,
+            "title": title,
+            "uploaded_at": datetime.now(timezone.utc),
+            **image_info
+        }
+        db.gallery.insert_one(gallery_doc)
+        sync_media("gallery", gallery_doc)
+
+        log_admin_action(
+            session["admin_id"],
+            session["admin_username"],
+            f"Added gallery image (filename: {filename})"
+        )
+
+        flash("Image uploaded successfully.", "success")
+    else:
+        flash("No file selected.", "danger")
+
+    return redirect(url_for("admin.admin_gallery"))
+
+
+@bp.route("/edit_gallery/<gallery_id>", methods=["POST"])
+def edit_gallery(gallery_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    try:
+        obj_id = ObjectId(gallery_id)
+    except:
+        flash("Invalid gallery ID.", "danger")
+        return redirect(url_for("admin.admin_gallery"))
+
+    gallery = db.gallery.find_one({"_id": obj_id})
+    if not gallery:
+        flash("Gallery image not found.", "danger")
+        return redirect(url_for("admin.admin_gallery"))
+
+    title = request.form.get("title", "").strip()
+
+    # Ganti gambar jika ada file baru
+    filename = gallery.get("filename")
+    image_info = {}
+    if "image_file" in request.files:
+        file = request.files["image_file"]
+        if file and file.filename:
+            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            _, ext = os.path.splitext(secure_filename(file.filename))
+            new_filename = f"{timestamp}{ext}"
+            save_path = os.path.join(current_app.config["UPLOAD_FOLDER_GALLERY"], new_filename)
+            save_upload(file, save_path)
+            filename = new_filename
+            image_info = make_image_variants(current_app.config["UPLOAD_FOLDER_GALLERY"], new_filename)
+
+    update = {
+        "title": title,
+        "filename": filename,
+        "updated_at": datetime.now(timezone.utc),
+        **image_info
+    }
+    db.gallery.update_one({"_id": obj_id}, {"$set": update})
+    sync_media("gallery", {**gallery, **update})
+
+    log_admin_action(
+        session["admin_id"],
+        session["admin_username"],
+        f"Edited gallery image (ID: {gallery_id})"
+    )
+
+    flash("Gallery image updated successfully.", "success")
+    return redirect(url_for("admin.admin_gallery"))
+
+
+@bp.route("/delete_gallery/<gallery_id>", methods=["POST"])
+def delete_gallery(gallery_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    try:
+        obj_id = ObjectId(gallery_id)
+    except:
+        flash("Invalid gallery ID.", "danger")
+        return redirect(url_for("admin.admin_gallery"))
+
+    img = db.gallery.find_one({"_id": obj_id})
+    if img:
+        # Hapus file dari folder
+        img_path = os.path.join(current_app.config["UPLOAD_FOLDER_GALLERY"], img["filename"])
+        if os.path.exists(img_path):
+            os.remove(img_path)
+        remove_image_variants(current_app.config["UPLOAD_FOLDER_GALLERY"], img.get("variants"))
+
+        # Hapus dari database
+        db.gallery.delete_one({"_id": obj_id})
+        remove_media(obj_id)
+
+        log_admin_action(
+            session["admin_id"],
+            session["admin_username"],
+            f"Deleted gallery image (ID: {gallery_id}, filename: {img['filename']})"
+        )
+
+        flash("Image deleted successfully.", "success")
+    else:
+        flash("Image not found.", "danger")
+
+    return redirect(url_for("admin.admin_gallery"))
+
+
+# ------------------------------- #
+# 10) ADMIN: MANAJEMEN CONTACT    #
+# ------------------------------- #
+
+
+@bp.route("/admin_contact")
+def admin_contact():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    contact = db.contact.find_one() or {}
+
+    # Ambil search keyword
+    search = request.args.get("search", "").strip().lower()
+
+    # Filter, sort & pagination di MongoDB
+    query = regex_search(["name", "email", "subject"], search) if search else {}
+    result = paginate(db.contact_messages, query, [("created_at", -1)], get_page_arg(), per_page=5)
+
+    return render_template(
+        "admin/contact.html",
+        contact=contact,
+        contact_messages=result["items"],
+        page=result["page"],
+        per_page=result["per_page"],
+        total_pages=result["total_pages"],
+        search=search
+    )
+
+
+@bp.route("/update_contact", methods=["POST"])
+def update_contact():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    # Ambil data input
+    address  = request.form.get("address", "").strip()
+    email    = request.form.get("email", "").strip()
+    phone    = request.form.get("phone", "").strip()
+    hours    = request.form.get("hours", "").strip()
+    map_url  = request.form.get("map_url", "").strip()
+
+    data = {
+        "address": address,
+        "email": email,
+        "phone": phone,
+        "hours": hours,
+        "map_url": map_url,
+        "updated_at": datetime.now(timezone.utc)
+    }
+
+    if db.contact.count_documents({}) > 0:
+        db.contact.update_one({}, {"$set": data})
+        action = f"Updated contact info: Address='{address}', Email='{email}', Phone='{phone}', Hours='{hours}', Map URL='{map_url}'"
+    else:
+        db.contact.insert_one(data)
+        action = f"Inserted contact info: Address='{address}', Email='{email}', Phone='{phone}', Hours='{hours}', Map URL='{map_url}'"
+    invalidate_singletons()
+
+    log_admin_action(
+        session["admin_id"],
+        session["admin_username"],
+        action
+    )
+
+    flash("Contact info updated successfully.", "success")
+    return redirect(url_for("admin.admin_contact"))
+
+
+@bp.route("/delete_contact_message/<message_id>", methods=["POST"])
+def delete_contact_message(message_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    try:
+        message = db.contact_messages.find_one({"_id": ObjectId(message_id)})
+        if not message:
+            flash("Message not found.", "warning")
+            return redirect(url_for("admin.admin_contact"))
+
+        # Hapus pesan
+        db.contact_messages.delete_one({"_id": ObjectId(message_id)})
+
+        # Catat log admin
+        action = f"Deleted contact message from '{message.get('name', '')}' with subject '{message.get('subject', '')}'."
+        log_admin_action(session["admin_id"], session["admin_username"], action)
+
+        flash("Message deleted successfully.", "success")
+
+    except Exception as e:
+        flash(f"Error deleting message: {e}", "danger")
+
+    return redirect(url_for("admin.admin_contact"))
+
+
+# --------------------------------- #
+# 11) ADMIN: MANAJEMEN ABOUT        #
+# --------------------------------- #
+@bp.route("/admin_about", methods=["GET", "POST"])
+def admin_about():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    about_data = db.about.find_one()
+    settings = db.settings.find_one({}) or {}
+
+    # --- POST update About Section (Deskripsi, Visi, Misi, Gambar Deskripsi) ---
+    if request.method == "POST" and request.form.get("form_type") is None:
+        description = request.form.get("description", "").strip()
+        vision_raw = request.form.get("vision", "").strip()
+        mission_raw = request.form.get("mission", "").strip()
+        description_image_file = request.files.get("description_image")
+
+        content = {
+            "description": description,
+            "vision": [v.strip() for v in vision_raw.splitlines() if v.strip()],
+            "mission": [m.strip() for m in mission_raw.splitlines() if m.strip()],
+            "updated_at": datetime.now(timezone.utc)
+        }
+
+        # Simpan gambar deskripsi jika diunggah
+        if description_image_file and description_image_file.filename and allowed_image(description_image_file.filename):
+            ext = os.path.splitext(secure_filename(description_image_file.filename))[1]
+            ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+            fname = f"{ts}{ext}"
+            save_upload(description_image_file, os.path.join(current_app.config['UPLOAD_FOLDER_ABOUT'], fname))
+            content["description_image"] = fname
+
+        if about_data:
+            db.about.update_one({}, {"$set": content})
+            log_admin_action(session["admin_id"], session["admin_username"], "Updated About section")
+            flash("Konten tentang sekolah berhasil diperbarui.", "success")
+        else:
+            db.about.insert_one(content)
+            log_admin_action(session["admin_id"], session["admin_username"], "Inserted About section")
+            flash("Konten tentang sekolah berhasil ditambahkan.", "success")
+
+        invalidate_singletons()
+        return redirect(url_for("admin.admin_about"))
+
+    # --- POST update School Settings (Logo, Header, Banner Utama, Tagline) ---
+    if request.method == "POST" and request.form.get("form_type") == "school":
+        school_name = request.form.get("school_name", "").strip()
+        school_tagline = request.form.get("school_tagline", "").strip()  # ← Tambahan
+        header_file = request.files.get("header_image")
+        logo_file = request.files.get("school_logo")
+        main_banner_file = request.files.get("main_banner_image")
+
+        update = {
+            "school_name": school_name,
+            "school_tagline": school_tagline  # ← Tambahan
+        }
+
+        if header_file and header_file.filename and allowed_image(header_file.filename):
+            ext = os.path.splitext(secure_filename(header_file.filename))[1]
+            ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+            fname = f"{ts}{ext}"
+            save_upload(header_file, os.path.join(current_app.config['UPLOAD_FOLDER_HEADERS'], fname))
+            update["header_image"] = fname
+
+        if logo_file and logo_file.filename and allowed_image(logo_file.filename):
+            ext = os.path.splitext(secure_filename(logo_file.filename))[1]
+            ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+            fname = f"{ts}{ext}"
+            save_upload(logo_file, os.path.join(current_app.config['UPLOAD_FOLDER_LOGO'], fname))
+            update["school_logo"] = fname
+
+        if main_banner_file and main_banner_file.filename and allowed_image(main_banner_file.filename):
+            ext = os.path.splitext(secure_filename(main_banner_file.filename))[1]
+            ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+            fname = f"{ts}{ext}"
+            save_upload(main_banner_file, os.path.join(current_app.config['UPLOAD_FOLDER_MAIN_HEADERS'], fname))
+            update["main_banner_image"] = fname
+
+        db.settings.update_one({}, {"$set": update}, upsert=True)
+        invalidate_singletons()
+        log_admin_action(session["admin_id"], session["admin_username"], "Updated school settings (from About page)")
+        flash("Pengaturan sekolah berhasil diperbarui.", "success")
+        return redirect(url_for("admin.admin_about"))
+
+    # --- POST update Headmaster Message ---
+    if request.method == "POST" and request.form.get("form_type") == "headmaster":
+        headmaster_name = request.form.get("headmaster_name", "").strip()
+        headmaster_message = request.form.get("headmaster_message", "").strip()
+        headmaster_photo = request.files.get("headmaster_photo")
+
+        update = {
+            "headmaster_name": headmaster_name,
+            "headmaster_message": headmaster_message
+        }
+
+        if headmaster_photo and headmaster_photo.filename and allowed_image(headmaster_photo.filename):
+            ext = os.path.splitext(secure_filename(headmaster_photo.filename))[1]
+            ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+            fname = f"{ts}{ext}"
+            save_upload(headmaster_photo, os.path.join(current_app.config['UPLOAD_FOLDER_AVATAR'], fname))
+            update["headmaster_photo"] = fname
+
+        db.settings.update_one({}, {"$set": update}, upsert=True)
+        invalidate_singletons()
+        log_admin_action(session["admin_id"], session["admin_username"], "Updated headmaster message")
+        flash("Sambutan kepala sekolah berhasil diperbarui.", "success")
+        return redirect(url_for("admin.admin_about"))
+
+    return render_template(
+        "admin/about.html",
+        active_page="admin_about",
+        about=about_data,
+        settings=settings
+    )
+
+
+# ---------------------------------------- #
+# 12) ADMIN: MANAJEMEN EXTRACURRICULAR     #
+# ---------------------------------------- #
+@bp.route("/admin_extracurricular", methods=["GET", "POST"])
+def admin_extracurricular():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    # Ambil parameter pencarian
+    search_query = request.args.get("search", "").strip()
+
+    # Pencarian (text index) / pagination
+    if search_query:
+        result = search_collection("extracurricular", search_query, [("name", 1)], get_page_arg(), per_page=5)
+    else:
+        result = paginate(db.extracurricular, {}, [("name", 1)], get_page_arg(), per_page=5)
+
+    return render_template(
+        "admin/extracurricular.html",
+        active_page="admin_extracurricular",
+        extracurriculars=result["items"],
+        page=result["page"],
+        total_pages=result["total_pages"],
+        search=search_query
+    )
+
+
+@bp.route("/add_extracurricular", methods=["POST"])
+def add_extracurricular():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    name = request.form.get("name", "").strip()
+    description = request.form.get("description", "").strip()
+    image_file = request.files.get("image")
+
+    filename = ""
+    if image_file and image_file.filename:
+        if not allowed_image(image_file.filename):
+            flash("Image type not allowed", "danger")
+            return redirect(url_for("admin.admin_extracurricular"))
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        _, ext = os.path.splitext(secure_filename(image_file.filename))
+        filename = f"{timestamp}{ext}"
+        image_path = os.path.join(current_app.config["UPLOAD_FOLDER_EXTRACURRICULAR"], filename)
+        save_upload(image_file, image_path)
+
+    ex_doc = {
+        "name": name,
+        "description": description,
+        "image": filename,
+        "created_at": datetime.now(timezone.utc)
+    }
+    ex_doc["search_terms"] = search_terms_for("extracurricular", ex_doc)
+    db.extracurricular.insert_one(ex_doc)
+    invalidate_search_cache()
+
+    log_admin_action(session["admin_id"], session["admin_username"], f"Added extracurricular: {name}")
+    flash("Extracurricular added successfully.", "success")
+    return redirect(url_for("admin.admin_extracurricular"))
+
+
+@bp.route("/edit_extracurricular/<id>", methods=["POST"])
+def edit_extracurricular(id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    name = request.form.get("name", "").strip()
+    description = request.form.get("description", "").strip()
+    image_file = request.files.get("image")
+
+    update_data = {
+        "name": name,
+        "description": description
+    }
+    update_data["search_terms"] = search_terms_for("extracurricular", update_data)
+
+    if image_file and image_file.filename:
+        if not allowed_image(image_file.filename):
+            flash("Image type not allowed", "danger")
+            return redirect(url_for("admin.admin_extracurricular"))
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        _, ext = os.path.splitext(secure_filename(image_file.filename))
+        filename = f"{timestamp}{ext}"
+        image_path = os.path.join(current_app.config["UPLOAD_FOLDER_EXTRACURRICULAR"], filename)
+        save_upload(image_file, image_path)
+        update_data["image"] = filename
+
+    db.extracurricular.update_one({"_id": ObjectId(id)}, {"$set": update_data})
+    invalidate_search_cache()
+
+    log_admin_action(session["admin_id"], session["admin_username"], f"Updated extracurricular: {name}")
+    flash("Extracurricular updated successfully.", "success")
+    return redirect(url_for("admin.admin_extracurricular"))
+
+
+@bp.route("/delete_extracurricular/<id>", methods=["POST"])
+def delete_extracurricular(id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    item = db.extracurricular.find_one({"_id": ObjectId(id)})
+    if item:
+        db.extracurricular.delete_one({"_id": ObjectId(id)})
+        invalidate_search_cache()
+        log_admin_action(session["admin_id"], session["admin_username"], f"Deleted extracurricular: {item.get('name', 'Unknown')}")
+        flash("Extracurricular deleted successfully.", "success")
+    else:
+        flash("Extracurricular not found.", "danger")
+    return redirect(url_for("admin.admin_extracurricular"))
+
+
+# ---------------------------------------- #
+# 13) ADMIN: LOG ADMIN                     #
+# ---------------------------------------- #
+# Log dibaca per halaman dengan keyset cursor pada (timestamp, _id);
+# filter admin / aksi / rentang tanggal memakai index di INDEXES.
+AUDIT_LOG_PAGE_SIZES = (10, 25, 50, 100)
+AUDIT_EXPORT_FIELDS  = ("timestamp", "username", "admin_id", "action", "description")
+AUDIT_LOG_NEWEST_FIRST = [("timestamp", -1), ("_id", -1)]
+
+
+def admin_log_filters():
+    """Bangun query MongoDB dari parameter ?admin=&action=&from=&to=."""
+    query = {}
+    args = {k: request.args.get(k, "").strip() for k in ("admin", "action", "from", "to")}
+
+    if ObjectId.is_valid(args["admin"]):
+        query["admin_id"] = ObjectId(args["admin"])
+    if args["action"]:
+        # prefix match (ter-anchor) — "Deleted", "Updated teacher", ...
+        query["action"] = {"$regex": "^" + re.escape(args["action"]), "$options": ""}
+
+    date_range = {}
+    try:
+        if args["from"]:
+            date_range["$gte"] = datetime.strptime(args["from"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        if args["to"]:
+            date_range["$lt"] = datetime.strptime(args["to"], "%Y-%m-%d").replace(tzinfo=timezone.utc) + timedelta(days=1)
+    except ValueError:
+        flash("Format tanggal tidak valid.", "warning")
+    if date_range:
+        query["timestamp"] = date_range
+
+    return query, {k: v for k, v in args.items() if v}
+
+
+@bp.route("/admin_logs")
+def admin_logs():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    try:
+        limit = int(request.args.get("limit", 25))
+    except ValueError:
+        limit = 25
+    if limit not in AUDIT_LOG_PAGE_SIZES:
+        limit = 25
+
+    query, filters = admin_log_filters()
+    after  = decode_cursor(request.args.get("after", ""))
+    before = decode_cursor(request.args.get("before", ""))
+
+    # ambil satu baris ekstra untuk mengetahui apakah masih ada halaman berikutnya
+    if before:
+        value, obj_id, page = before
+        rows = list(
+            db.admin_logs.find({"$and": [query, keyset_filter(value, obj_id, "before", "timestamp")]})
+                         .sort([("timestamp", 1), ("_id", 1)]).limit(limit + 1)
+        )
+        has_more = True
+        has_prev = len(rows) > limit
+        logs = rows[:limit][::-1]
+    else:
+        if after:
+            value, obj_id, page = after
+            query_page = {"$and": [query, keyset_filter(value, obj_id, "after", "timestamp")]}
+        else:
+            page, query_page = 1, query
+        rows = list(db.admin_logs.find(query_page).sort(AUDIT_LOG_NEWEST_FIRST).limit(limit + 1))
+        has_more = len(rows) > limit
+        has_prev = page > 1
+        logs = rows[:limit]
+
+    next_cursor = encode_cursor(logs[-1], page + 1, "timestamp") if logs and has_more else None
+    prev_cursor = encode_cursor(logs[0], page - 1, "timestamp") if logs and has_prev else None
+
+    admins = list(db.admin.find({}, {"username": 1}).sort("username", 1))
+
+    return render_template(
+        "admin/log_admin.html",
+        logs=logs,
+        limit=limit,
+        page_sizes=AUDIT_LOG_PAGE_SIZES,
+        offset=(page - 1) * limit,
+        filters=filters,
+        admins=admins,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor
+    )
+
+
+@bp.route("/admin_logs/export.<fmt>")
+def export_admin_logs(fmt):
+    """Unduh log (dengan filter yang sama) sebagai CSV / NDJSON secara streaming."""
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+    if fmt not in ("csv", "ndjson"):
+        abort(404)
+
+    query, _ = admin_log_filters()
+    cursor = db.admin_logs.find(query, {f: 1 for f in AUDIT_EXPORT_FIELDS}) \
+                          .sort(AUDIT_LOG_NEWEST_FIRST).batch_size(1000)
+
+    def row_values(log):
+        return [
+            log["timestamp"].isoformat() if log.get("timestamp") else "",
+            log.get("username", ""),
+            str(log.get("admin_id", "")),
+            log.get("action", ""),
+            log.get("description", "")
+        ]
+
+    def generate():
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(AUDIT_EXPORT_FIELDS)
+            for log in cursor:
+                writer.writerow(row_values(log))
+                if buf.tell() >= 64 * 1024:
+                    yield buf.getvalue()
+                    buf.seek(0)
+                    buf.truncate()
+            yield buf.getvalue()
+        else:
+            for log in cursor:
+                yield json.dumps(dict(zip(AUDIT_EXPORT_FIELDS, row_values(log))), ensure_ascii=False) + "\n"
+
+    log_admin_action(session["admin_id"], session["admin_username"], f"Exported admin logs ({fmt})")
+    filename = f"admin_logs_{datetime.now().strftime('%Y%m%d%H%M%S')}.{fmt}"
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/csv" if fmt == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+@bp.cli.command("archive-admin-logs")
+@click.option("--keep-months", default=3, show_default=True,
+              help="Jumlah bulan terakhir yang tetap di koleksi admin_logs.")
+def archive_admin_logs_command(keep_months):
+    """Pindahkan log lama ke koleksi arsip bulanan admin_logs_archive_YYYY_MM."""
+    now = datetime.now(timezone.utc)
+    month = now.year * 12 + now.month - 1 - keep_months
+    cutoff = datetime(month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+
+    oldest = db.admin_logs.find_one({"timestamp": {"$lt": cutoff}}, sort=[("timestamp", 1)])
+    if not oldest:
+        click.echo("Nothing to archive.")
+        return
+
+    start = datetime(oldest["timestamp"].year, oldest["timestamp"].month, 1, tzinfo=timezone.utc)
+    while start < cutoff:
+        end = datetime(start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=timezone.utc)
+        month_range = {"timestamp": {"$gte": start, "$lt": end}}
+        target = f"admin_logs_archive_{start:%Y_%m}"
+
+        # $merge idempoten: aman dijalankan ulang bila proses terputus
+        db.admin_logs.aggregate([
+            {"$match": month_range},
+            {"$merge": {"into": target, "on": "_id", "whenMatched": "keepExisting"}}
+        ])
+        moved = db.admin_logs.delete_many(month_range).deleted_count
+        click.echo(f"{target}: {moved} log(s) archived")
+        start = end
+
+
+# ---------------------------------------- #
+# 14) ADMIN: SETTING                       #
+# ---------------------------------------- #
+@bp.route("/admin/settings", methods=["GET", "POST"])
+def admin_settings():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    admin_record = db.admin.find_one({"_id": ObjectId(session["admin_id"])})
+    settings     = db.settings.find_one({}) or {}
+
+    if request.method == "POST":
+        form = request.form.get("form_type")
+
+        # ── PROFILE ─────────────────────
+        if form == "profile":
+            username     = request.form.get("username", "").strip()
+            name         = request.form.get("name", "").strip()
+            email        = request.form.get("email", "").strip()
+            avatar_file  = request.files.get("avatar")
+
+            update = {"username": username, "name": name, "email": email}
+            if avatar_file and avatar_file.filename and allowed_image(avatar_file.filename):
+                ext      = os.path.splitext(secure_filename(avatar_file.filename))[1]
+                ts       = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+                filename = f"{ts}{ext}"
+                save_upload(avatar_file, os.path.join(current_app.config['UPLOAD_FOLDER_AVATAR'], filename))
+                update["avatar"] = filename
+
+            db.admin.update_one({"_id": admin_record["_id"]}, {"$set": update})
+            session["admin_username"] = username
+            log_admin_action(
+                session["admin_id"],
+                session["admin_username"],
+                "Updated own profile"
+            )
+            flash("Profile updated.", "success")
+
+        # ── SECURITY & PASSWORD ─────────
+        elif form == "security":
+            current_pw = request.form.get("current_password", "")
+            new_pw     = request.form.get("new_password", "")
+            confirm_pw = request.form.get("confirm_password", "")
+
+            try:
+                current_ok = check_password(current_pw, admin_record["password_hash"])
+            except PasswordBusy:
+                flash("Server is busy. Please try again shortly.", "warning")
+                return redirect(url_for("admin.admin_settings"))
+
+            if not current_ok:
+                flash("Current password is incorrect.", "danger")
+            elif new_pw != confirm_pw:
+                flash("New passwords do not match.", "danger")
+            else:
+                new_hash = hash_password(new_pw)
+                db.admin.update_one(
+                    {"_id": admin_record["_id"]},
+                    {"$set": {"password_hash": new_hash}}
+                )
+                log_admin_action(
+                    session["admin_id"],
+                    session["admin_username"],
+                    "Changed own password"
+                )
+                flash("Password changed successfully.", "success")
+
+        invalidate_singletons()
+        return redirect(url_for("admin.admin_settings"))
+
+    # on GET, re-load records
+    admin_record = db.admin.find_one({"_id": ObjectId(session["admin_id"])})
+    settings     = db.settings.find_one({}) or {}
+    return render_template(
+        "admin/settings.html",
+        admin=admin_record,
+        settings=settings,
+        active_page="settings"
+    )
+
+
+# ---------------------------------------- #
+# 15) ADMIN: SETTING ADMIN               #
+# ---------------------------------------- #
+@bp.route("/admin/admins")
+@superadmin_required
+def admin_list():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    # ── parameter halaman dan search ─────────────────────────
+    search  = request.args.get("search", "").strip().lower()
+
+    # Filter & pagination admin di MongoDB
+    query  = regex_search(["username", "name", "email"], search) if search else {}
+    result = paginate(db.admin, query, [("username", 1)], get_page_arg(), per_page=5)
+
+    return render_template(
+        "admin/admin.html",
+        admins=result["items"],
+        admins_page=result["items"],
+        page=result["page"],
+        per_page=result["per_page"],
+        total_pages=result["total_pages"],
+        search=search,
+        active_page="admins"
+    )
+
+
+@bp.route("/add_admin", methods=["POST"])
+def add_admin():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    username = request.form.get("username").strip()
+    name     = request.form.get("name").strip()
+    email    = request.form.get("email").strip()
+    password = request.form.get("password").strip()
+    role     = request.form.get("role")
+    avatar   = request.files.get("avatar")
+
+    avatar_filename = "default_admin.png"
+    if avatar and avatar.filename and allowed_image(avatar.filename):
+        ext = os.path.splitext(secure_filename(avatar.filename))[1]
+        fname = datetime.utcnow().strftime("%Y%m%d%H%M%S") + ext
+        save_upload(avatar, os.path.join(current_app.config["UPLOAD_FOLDER_AVATAR"], fname))
+        avatar_filename = fname
+
+    hashed = hash_password(password)
+
+    db.admin.insert_one({
+        "username": username,
+        "name": name,
+        "email": email,
+        "password_hash": hashed,
+        "role": role,
+        "avatar": avatar_filename,
+        "is_blocked": False,
+        "created_at": datetime.utcnow(),
+        "notifications_read_at": datetime.now(timezone.utc),
+    })
+
+    log_admin_action(session["admin_id"], session["admin_username"], f"Added admin: {username}")
+    return redirect(url_for("admin.admin_list"))
+
+
+@bp.route("/delete_admin/<admin_id>", methods=["POST"])
+def delete_admin(admin_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    admin = db.admin.find_one({"_id": ObjectId(admin_id)})
+    if admin:
+        db.admin.delete_one({"_id": ObjectId(admin_id)})
+        log_admin_action(session["admin_id"], session["admin_username"], f"Deleted admin: {admin['username']}")
+
+    return redirect(url_for("admin.admin_list"))
+
+
+@bp.route("/block_admin/<admin_id>", methods=["POST"])
+def block_admin(admin_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    admin = db.admin.find_one({"_id": ObjectId(admin_id)})
+    if admin:
+        new_status = not admin.get("is_blocked", False)
+        db.admin.update_one({"_id": ObjectId(admin_id)}, {"$set": {"is_blocked": new_status}})
+        status_txt = "Blocked" if new_status else "Unblocked"
+        log_admin_action(session["admin_id"], session["admin_username"], f"{status_txt} admin: {admin['username']}")
+
+    return redirect(url_for("admin.admin_list"))
+
+
+@bp.route("/edit_admin/<admin_id>", methods=["POST"])
+def edit_admin(admin_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    name   = request.form.get("name").strip()
+    email  = request.form.get("email").strip()
+    role   = request.form.get("role")
+
+    db.admin.update_one(
+        {"_id": ObjectId(admin_id)},
+        {"$set": {"name": name, "email": email, "role": role}}
+    )
+
+    log_admin_action(session["admin_id"], session["admin_username"], f"Edited admin: {admin_id}")
+    return redirect(url_for("admin.admin_list"))
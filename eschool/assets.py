@@ -0,0 +1,151 @@
+# eschool/assets.py
+import os
+import re
+import json
+import gzip
+import shutil
+import hashlib
+import mimetypes
+from os.path import splitext
+
+import click
+from flask import current_app, request, send_from_directory, abort
+from werkzeug.security import safe_join
+
+from .config import STATIC_DIR
+
+try:
+    import brotli
+except ImportError:  # brotli opsional: tanpa brotli hanya .gz yang dibuat
+    brotli = None
+
+# ------------------------------------------ #
+# 3a) STATIC ASSETS: FINGERPRINT & KOMPRESI  #
+# ------------------------------------------ #
+# `flask build-assets` menyalin static/admin & static/user ke static/build
+# dengan nama ber-hash isi file (style.3fa2b1c0.css) + versi .gz/.br, dan
+# menulis manifest.json. Bila manifest ada, url_for('static', ...) otomatis
+# mengarah ke file ber-hash yang di-cache browser selama satu tahun.
+ASSET_SOURCE_DIRS = ("admin", "user")
+ASSET_BUILD_DIR = os.path.join(STATIC_DIR, "build")
+ASSET_MANIFEST_PATH = os.path.join(ASSET_BUILD_DIR, "manifest.json")
+ASSET_COMPRESS_EXTS = {".css", ".js", ".svg", ".json", ".html", ".txt", ".ttf", ".eot", ".map"}
+ASSET_IMMUTABLE_MAX_AGE = 31536000
+CSS_URL_RE = re.compile(r"url\(\s*(['\"]?)([^'\")]+)\1\s*\)")
+
+
+def load_asset_manifest():
+    try:
+        with open(ASSET_MANIFEST_PATH, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def fingerprint_static_url(endpoint, values):
+    if endpoint == "static" and current_app.config["ASSET_MANIFEST"]:
+        hashed = current_app.config["ASSET_MANIFEST"].get(values.get("filename"))
+        if hashed:
+            values["filename"] = hashed
+
+
+def _rewrite_css_urls(css, css_rel, manifest):
+    """Arahkan url(...) di CSS ke nama file ber-hash (path relatif tetap relatif)."""
+    css_dir = os.path.dirname(css_rel)
+    build_css_dir = "/build/" + css_dir
+
+    def replace(match):
+        quote, ref = match.group(1), match.group(2).strip()
+        if ref.startswith(("data:", "http:", "https:", "//", "/", "#")):
+            return match.group(0)
+
+        path, suffix = ref, ""
+        cut = re.search(r"[?#]", ref)
+        if cut:
+            path, suffix = ref[:cut.start()], ref[cut.start():]
+
+        target = os.path.normpath(os.path.join(css_dir, path)).replace(os.sep, "/")
+        hashed = manifest.get(target)
+        if not hashed:
+            return match.group(0)
+        new_ref = os.path.relpath("/" + hashed, build_css_dir).replace(os.sep, "/")
+        return f"url({quote}{new_ref}{suffix}{quote})"
+
+    return CSS_URL_RE.sub(replace, css)
+
+
+def _write_asset(rel_path, data, manifest):
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    stem, ext = splitext(rel_path)
+    hashed_rel = f"{stem}.{digest}{ext}"
+    out_path = os.path.join(ASSET_BUILD_DIR, hashed_rel)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, "wb") as fh:
+        fh.write(data)
+
+    if ext.lower() in ASSET_COMPRESS_EXTS:
+        with open(out_path + ".gz", "wb") as fh:
+            fh.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(out_path + ".br", "wb") as fh:
+                fh.write(brotli.compress(data, quality=11))
+
+    manifest[rel_path] = "build/" + hashed_rel
+
+
+@click.command("build-assets")
+def build_assets_command():
+    """Tulis aset ber-hash + .gz/.br ke static/build dan perbarui manifest."""
+    shutil.rmtree(ASSET_BUILD_DIR, ignore_errors=True)
+    manifest = {}
+    css_files = []
+
+    for source in ASSET_SOURCE_DIRS:
+        for root, _, files in os.walk(os.path.join(STATIC_DIR, source)):
+            for name in sorted(files):
+                rel_path = os.path.relpath(os.path.join(root, name), STATIC_DIR).replace(os.sep, "/")
+                if name.endswith(".css"):
+                    css_files.append(rel_path)
+                    continue
+                with open(os.path.join(root, name), "rb") as fh:
+                    _write_asset(rel_path, fh.read(), manifest)
+
+    # CSS terakhir supaya referensi font/gambar di dalamnya sudah punya hash
+    for rel_path in css_files:
+        with open(os.path.join(STATIC_DIR, rel_path), encoding="utf-8", errors="surrogateescape") as fh:
+            css = _rewrite_css_urls(fh.read(), rel_path, manifest)
+        _write_asset(rel_path, css.encode("utf-8", errors="surrogateescape"), manifest)
+
+    with open(ASSET_MANIFEST_PATH, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=1, sort_keys=True)
+    click.echo(f"Fingerprinted {len(manifest)} asset(s) into {ASSET_BUILD_DIR}.")
+
+
+def static_build(filename):
+    """Aset ber-hash: cache immutable + varian br/gzip yang sudah dikompres."""
+    path = safe_join(ASSET_BUILD_DIR, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    encoding, served = None, filename
+    for enc, ext in (("br", ".br"), ("gzip", ".gz")):
+        if enc in request.accept_encodings and os.path.isfile(path + ext):
+            encoding, served = enc, filename + ext
+            break
+
+    response = send_from_directory(
+        ASSET_BUILD_DIR, served, mimetype=mimetype, max_age=ASSET_IMMUTABLE_MAX_AGE
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = f"public, max-age={ASSET_IMMUTABLE_MAX_AGE}, immutable"
+    return response
+
+
+def init_app(app):
+    app.config["ASSET_MANIFEST"] = load_asset_manifest()
+    app.url_defaults(fingerprint_static_url)
+    app.add_url_rule("/static/build/<path:filename>", "static_build", static_build)
+    app.cli.add_command(build_assets_command)
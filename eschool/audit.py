@@ -0,0 +1,106 @@
+# eschool/audit.py
+import threading
+from datetime import datetime, timezone
+
+from bson.objectid import ObjectId
+from flask import current_app
+from pymongo.errors import BulkWriteError, PyMongoError
+from pymongo.write_concern import WriteConcern
+
+from .db import db
+from .flusher import BackgroundFlusher
+
+# ----------------------------------------- #
+# 4) HELPER: LOG ADMIN & NOTIFIKASI ACTION  #
+# ----------------------------------------- #
+# Status baca notifikasi memakai watermark per admin
+# (`admin.notifications_read_at`): item lebih baru dari watermark dianggap
+# belum dibaca. Item yang dibaca satu per satu sebelum watermark maju
+# dicatat di array sparse `read_by` pada item itu sendiri.
+#
+# Log audit ditampung di memori lalu ditulis per batch (insert_many) oleh
+# thread latar belakang, saat buffer mencapai AUDIT_BATCH_SIZE atau setiap
+# AUDIT_FLUSH_INTERVAL detik. Jika buffer penuh (AUDIT_BUFFER_MAX), entri
+# ditulis langsung agar tidak ada yang hilang.
+_audit_buffer = []
+_audit_lock = threading.Lock()
+
+
+def audit_collection():
+    w = current_app.config["AUDIT_WRITE_CONCERN"]
+    return db.admin_logs.with_options(write_concern=WriteConcern(w=int(w) if w.isdigit() else w))
+
+
+def log_admin_action(admin_id, username, action, description=None):
+    entry = {
+        "admin_id": ObjectId(admin_id),
+        "username": username,
+        "action": action,
+        "description": description or "",
+        "timestamp": datetime.now(timezone.utc)
+    }
+
+    if current_app.config["AUDIT_LOG_ASYNC"]:
+        with _audit_lock:
+            queued = len(_audit_buffer) < current_app.config["AUDIT_BUFFER_MAX"]
+            if queued:
+                _audit_buffer.append(entry)
+                is_full = len(_audit_buffer) >= current_app.config["AUDIT_BATCH_SIZE"]
+        if queued:
+            _audit_flusher.start()
+            if is_full:
+                _audit_flusher.wake()
+            return
+        current_app.logger.warning("Audit buffer full, writing log entry synchronously")
+
+    audit_collection().insert_one(entry)
+
+
+def _requeue_audit(entries):
+    # kembalikan ke depan buffer, dicoba lagi pada flush berikutnya
+    with _audit_lock:
+        _audit_buffer[:0] = entries
+
+
+def flush_audit_log():
+    """Tulis seluruh log audit yang tertampung; kembalikan jumlahnya."""
+    written = 0
+    while True:
+        with _audit_lock:
+            batch = _audit_buffer[:current_app.config["AUDIT_BATCH_SIZE"]]
+            del _audit_buffer[:len(batch)]
+        if not batch:
+            return written
+        try:
+            audit_collection().insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            # insert_many sudah memberi _id: entri yang tersimpan pada percobaan
+            # sebelumnya hanya menghasilkan duplicate key (11000) → dianggap
+            # tertulis; hanya entri yang benar-benar gagal dikembalikan
+            failed = [batch[err["index"]] for err in e.details.get("writeErrors", [])
+                      if err["code"] != 11000]
+            if failed:
+                _requeue_audit(failed)
+                raise
+        except PyMongoError:
+            _requeue_audit(batch)
+            raise
+        written += len(batch)
+
+
+_audit_flusher = BackgroundFlusher("audit", flush_audit_log, "AUDIT_FLUSH_INTERVAL")
+
+
+def notifications_watermark(admin_id):
+    """Waktu terakhir admin menandai semua notifikasi dibaca."""
+    admin = db.admin.find_one({"_id": admin_id}, {"notifications_read_at": 1, "created_at": 1}) or {}
+    return admin.get("notifications_read_at") or admin.get("created_at") or datetime.min
+
+
+def unread_messages_query(admin_id, watermark):
+    return {"created_at": {"$gt": watermark}, "read_by": {"$ne": admin_id}}
+
+
+def unread_logs_query(admin_id, watermark):
+    # aktivitas admin sendiri tidak pernah menjadi notifikasi
+    return {"timestamp": {"$gt": watermark}, "admin_id": {"$ne": admin_id}, "read_by": {"$ne": admin_id}}
@@ -0,0 +1,121 @@
+# eschool/auth.py
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+
+from .audit import log_admin_action
+from .db import db
+from .security import (
+    PasswordBusy, hash_password, check_password, needs_rehash,
+    login_throttled, record_login_failure, clear_login_failures
+)
+
+bp = Blueprint("auth", __name__, cli_group=None)
+
+
+# ---------------------------------- #
+# 6) ADMIN AUTHENTICATION            #
+# ---------------------------------- #
+def superadmin_required(fn):
+    """Decorator: izinkan hanya jika role = superadmin."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        # belum login ➜ ke halaman login
+        if "admin_id" not in session:
+            return redirect(url_for("auth.login"))
+
+        # sudah login tapi bukan superadmin ➜ tolak akses
+        if session.get("admin_role") != "superadmin":
+            # 1) kalau mau redirect pakai flash:
+            flash("You do not have permission to access that page.", "danger")
+            return redirect(url_for("admin.dashboard"))
+            # 2) atau cukup:
+            # abort(403)
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+@bp.route("/login", methods=["GET", "POST"])
+def login():
+    if request.method == "POST":
+        username = request.form.get("username").strip()
+        password = request.form.get("password").strip()
+        remember = request.form.get("remember")
+
+        ip = request.remote_addr or "unknown"
+        if login_throttled(username, ip):
+            flash("Too many failed attempts. Please try again in a few minutes.", "danger")
+            return render_template("admin/login.html", active_page="login"), 429
+
+        admin = db.admin.find_one({"username": username})
+        if admin:
+            if admin.get("is_blocked", False):
+                flash("Your account has been blocked. Please contact the administrator.", "danger")
+                return redirect(url_for("auth.login"))
+
+            try:
+                valid = check_password(password, admin['password_hash'])
+            except PasswordBusy:
+                flash("Server is busy. Please try again shortly.", "warning")
+                return render_template("admin/login.html", active_page="login"), 503
+
+            if valid:
+                clear_login_failures(username, ip)
+                # cost factor berubah → hash ulang selagi password plaintext tersedia
+                if needs_rehash(admin['password_hash']):
+                    try:
+                        db.admin.update_one(
+                            {"_id": admin["_id"]},
+                            {"$set": {"password_hash": hash_password(password)}}
+                        )
+                    except PasswordBusy:
+                        pass
+
+                session["admin_id"] = str(admin["_id"])
+                session["admin_username"] = admin["username"]
+                session["admin_role"] = admin["role"]
+                session["admin_avatar"] = admin.get("avatar", "default_admin.png")
+
+                if remember:
+                    session.permanent = True
+                else:
+                    session.permanent = False
+
+                db.admin.update_one(
+                    {"_id": admin["_id"]},
+                    {"$set": {"last_login": datetime.now(timezone.utc)}}
+                )
+                log_admin_action(session["admin_id"], session["admin_username"], "Login successful")
+                return redirect(url_for("admin.dashboard"))
+
+        record_login_failure(username, ip)
+        flash("Incorrect username or password.", "danger")
+        return redirect(url_for("auth.login"))
+
+    return render_template("admin/login.html", active_page="login")
+
+
+@bp.route("/logout")
+def logout():
+    if "admin_id" in session:
+        log_admin_action(session["admin_id"], session["admin_username"], "Logout")
+    session.clear()
+    return redirect(url_for("auth.login"))
+
+
+@bp.route("/forgot-password", methods=["GET", "POST"])
+def forgot_password():
+    if request.method == "POST":
+        username = request.form.get("username").strip()
+        admin = db.admin.find_one({"username": username})
+        if admin:
+            flash(
+                f"Reset request logged. Please contact superadmin to reset account '{username}'.",
+                "info"
+            )
+        else:
+            flash("Username not found", "danger")
+        return redirect(url_for("auth.forgot_password"))
+
+    return render_template("admin/forgot_password.html", active_page="forgot")
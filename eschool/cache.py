@@ -0,0 +1,391 @@
+# eschool/cache.py
+import os
+import json
+import time
+import pickle
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+
+import click
+from flask import Response, current_app, request, session
+from flask.cli import with_appcontext
+from pymongo import UpdateOne
+
+from .db import db
+
+try:
+    import redis
+except ImportError:  # redis opsional: hanya untuk PAGE_CACHE_BACKEND=redis
+    redis = None
+
+# ----------------------------------------- #
+# 4a) HELPER: CACHE DOKUMEN SINGLETON       #
+# ----------------------------------------- #
+# settings / contact / about hampir tidak pernah berubah, tapi dibaca
+# di setiap render (context processor). Simpan di memori proses dengan
+# nomor versi: setiap invalidasi menaikkan versi, sehingga hasil query
+# yang dimulai sebelum invalidasi tidak akan menimpa data baru.
+# TTL hanya jaring pengaman untuk worker lain yang tidak ikut diinvalidasi.
+SINGLETON_COLLECTIONS = ("settings", "contact", "about")
+
+_singleton_cache = {}
+_singleton_version = 0
+_singleton_lock = threading.Lock()
+
+
+def get_singleton(name):
+    """Ambil dokumen singleton (settings/contact/about) dari cache atau DB."""
+    now = time.monotonic()
+    entry = _singleton_cache.get(name)
+    if entry and entry["version"] == _singleton_version and entry["expires"] > now:
+        return entry["doc"]
+
+    version = _singleton_version
+    doc = db[name].find_one({}) or {}
+
+    with _singleton_lock:
+        if version == _singleton_version:
+            _singleton_cache[name] = {
+                "doc": doc,
+                "version": version,
+                "expires": now + current_app.config["SINGLETON_CACHE_TTL"]
+            }
+    return doc
+
+
+def invalidate_singletons():
+    """Dipanggil setelah admin mengubah settings/contact/about."""
+    global _singleton_version
+    with _singleton_lock:
+        _singleton_version += 1
+        _singleton_cache.clear()
+
+
+# ----------------------------------------- #
+# 4j) HELPER: CACHE HALAMAN PUBLIK          #
+# ----------------------------------------- #
+# Halaman publik hanya berubah saat admin menyimpan sesuatu, jadi respons
+# GET disimpan utuh per path+query. Setiap entri mencatat versi tag
+# (koleksi) yang dipakainya; route admin menaikkan versi tag setelah
+# write (PAGE_CACHE_INVALIDATION) sehingga entri lama otomatis basi.
+# Entri juga menyimpan ETag saat dibuat; ETag berasal dari content_versions
+# (bersama di MongoDB), jadi write lewat worker lain ikut membuat entri
+# di cache memory worker ini basi.
+# Backend: memory (LRU per proses), filesystem atau redis (bersama).
+PAGE_CACHE_SKIP_HEADERS = {"set-cookie", "content-length", "vary"}
+
+
+class MemoryPageCache:
+    def __init__(self, config):
+        self.size = config["PAGE_CACHE_SIZE"]
+        self.entries = OrderedDict()
+        self.tags = Counter()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry["expires"] < time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def tag_versions(self, tags):
+        return {t: self.tags[t] for t in tags}
+
+    def bump_tags(self, tags):
+        with self.lock:
+            for t in tags:
+                self.tags[t] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class FilesystemPageCache:
+    def __init__(self, config):
+        self.root = config["PAGE_CACHE_DIR"]
+        os.makedirs(os.path.join(self.root, "tags"), exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, hashlib.sha1(key.encode()).hexdigest() + ".page")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as fh:
+                entry = pickle.load(fh)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return entry if entry["expires"] >= time.time() else None
+
+    def set(self, key, entry):
+        # tulis ke file sementara lalu rename agar pembaca tidak melihat file setengah jadi
+        tmp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp, "wb") as fh:
+            pickle.dump(entry, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+
+    def tag_versions(self, tags):
+        versions = {}
+        for t in tags:
+            try:
+                versions[t] = os.stat(os.path.join(self.root, "tags", t)).st_mtime_ns
+            except OSError:
+                versions[t] = 0
+        return versions
+
+    def bump_tags(self, tags):
+        for t in tags:
+            path = os.path.join(self.root, "tags", t)
+            with open(path, "a"):
+                pass
+            os.utime(path, ns=(time.time_ns(), time.time_ns()))
+
+    def clear(self):
+        for name in os.listdir(self.root):
+            if name.endswith(".page"):
+                os.remove(os.path.join(self.root, name))
+
+
+class RedisPageCache:
+    def __init__(self, config):
+        if redis is None:
+            raise RuntimeError("PAGE_CACHE_BACKEND=redis membutuhkan paket `redis`.")
+        self.client = redis.Redis.from_url(config["PAGE_CACHE_REDIS_URL"])
+        self.ttl = config["PAGE_CACHE_TTL"]
+
+    def get(self, key):
+        raw = self.client.get("page:" + key)
+        return pickle.loads(raw) if raw else None
+
+    def set(self, key, entry):
+        self.client.set("page:" + key, pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL), ex=self.ttl)
+
+    def tag_versions(self, tags):
+        tags = list(tags)
+        return {t: int(v or 0) for t, v in zip(tags, self.client.mget(["page-tag:" + t for t in tags]))}
+
+    def bump_tags(self, tags):
+        pipe = self.client.pipeline()
+        for t in tags:
+            pipe.incr("page-tag:" + t)
+        pipe.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter("page:*"):
+            self.client.delete(key)
+
+
+PAGE_CACHE_BACKENDS = {
+    "memory": MemoryPageCache,
+    "filesystem": FilesystemPageCache,
+    "redis": RedisPageCache,
+}
+_page_fill_locks = {}
+_page_fill_guard = threading.Lock()
+
+
+def get_page_cache():
+    """Backend cache milik app ini; None bila PAGE_CACHE_BACKEND tidak dikenal (mis. "none")."""
+    app = current_app._get_current_object()
+    if "page_cache" not in app.extensions:
+        backend = PAGE_CACHE_BACKENDS.get(app.config["PAGE_CACHE_BACKEND"])
+        app.extensions["page_cache"] = backend(app.config) if backend else None
+    return app.extensions["page_cache"]
+
+
+def invalidate_pages(*tags):
+    cache = get_page_cache()
+    if cache is not None:
+        cache.bump_tags(tags)
+    # versi bersama (lintas worker) untuk ETag / Last-Modified
+    now = datetime.now(timezone.utc)
+    db.content_versions.bulk_write([
+        UpdateOne({"_id": t}, {"$inc": {"version": 1}, "$set": {"updated_at": now}}, upsert=True)
+        for t in tags
+    ], ordered=False)
+
+
+@lru_cache(maxsize=None)
+def template_stamp(template_dir):
+    """Template ikut menentukan isi halaman: deploy baru → ETag baru.
+    Dihitung sekali per proses, saat halaman pertama dilayani."""
+    return max(
+        (os.path.getmtime(os.path.join(root, f))
+         for root, _, files in os.walk(template_dir)
+         for f in files),
+        default=0
+    )
+
+
+def page_validators(tags):
+    """ETag (weak) dan Last-Modified dari versi tag — satu query _id kecil."""
+    docs = list(db.content_versions.find({"_id": {"$in": list(tags)}}))
+    versions = sorted((d["_id"], d.get("version", 0)) for d in docs)
+    stamp = template_stamp(os.path.join(current_app.root_path, current_app.template_folder))
+    raw = json.dumps([request.full_path, stamp, versions], default=str)
+    etag = hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+    stamps = [d["updated_at"] for d in docs if d.get("updated_at")]
+    last_modified = max(stamps).replace(tzinfo=timezone.utc, microsecond=0) if stamps else None
+    return etag, last_modified
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified and request.if_modified_since:
+        return request.if_modified_since >= last_modified
+    return False
+
+
+def _set_validators(response, etag, last_modified):
+    if response.status_code not in (200, 304):
+        return response
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers.setdefault("Cache-Control", "no-cache")
+    return response
+
+
+def _fresh_page(cache, key, etag):
+    entry = cache.get(key)
+    if (entry and entry.get("etag") == etag
+            and cache.tag_versions(entry["tags"]) == entry["tags"]):
+        return entry
+    return None
+
+
+def _page_response(entry, state):
+    response = Response(entry["body"], status=entry["status"], headers=entry["headers"])
+    response.headers["X-Page-Cache"] = state
+    return response
+
+
+def cached_page(*tags):
+    """Cache respons GET route publik; `tags` = data yang dipakai halaman.
+    Tag "site" (settings/contact/about di layout) selalu ikut.
+    Juga menjawab If-None-Match / If-Modified-Since dengan 304 sebelum
+    query dan render dijalankan."""
+    tags = ("site",) + tags
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            # flash hanya tampil di halaman tujuan redirect (single, contact),
+            # yang merendernya sekali lalu menghapusnya dari session
+            if request.method != "GET" or "_flashes" in session:
+                return fn(*args, **kwargs)
+
+            etag, last_modified = page_validators(tags)
+            if _not_modified(etag, last_modified):
+                return _set_validators(Response(status=304), etag, last_modified)
+
+            cache = get_page_cache()
+            if cache is None:
+                return _set_validators(current_app.make_response(fn(*args, **kwargs)), etag, last_modified)
+
+            key = request.full_path
+            entry = _fresh_page(cache, key, etag)
+            if entry:
+                return _set_validators(_page_response(entry, "HIT"), etag, last_modified)
+
+            # miss bersamaan untuk key yang sama: hanya satu thread yang render
+            with _page_fill_guard:
+                lock = _page_fill_locks.setdefault(key, threading.Lock())
+            try:
+                with lock:
+                    # thread lain mungkin sudah mengisi entri selama kita menunggu
+                    entry = _fresh_page(cache, key, etag)
+                    if entry:
+                        response = _page_response(entry, "HIT")
+                    else:
+                        versions = cache.tag_versions(tags)   # diambil sebelum render
+                        response = current_app.make_response(fn(*args, **kwargs))
+                        if response.status_code == 200 and not response.direct_passthrough and not session.modified:
+                            cache.set(key, {
+                                "body": response.get_data(),
+                                "status": response.status_code,
+                                "headers": [(k, v) for k, v in response.headers
+                                            if k.lower() not in PAGE_CACHE_SKIP_HEADERS],
+                                "tags": versions,
+                                "etag": etag,
+                                "expires": time.time() + current_app.config["PAGE_CACHE_TTL"],
+                            })
+                        response.headers["X-Page-Cache"] = "MISS"
+            finally:
+                # lepas lock per key agar dict tidak tumbuh untuk query string acak
+                with _page_fill_guard:
+                    if not lock.locked():
+                        _page_fill_locks.pop(key, None)
+            return _set_validators(response, etag, last_modified)
+        return wrapper
+    return decorator
+
+
+# endpoint admin (POST) → tag halaman yang harus diinvalidasi
+PAGE_CACHE_INVALIDATION = {
+    "admin.add_article": ("publications", "media"),
+    "admin.edit_article": ("publications", "media"),
+    "admin.delete_article": ("publications", "media"),
+    "admin.add_gallery": ("media",),
+    "admin.edit_gallery": ("media",),
+    "admin.delete_gallery": ("media",),
+    "admin.add_teacher": ("teachers",),
+    "admin.edit_teacher": ("teachers",),
+    "admin.delete_teacher": ("teachers",),
+    "admin.admin_extracurricular": ("extracurricular",),
+    "admin.add_extracurricular": ("extracurricular",),
+    "admin.edit_extracurricular": ("extracurricular",),
+    "admin.delete_extracurricular": ("extracurricular",),
+    "materials.add_class_materials": ("materials",),
+    "materials.edit_class_materials": ("materials",),
+    "materials.delete_class_materials": ("materials",),
+    "materials.add_subject_materials": ("materials",),
+    "materials.edit_subject_materials": ("materials",),
+    "materials.delete_subject_materials": ("materials",),
+    "materials.add_material": ("materials",),
+    "materials.edit_material": ("materials",),
+    "materials.delete_material": ("materials",),
+    "materials.upload_material_finalize": ("materials",),
+    "admin.update_contact": ("site",),
+    "admin.admin_about": ("site",),
+    "admin.admin_settings": ("site",),
+}
+
+
+def invalidate_page_cache(response):
+    tags = PAGE_CACHE_INVALIDATION.get(request.endpoint)
+    if tags and request.method == "POST" and response.status_code < 400:
+        invalidate_pages(*tags)
+    return response
+
+
+@click.command("clear-page-cache")
+@with_appcontext
+def clear_page_cache_command():
+    """Kosongkan cache halaman publik."""
+    cache = get_page_cache()
+    if cache is not None:
+        cache.clear()
+    click.echo(f"Page cache ({current_app.config['PAGE_CACHE_BACKEND']}) cleared.")
+
+
+def init_app(app):
+    app.after_request(invalidate_page_cache)
+    app.cli.add_command(clear_page_cache_command)
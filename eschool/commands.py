@@ -0,0 +1,583 @@
+# eschool/commands.py
+import os
+import re
+import sys
+import json
+import random
+import secrets
+import platform
+import statistics
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+
+import bcrypt
+import click
+from bson.objectid import ObjectId
+from flask import current_app
+from flask.cli import with_appcontext
+from pymongo import UpdateOne
+
+from .cache import invalidate_singletons, invalidate_pages
+from .content import Image, make_image_variants, rebuild_category_stats, rebuild_media
+from .db import client, db, close_client
+from .indexes import ensure_indexes
+from .search import search_terms_for, invalidate_search_cache
+
+
+
+# ---------------------------------------- #
+# 16) SEED DATA SINTETIS                   #
+# ---------------------------------------- #
+# `flask seed` mengisi database aktif dengan data buatan berskala besar
+# (deterministik untuk --seed yang sama) memakai insert_many per batch.
+# Opsional: file gambar / video placeholder di folder upload.
+SEED_DEFAULTS = {
+    "publications": 1000,
+    "comments": 20000,
+    "teachers": 60,
+    "classes": 6,
+    "subjects_per_class": 8,
+    "materials_per_subject": 10,
+    "gallery": 300,
+    "extracurricular": 15,
+    "contact_messages": 5000,
+    "admin_logs": 10000,
+}
+SEED_WORDS = (
+    "sekolah siswa guru kelas ujian prestasi lomba kegiatan belajar olahraga "
+    "musik seni sains matematika bahasa sejarah perpustakaan laboratorium "
+    "upacara wisuda beasiswa juara festival pramuka teknologi komputer"
+).split()
+SEED_CATEGORIES = ("Achievement", "News", "Announcement", "Event")
+SEED_BATCH = 5000
+SEED_FILE_POOL = 12   # jumlah file berbeda per folder; dokumen memakai ulang file ini
+
+
+def _seed_text(rng, words):
+    return " ".join(rng.choice(SEED_WORDS) for _ in range(words))
+
+
+def _insert_batched(collection, docs):
+    batch, total = [], 0
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= SEED_BATCH:
+            collection.insert_many(batch, ordered=False)
+            total += len(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        total += len(batch)
+    return total
+
+
+def _seed_images(rng, folder, size, variants=False):
+    """Buat SEED_FILE_POOL gambar placeholder; kembalikan daftar (filename, image_info)."""
+    if not size:
+        return [("seed.jpg", {"width": None, "height": None, "variants": []})]
+    if Image is None:
+        raise click.ClickException("--images membutuhkan Pillow.")
+
+    pool = []
+    for i in range(SEED_FILE_POOL):
+        filename = f"seed_{i:02d}.jpg"
+        color = tuple(rng.randrange(256) for _ in range(3))
+        Image.new("RGB", size, color).save(os.path.join(folder, filename), "JPEG", quality=80)
+        info = make_image_variants(folder, filename) if variants else {}
+        pool.append((filename, info))
+    return pool
+
+
+def _seed_binary(folder, filename, size_bytes, header=b""):
+    path = os.path.join(folder, filename)
+    with open(path, "wb") as fh:
+        fh.write(header)
+        remaining = max(size_bytes - len(header), 0)
+        block = os.urandom(min(remaining, 1024 * 1024))
+        while remaining > 0:
+            fh.write(block[:remaining])
+            remaining -= len(block)
+    return filename
+
+
+def seed_data(counts, seed=42, image_size=None, video_mb=0, log=click.echo, admin_password=None):
+    """Isi database aktif (`db`) dengan data sintetis yang deterministik.
+
+    Admin seed memakai `admin_password`, atau password acak bila kosong."""
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    span = (datetime(2025, 1, 1, tzinfo=timezone.utc) - start).total_seconds()
+
+    def moment():
+        return start + timedelta(seconds=rng.uniform(0, span))
+
+    pub_images = _seed_images(rng, current_app.config["UPLOAD_FOLDER_PUBLICATIONS"], image_size, variants=True)
+    gallery_images = _seed_images(rng, current_app.config["UPLOAD_FOLDER_GALLERY"], image_size, variants=True)
+    avatar_images = _seed_images(rng, current_app.config["UPLOAD_FOLDER_TEACHERS"], image_size)
+    class_images = _seed_images(rng, current_app.config["UPLOAD_FOLDER_CLASSES"], image_size)
+    subject_images = _seed_images(rng, current_app.config["UPLOAD_FOLDER_SUBJECTS"], image_size)
+    ex_images = _seed_images(rng, current_app.config["UPLOAD_FOLDER_EXTRACURRICULAR"], image_size)
+
+    material_files = [_seed_binary(current_app.config["UPLOAD_FOLDER_MATERIALS"], "seed.pdf", 64 * 1024, b"%PDF-1.4\n")]
+    if video_mb:
+        material_files.append(_seed_binary(
+            current_app.config["UPLOAD_FOLDER_MATERIALS"], "seed.mp4", int(video_mb * 1024 * 1024),
+            b"\x00\x00\x00\x18ftypmp42"
+        ))
+
+    # admin "seed" (superadmin) + beberapa admin lain, semua dengan password yang sama
+    admin_password = admin_password or secrets.token_urlsafe(12)
+    password_hash = bcrypt.hashpw(admin_password.encode("utf-8"),
+                                  bcrypt.gensalt(rounds=current_app.config["BCRYPT_ROUNDS"])).decode()
+    admin_ids, created = [], 0
+    for i in range(5):
+        username = "seed" if i == 0 else f"seed{i}"
+        res = db.admin.update_one({"username": username}, {"$setOnInsert": {
+            "name": f"Seed Admin {i}",
+            "email": f"{username}@example.com",
+            "password_hash": password_hash,
+            "role": "superadmin" if i == 0 else "admin",
+            "avatar": "default_admin.png",
+            "is_blocked": False,
+            "created_at": start,
+            # sebagian pesan/log tetap "belum dibaca" bagi admin ini
+            "notifications_read_at": start + timedelta(seconds=span * rng.uniform(0.5, 0.95)),
+        }}, upsert=True)
+        admin_ids.append(res.upserted_id or db.admin.find_one({"username": username})["_id"])
+        created += res.upserted_id is not None
+    if created:
+        log(f"admins seed, seed1..seed4 created with password: {admin_password}")
+
+    def publications():
+        for _ in range(counts["publications"]):
+            image, info = rng.choice(pub_images)
+            doc = {
+                "title": _seed_text(rng, 6).title(),
+                "category": rng.choice(SEED_CATEGORIES),
+                "content": "".join(
+                    f"<h3>{_seed_text(rng, 4).title()}</h3><p>{_seed_text(rng, 60)}</p>"
+                    f"<ul><li>{_seed_text(rng, 8)}</li><li>{_seed_text(rng, 8)}</li></ul>"
+                    for _ in range(rng.randint(2, 5))
+                ),
+                "feature_image": image,
+                "feature_image_width": info.get("width"),
+                "feature_image_height": info.get("height"),
+                "feature_image_variants": info.get("variants", []),
+                "attachment": None,
+                "author": "seed",
+                "comment_count": 0,
+                "created_at": moment(),
+            }
+            doc["updated_at"] = doc["created_at"]
+            doc["search_terms"] = search_terms_for("publications", doc)
+            yield doc
+    log(f"publications: {_insert_batched(db.publications, publications())}")
+
+    pub_ids = [str(p["_id"]) for p in db.publications.find({}, {"_id": 1})]
+
+    def comments():
+        for _ in range(counts["comments"] if pub_ids else 0):
+            yield {
+                # distribusi miring: sebagian kecil artikel mendapat banyak komentar
+                "article_id": pub_ids[int(len(pub_ids) * rng.random() ** 3)],
+                "name": _seed_text(rng, 2).title(),
+                "email": f"user{rng.randint(1, 10 ** 6)}@example.com",
+                "text": _seed_text(rng, 25),
+                "avatar_url": None,
+                "created_at": moment(),
+            }
+    log(f"comments: {_insert_batched(db.comments, comments())}")
+
+    def contact_messages():
+        for _ in range(counts["contact_messages"]):
+            msg = {
+                "name": _seed_text(rng, 2).title(),
+                "email": f"user{rng.randint(1, 10 ** 6)}@example.com",
+                "subject": _seed_text(rng, 5),
+                "message": _seed_text(rng, 40),
+                "created_at": moment(),
+            }
+            # override baca per item (sparse) untuk sebagian kecil pesan
+            if rng.random() < 0.05:
+                msg["read_by"] = rng.sample(admin_ids, rng.randint(1, len(admin_ids)))
+            yield msg
+    log(f"contact_messages: {_insert_batched(db.contact_messages, contact_messages())}")
+
+    def admin_logs():
+        for _ in range(counts["admin_logs"]):
+            i = rng.randrange(len(admin_ids))
+            yield {
+                "admin_id": admin_ids[i],
+                "username": "seed" if i == 0 else f"seed{i}",
+                "action": f"{rng.choice(('Added', 'Updated', 'Deleted'))} "
+                          f"{rng.choice(('article', 'teacher', 'material', 'gallery'))}: {_seed_text(rng, 3)}",
+                "description": "",
+                "timestamp": moment(),
+            }
+    log(f"admin_logs: {_insert_batched(db.admin_logs, admin_logs())}")
+
+    def teachers():
+        for i in range(counts["teachers"]):
+            t = {
+                "teacher_id": f"S{seed}-{i:05d}",
+                "name": _seed_text(rng, 2).title(),
+                "position": rng.choice(("Guru", "Wali Kelas", "Kepala Sekolah", "Staf TU")),
+                "email": f"teacher{i}@example.com",
+                "phone": f"08{rng.randint(10 ** 9, 10 ** 10 - 1)}",
+                "instagram": "", "facebook": "", "linkedin": "",
+                "avatar": rng.choice(avatar_images)[0],
+                "created_at": moment(),
+            }
+            t["search_terms"] = search_terms_for("teachers", t)
+            yield t
+    log(f"teachers: {_insert_batched(db.teachers, teachers())}")
+
+    def extracurricular():
+        for _ in range(counts["extracurricular"]):
+            e = {
+                "name": _seed_text(rng, 2).title(),
+                "description": f"<p>{_seed_text(rng, 50)}</p>",
+                "image": rng.choice(ex_images)[0],
+                "created_at": moment(),
+            }
+            e["search_terms"] = search_terms_for("extracurricular", e)
+            yield e
+    log(f"extracurricular: {_insert_batched(db.extracurricular, extracurricular())}")
+
+    def gallery():
+        for _ in range(counts["gallery"]):
+            image, info = rng.choice(gallery_images)
+            yield {"filename": image, "title": _seed_text(rng, 4), "uploaded_at": moment(), **info}
+    log(f"gallery: {_insert_batched(db.gallery, gallery())}")
+
+    n_materials = 0
+    for c in range(counts["classes"]):
+        cls = {"title": f"Kelas {c + 1}", "description": _seed_text(rng, 20),
+               "image": rng.choice(class_images)[0], "created_at": moment()}
+        cls["search_terms"] = search_terms_for("classes", cls)
+        cls_id = db.classes.insert_one(cls).inserted_id
+        for _ in range(counts["subjects_per_class"]):
+            subj = {"class_id": cls_id, "title": _seed_text(rng, 2).title(), "description": _seed_text(rng, 20),
+                    "image": rng.choice(subject_images)[0], "created_at": moment()}
+            subj["search_terms"] = search_terms_for("subjects", subj)
+            subj_id = db.subjects.insert_one(subj).inserted_id
+            mats = []
+            for _ in range(counts["materials_per_subject"]):
+                m = {"subject_id": subj_id, "class_id": cls_id, "title": _seed_text(rng, 4).title(),
+                     "description": f"<p>{_seed_text(rng, 40)}</p>",
+                     "filenames": rng.sample(material_files, rng.randint(1, len(material_files))),
+                     "video_link": "", "created_at": moment()}
+                m["search_terms"] = search_terms_for("materials", m)
+                mats.append(m)
+            if mats:
+                db.materials.insert_many(mats)
+                n_materials += len(mats)
+    log(f"classes/subjects/materials: {counts['classes']}/"
+        f"{counts['classes'] * counts['subjects_per_class']}/{n_materials}")
+
+    # data turunan: counter komentar, statistik kategori, koleksi media
+    ops = [
+        UpdateOne({"_id": ObjectId(row["_id"])}, {"$set": {"comment_count": row["n"]}})
+        for row in db.comments.aggregate([{"$group": {"_id": "$article_id", "n": {"$sum": 1}}}])
+    ]
+    for i in range(0, len(ops), SEED_BATCH):
+        db.publications.bulk_write(ops[i:i + SEED_BATCH], ordered=False)
+    rebuild_category_stats()
+    rebuild_media()
+    invalidate_search_cache()
+    invalidate_pages("site")
+
+
+def _seed_count_option(name):
+    return click.option(f"--{name.replace('_', '-')}", name, type=int, default=SEED_DEFAULTS[name],
+                        show_default=True)
+
+
+def _parse_size(ctx, param, value):
+    if not value:
+        return None
+    try:
+        w, h = (int(x) for x in value.lower().split("x"))
+        return w, h
+    except ValueError:
+        raise click.BadParameter("format WIDTHxHEIGHT, mis. 1600x900")
+
+
+@click.command("seed")
+@_seed_count_option("publications")
+@_seed_count_option("comments")
+@_seed_count_option("teachers")
+@_seed_count_option("classes")
+@_seed_count_option("subjects_per_class")
+@_seed_count_option("materials_per_subject")
+@_seed_count_option("gallery")
+@_seed_count_option("extracurricular")
+@_seed_count_option("contact_messages")
+@_seed_count_option("admin_logs")
+@click.option("--seed", "seed_value", default=42, show_default=True, help="Seed random generator.")
+@click.option("--images", callback=_parse_size, help="Buat gambar placeholder WIDTHxHEIGHT.")
+@click.option("--video-size-mb", default=0.0, show_default=True, help="Buat video placeholder sebesar ini.")
+@click.option("--drop", is_flag=True, help="Kosongkan koleksi konten terlebih dahulu.")
+@click.option("--db-name", help="Database tujuan (default: DB_NAME, butuh --yes-this-is-a-scratch-db).")
+@click.option("--yes-this-is-a-scratch-db", "scratch_ok", is_flag=True,
+              help="Izinkan seed ke DB_NAME yang dikonfigurasi.")
+@click.option("--admin-password", help="Password admin seed (default: acak, ditampilkan).")
+@with_appcontext
+def seed_command(seed_value, images, video_size_mb, drop, db_name, scratch_ok, admin_password, **counts):
+    """Isi database dengan data sintetis untuk uji skala."""
+    # DB_NAME dari .env biasanya database produksi: hanya lewat flag eksplisit
+    if db_name in (None, current_app.config["DB_NAME"]) and not scratch_ok:
+        raise click.ClickException(
+            f"Refusing to seed the configured database '{current_app.config['DB_NAME']}'. "
+            "Pass --db-name <scratch db> or --yes-this-is-a-scratch-db."
+        )
+    if db_name:
+        current_app.config["DB_NAME"] = db_name
+        invalidate_singletons()
+
+    if drop:
+        click.confirm(f"Drop content collections in database '{db.name}'?", abort=True)
+        for name in ("publications", "comments", "publication_categories", "teachers", "classes",
+                     "subjects", "materials", "gallery", "media", "extracurricular",
+                     "contact_messages", "admin_logs"):
+            db[name].drop()
+        ensure_indexes()
+
+    started = time.perf_counter()
+    seed_data(counts, seed=seed_value, image_size=images, video_mb=video_size_mb,
+              admin_password=admin_password)
+    click.echo(f"Seeded database '{db.name}' in {time.perf_counter() - started:.1f}s.")
+
+
+# ---------------------------------------- #
+# 17) BENCHMARK ROUTE                      #
+# ---------------------------------------- #
+# `flask bench` mengisi database terpisah (default eschool_bench) dengan
+# data sintetis (lihat `seed_data`) pada skala tertentu, lalu memanggil
+# setiap route publik dan admin lewat test client. Hasil (p50/p95/p99,
+# query per request, RSS puncak) disimpan sebagai JSON untuk
+# dibandingkan antar commit. Benchmark menghapus dan mengisi database,
+# jadi defaultnya memakai mongod lokal, bukan MONGODB_URI aplikasi.
+BENCH_SCALES = {
+    "small":  {"publications": 1000,  "comments": 20000,  "contact_messages": 5000,  "admin_logs": 10000},
+    "medium": {"publications": 10000, "comments": 200000, "contact_messages": 50000, "admin_logs": 100000},
+    "large":  {"publications": 50000, "comments": 1000000, "contact_messages": 200000, "admin_logs": 500000},
+}
+
+
+def _peak_rss_mb():
+    """RSS puncak proses sejauh ini (ru_maxrss: KB di Linux, byte di macOS)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def _server_timing_queries(response):
+    match = re.search(r'desc="(\d+) queries"', response.headers.get("Server-Timing", ""))
+    return int(match.group(1)) if match else None
+
+
+def _bench_routes():
+    """(nama, path, perlu login admin) untuk setiap route GET yang diukur."""
+    pub = db.publications.find_one(sort=[("comment_count", -1)])
+    deep_page = max(db.publications.estimated_document_count() // 5 // 2, 1)
+    cls = db.classes.find_one()
+    subj = db.subjects.find_one({"class_id": cls["_id"]})
+    mat = db.materials.find_one({"subject_id": subj["_id"]})
+    ex = db.extracurricular.find_one()
+    admin = db.admin.find_one({"username": "seed1"})
+
+    return [
+        ("home", "/", False),
+        ("about", "/about", False),
+        ("teachers", "/teachers", False),
+        ("extracurricular", "/extracurricular", False),
+        ("extracurricular_detail", f"/extracurricular/{ex['_id']}", False),
+        ("gallery", "/gallery", False),
+        ("gallery (category)", "/gallery?category=News", False),
+        ("news_articles", "/news_articles", False),
+        ("news_articles (deep page)", f"/news_articles?page={deep_page}", False),
+        ("single (most comments)", f"/single/{pub['_id']}", False),
+        ("search", "/search?q=prestasi", False),
+        ("contact", "/contact", False),
+        ("materials_classes", "/materials/classes", False),
+        ("materials_subjects", f"/materials/subjects/{cls['_id']}", False),
+        ("materials", f"/materials/{subj['_id']}", False),
+        ("detail_material", f"/materials/detail/{mat['_id']}", False),
+        ("dashboard", "/dashboard", True),
+        ("admin_teachers", "/admin_teachers", True),
+        ("admin_news_articles", "/admin_news_articles", True),
+        ("admin_news_articles (search)", "/admin_news_articles?search=prestasi", True),
+        ("admin_gallery", "/admin_gallery", True),
+        ("admin_contact", "/admin_contact", True),
+        ("admin_about", "/admin_about", True),
+        ("admin_extracurricular", "/admin_extracurricular", True),
+        ("admin_logs", "/admin_logs", True),
+        ("admin_logs (by admin)", f"/admin_logs?admin={admin['_id']}", True),
+        ("admin_materials", "/admin_materials", True),
+        ("admin_list", "/admin/admins", True),
+        ("admin_settings", "/admin/settings", True),
+    ]
+
+
+# Boot worker diukur di proses baru: waktu import app.py (create_app)
+# dan RSS / jumlah thread sesudahnya, sebelum request pertama.
+BOOT_PROBE = """
+import json, os, threading, time
+started = time.perf_counter()
+import app
+boot_s = time.perf_counter() - started
+with open("/proc/self/statm") as fh:
+    rss_mb = int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+print(json.dumps({"boot_s": round(boot_s, 3), "rss_mb": round(rss_mb, 1),
+                  "threads": threading.active_count()}))
+"""
+
+
+def _measure_boot():
+    env = {**os.environ, "ENSURE_INDEXES": "0"}
+    try:
+        out = subprocess.check_output(
+            [sys.executable, "-c", BOOT_PROBE], cwd=current_app.root_path, env=env, stderr=subprocess.DEVNULL
+        )
+        return json.loads(out.decode().strip().splitlines()[-1])
+    except (OSError, ValueError, IndexError, subprocess.CalledProcessError):
+        return {"boot_s": None, "rss_mb": None, "threads": None}
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=current_app.root_path, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+@click.command("bench")
+@click.option("--mongodb-uri", default="mongodb://localhost:27017", show_default=True,
+              help="Server MongoDB khusus benchmark (bukan MONGODB_URI aplikasi).")
+@click.option("--db-name", default="eschool_bench", show_default=True, help="Database khusus benchmark.")
+@click.option("--scale", type=click.Choice(sorted(BENCH_SCALES)), default="medium", show_default=True)
+@click.option("--reseed", is_flag=True, help="Hapus dan isi ulang database benchmark.")
+@click.option("-n", "--requests", "n_requests", default=30, show_default=True, help="Request per route.")
+@click.option("--warmup", default=3, show_default=True)
+@click.option("--route", "only", multiple=True, help="Hanya route dengan nama ini (boleh berulang).")
+@click.option("--page-cache", is_flag=True, help="Biarkan cache halaman aktif (default: dimatikan).")
+@click.option("--output", type=click.Path(dir_okay=False), help="File JSON hasil.")
+@click.option("--compare", type=click.Path(exists=True, dir_okay=False), help="JSON hasil sebelumnya.")
+@with_appcontext
+def bench_command(mongodb_uri, db_name, scale, reseed, n_requests, warmup, only, page_cache, output, compare):
+    """Ukur latensi, jumlah query dan RSS setiap route pada data sintetis."""
+    app = current_app._get_current_object()
+    if db_name == app.config["DB_NAME"]:
+        raise click.ClickException("Refusing to benchmark against the main database.")
+
+    # `db` mengikuti config MONGODB_URI / DB_NAME, jadi semua route ikut
+    # memakai server & database benchmark setelah client lama ditutup
+    close_client()
+    app.config["MONGODB_URI"] = mongodb_uri
+    app.config["DB_NAME"] = db_name
+    invalidate_singletons()
+    invalidate_search_cache()
+    if not page_cache:
+        app.config["PAGE_CACHE_BACKEND"] = "none"
+        app.extensions.pop("page_cache", None)
+
+    if reseed or db.publications.estimated_document_count() == 0:
+        client.drop_database(db_name)
+        ensure_indexes()
+        click.echo(f"Seeding {db_name} ({scale}) ...")
+        started = time.perf_counter()
+        seed_data({**SEED_DEFAULTS, **BENCH_SCALES[scale]}, log=lambda msg: None)
+        click.echo(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    boot = _measure_boot()
+    click.echo(f"boot {boot['boot_s'] or '-'} s  rss {boot['rss_mb'] or '-'} MB  threads {boot['threads'] or '-'}")
+
+    public_client = app.test_client()
+    admin_client = app.test_client()
+    bench_admin = db.admin.find_one({"username": "seed"})
+    with admin_client.session_transaction() as sess:
+        sess["admin_id"] = str(bench_admin["_id"])
+        sess["admin_username"] = bench_admin["username"]
+        sess["admin_role"] = bench_admin["role"]
+        sess["admin_avatar"] = bench_admin["avatar"]
+
+    results = {}
+    for name, path, needs_admin in _bench_routes():
+        if only and name not in only:
+            continue
+        http = admin_client if needs_admin else public_client
+        for _ in range(warmup):
+            http.get(path)
+
+        latencies, queries, statuses = [], [], Counter()
+        rss_before = _peak_rss_mb()
+        for _ in range(n_requests):
+            started = time.perf_counter()
+            resp = http.get(path)
+            latencies.append((time.perf_counter() - started) * 1000)
+            resp.close()
+            statuses[resp.status_code] += 1
+            queries.append(_server_timing_queries(resp))
+
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        known_queries = [q for q in queries if q is not None]
+        rss_after = _peak_rss_mb()
+        results[name] = {
+            "path": path,
+            "requests": n_requests,
+            "status": {str(k): v for k, v in statuses.items()},
+            "p50_ms": round(cuts[49], 2),
+            "p95_ms": round(cuts[94], 2),
+            "p99_ms": round(cuts[98], 2),
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            "queries_per_request": round(statistics.fmean(known_queries), 1) if known_queries else None,
+            "peak_rss_mb": round(rss_after, 1) if rss_after is not None else None,
+            # kenaikan RSS puncak selama route ini (0 = tidak melampaui puncak sebelumnya)
+            "peak_rss_delta_mb": round(rss_after - rss_before, 1) if rss_after is not None else None,
+        }
+        r = results[name]
+        click.echo(f"{name:<30} p50 {r['p50_ms']:>8.1f}  p95 {r['p95_ms']:>8.1f}  p99 {r['p99_ms']:>8.1f} ms"
+                   f"  q/req {r['queries_per_request'] if r['queries_per_request'] is not None else '-':>6}"
+                   f"  rss {r['peak_rss_mb'] or '-'} MB (+{r['peak_rss_delta_mb'] or 0})")
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "scale": scale,
+        "counts": {c: db[c].estimated_document_count() for c in BENCH_SCALES[scale]},
+        "page_cache": page_cache,
+        "python": platform.python_version(),
+        "boot": boot,
+        "routes": results,
+    }
+    output = output or os.path.join(
+        "bench-results", f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{commit}-{scale}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    click.echo(f"Results written to {output}")
+
+    if compare:
+        with open(compare) as fh:
+            previous = json.load(fh)
+        click.echo(f"\np95 vs {previous.get('commit')} ({compare}):")
+        for name, r in results.items():
+            old = previous.get("routes", {}).get(name)
+            if old and old.get("p95_ms"):
+                delta = (r["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+                click.echo(f"{name:<30} {old['p95_ms']:>8.1f} → {r['p95_ms']:>8.1f} ms  ({delta:+.0f}%)")
+
+
+def init_app(app):
+    app.cli.add_command(seed_command)
+    app.cli.add_command(bench_command)
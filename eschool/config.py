@@ -0,0 +1,127 @@
+# eschool/config.py
+# Semua konfigurasi dibaca dari environment (.env) satu kali di sini;
+# create_app() memuatnya ke app.config lewat from_object(Config).
+import os
+from datetime import timedelta
+from os.path import join, dirname, abspath
+
+from dotenv import load_dotenv
+
+ROOT_DIR     = dirname(dirname(abspath(__file__)))
+STATIC_DIR   = join(ROOT_DIR, "static")
+INSTANCE_DIR = join(ROOT_DIR, "instance")
+
+load_dotenv(join(ROOT_DIR, ".env"))
+
+
+class Config:
+    SECRET_KEY = "mrpw07"  # Ganti dengan kunci sebenarnya di produksi
+    PERMANENT_SESSION_LIFETIME = timedelta(days=7)
+
+    # ─── MongoDB ─────────────────────────
+    # Client dibuat per proses saat query pertama (setelah fork worker),
+    # bukan saat import. Ukuran pool berlaku per worker.
+    MONGODB_URI = os.environ.get("MONGODB_URI")
+    DB_NAME     = os.environ.get("DB_NAME")
+    MONGO_MAX_POOL_SIZE               = int(os.environ.get("MONGO_MAX_POOL_SIZE", 100))
+    MONGO_MIN_POOL_SIZE               = int(os.environ.get("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_MAX_IDLE_TIME_MS            = int(os.environ.get("MONGO_MAX_IDLE_TIME_MS", 0))      # 0 = tanpa batas
+    MONGO_CONNECT_TIMEOUT_MS          = int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", 5000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+    MONGO_SOCKET_TIMEOUT_MS           = int(os.environ.get("MONGO_SOCKET_TIMEOUT_MS", 0))     # 0 = tanpa batas
+    MONGO_WAIT_QUEUE_TIMEOUT_MS       = int(os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", 0)) # 0 = tanpa batas
+    # Index dibuat sekali lewat `flask ensure-indexes` (gunicorn menjalankannya
+    # di on_starting); 1 = juga di setiap create_app() (dev, tanpa gunicorn)
+    ENSURE_INDEXES = os.environ.get("ENSURE_INDEXES", "0") == "1"
+    DB_PROFILER    = os.environ.get("DB_PROFILER", "1") == "1"
+
+    # ─── Upload folders ──────────────────
+    UPLOAD_FOLDER_MAIN_HEADERS    = join(STATIC_DIR, "images/main_headers")
+    UPLOAD_FOLDER_LOGO            = join(STATIC_DIR, "images/logo")
+    UPLOAD_FOLDER_HEADERS         = join(STATIC_DIR, "images/headers")
+    UPLOAD_FOLDER_AVATAR          = join(STATIC_DIR, "images/avatars")
+    UPLOAD_FOLDER_ABOUT           = join(STATIC_DIR, "images/about")
+    UPLOAD_FOLDER_GALLERY         = join(STATIC_DIR, "images/gallery")
+    UPLOAD_FOLDER_EXTRACURRICULAR = join(STATIC_DIR, "images/extracurricular")
+    UPLOAD_FOLDER_TEACHERS        = join(STATIC_DIR, "images/teachers")
+    UPLOAD_FOLDER_PUBLICATIONS    = join(STATIC_DIR, "images/publications")
+    UPLOAD_FOLDER_SUBJECTS        = join(STATIC_DIR, "images/subjects")
+    UPLOAD_FOLDER_CLASSES         = join(STATIC_DIR, "images/img_classes")
+    # Berkas materi & file .part disimpan di luar static/: materi hanya bisa
+    # diunduh lewat route material_file (cek terdaftar), .part belum selesai
+    UPLOAD_FOLDER_MATERIALS       = os.environ.get("UPLOAD_FOLDER_MATERIALS", join(INSTANCE_DIR, "materials"))
+    UPLOAD_FOLDER_PARTIAL         = join(INSTANCE_DIR, "partial_uploads")
+
+    # Batas body request biasa; berkas besar lewat chunked upload
+    MAX_CONTENT_LENGTH       = int(os.environ.get("MAX_CONTENT_LENGTH", 64 * 1024 * 1024))
+    # field form non-file yang disimpan di memori, dan jumlah bagian multipart
+    MAX_FORM_MEMORY_SIZE     = int(os.environ.get("MAX_FORM_MEMORY_SIZE", 1024 * 1024))
+    MAX_FORM_PARTS           = int(os.environ.get("MAX_FORM_PARTS", 1000))
+    MATERIAL_CHUNK_SIZE      = int(os.environ.get("MATERIAL_CHUNK_SIZE", 8 * 1024 * 1024))
+    MATERIAL_MAX_UPLOAD_SIZE = int(os.environ.get("MATERIAL_MAX_UPLOAD_SIZE", 4 * 1024 ** 3))
+    UPLOAD_SESSION_TTL_HOURS = int(os.environ.get("UPLOAD_SESSION_TTL_HOURS", 24))
+
+    # ─── Log audit ───────────────────────
+    AUDIT_LOG_ASYNC      = os.environ.get("AUDIT_LOG_ASYNC", "1") == "1"
+    AUDIT_BATCH_SIZE     = int(os.environ.get("AUDIT_BATCH_SIZE", 100))
+    AUDIT_BUFFER_MAX     = int(os.environ.get("AUDIT_BUFFER_MAX", 10000))
+    AUDIT_FLUSH_INTERVAL = float(os.environ.get("AUDIT_FLUSH_INTERVAL", 1))
+    AUDIT_WRITE_CONCERN  = os.environ.get("AUDIT_WRITE_CONCERN", "1")
+    # Retensi: 0 = simpan selamanya (arsip bulanan lewat `flask archive-admin-logs`),
+    # >0 = hapus otomatis oleh TTL index setelah N hari.
+    AUDIT_LOG_TTL_DAYS   = int(os.environ.get("AUDIT_LOG_TTL_DAYS", 0))
+
+    # ─── Cache ───────────────────────────
+    SINGLETON_CACHE_TTL  = int(os.environ.get("SINGLETON_CACHE_TTL", 300))
+    PAGE_CACHE_BACKEND   = os.environ.get("PAGE_CACHE_BACKEND", "memory")
+    PAGE_CACHE_TTL       = int(os.environ.get("PAGE_CACHE_TTL", 300))
+    PAGE_CACHE_SIZE      = int(os.environ.get("PAGE_CACHE_SIZE", 500))
+    PAGE_CACHE_DIR       = os.environ.get("PAGE_CACHE_DIR", join(INSTANCE_DIR, "page_cache"))
+    PAGE_CACHE_REDIS_URL = os.environ.get("PAGE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+    # ─── Komentar ────────────────────────
+    COMMENT_WRITE_BEHIND   = os.environ.get("COMMENT_WRITE_BEHIND", "0") == "1"
+    COMMENT_BUFFER_SIZE    = int(os.environ.get("COMMENT_BUFFER_SIZE", 50))
+    COMMENT_FLUSH_INTERVAL = float(os.environ.get("COMMENT_FLUSH_INTERVAL", 2))
+
+    # ─── Pencarian ───────────────────────
+    SEARCH_MAX_RESULTS = int(os.environ.get("SEARCH_MAX_RESULTS", 500))
+    SEARCH_CACHE_SIZE  = int(os.environ.get("SEARCH_CACHE_SIZE", 256))
+    SEARCH_CACHE_TTL   = int(os.environ.get("SEARCH_CACHE_TTL", 60))
+
+    # ─── Gambar ──────────────────────────
+    IMAGE_WEBP_QUALITY = int(os.environ.get("IMAGE_WEBP_QUALITY", 75))
+    IMAGE_JPEG_QUALITY = int(os.environ.get("IMAGE_JPEG_QUALITY", 80))
+
+    # ─── Berkas materi ───────────────────
+    MATERIAL_OFFLOAD      = os.environ.get("MATERIAL_OFFLOAD", "")
+    MATERIAL_ACCEL_PREFIX = os.environ.get("MATERIAL_ACCEL_PREFIX", "/_protected/materials/")
+    MATERIAL_MAX_AGE      = int(os.environ.get("MATERIAL_MAX_AGE", 86400))
+
+    # ─── Profiler & metrics ──────────────
+    SLOW_REQUEST_MS     = float(os.environ.get("SLOW_REQUEST_MS", 500))
+    PROFILER_HISTORY    = int(os.environ.get("PROFILER_HISTORY", 50))
+    METRICS             = os.environ.get("METRICS", "1") == "1"
+    METRICS_ALLOWED_IPS = set(os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(","))
+    METRICS_TOKEN       = os.environ.get("METRICS_TOKEN", "")
+
+    # ─── reCAPTCHA ───────────────────────
+    RECAPTCHA_SECRET_KEY        = os.environ.get("RECAPTCHA_SECRET_KEY", "6Lc8EIorAAAAAGSezt6y9xhzlxBohBHMTRUOZBvb")
+    RECAPTCHA_VERIFIER          = os.environ.get("RECAPTCHA_VERIFIER", "google")
+    RECAPTCHA_CONNECT_TIMEOUT   = float(os.environ.get("RECAPTCHA_CONNECT_TIMEOUT", 2))
+    RECAPTCHA_READ_TIMEOUT      = float(os.environ.get("RECAPTCHA_READ_TIMEOUT", 3))
+    RECAPTCHA_FAIL_OPEN         = os.environ.get("RECAPTCHA_FAIL_OPEN", "0") == "1"
+    RECAPTCHA_BREAKER_THRESHOLD = int(os.environ.get("RECAPTCHA_BREAKER_THRESHOLD", 5))
+    RECAPTCHA_BREAKER_COOLDOWN  = float(os.environ.get("RECAPTCHA_BREAKER_COOLDOWN", 30))
+
+    # ─── Password & login ────────────────
+    # Jumlah reverse proxy (nginx, load balancer) di depan aplikasi; >0 →
+    # request.remote_addr diambil dari X-Forwarded-For (throttle login per IP)
+    TRUSTED_PROXIES      = int(os.environ.get("TRUSTED_PROXIES", 0))
+    BCRYPT_ROUNDS        = int(os.environ.get("BCRYPT_ROUNDS", 12))
+    PASSWORD_WORKERS     = int(os.environ.get("PASSWORD_WORKERS", 2))
+    PASSWORD_QUEUE_MAX   = int(os.environ.get("PASSWORD_QUEUE_MAX", 8))
+    PASSWORD_TIMEOUT     = float(os.environ.get("PASSWORD_TIMEOUT", 5))
+    LOGIN_WINDOW_SECONDS = int(os.environ.get("LOGIN_WINDOW_SECONDS", 300))
+    LOGIN_MAX_FAILS_USER = int(os.environ.get("LOGIN_MAX_FAILS_USER", 5))
+    LOGIN_MAX_FAILS_IP   = int(os.environ.get("LOGIN_MAX_FAILS_IP", 20))
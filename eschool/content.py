@@ -0,0 +1,418 @@
+# eschool/content.py
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from os.path import splitext
+
+import click
+from bson.objectid import ObjectId
+from flask import current_app
+from flask.cli import with_appcontext
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from .cache import invalidate_pages
+from .db import db
+from .flusher import BackgroundFlusher
+from .search import search_terms_for, invalidate_search_cache
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow opsional: tanpa Pillow hanya file asli yang disimpan
+    Image = None
+
+# ----------------------------------------- #
+# 4b) HELPER: KOMENTAR & COUNTER ARTIKEL    #
+# ----------------------------------------- #
+# Setiap publikasi menyimpan `comment_count` sendiri sehingga halaman
+# listing tidak perlu count_documents per artikel. Jika
+# COMMENT_WRITE_BEHIND aktif, komentar ditampung di memori lalu ditulis
+# per batch (insert_many + $inc massal) oleh thread latar belakang.
+_comment_buffer = []
+_comment_lock = threading.Lock()
+
+
+def save_comment(comment_doc):
+    """Simpan komentar dan naikkan comment_count artikelnya."""
+    if not current_app.config["COMMENT_WRITE_BEHIND"]:
+        db.comments.insert_one(comment_doc)
+        db.publications.update_one(
+            {"_id": ObjectId(comment_doc["article_id"])},
+            {"$inc": {"comment_count": 1}}
+        )
+        db.publication_categories.update_one(
+            {"latest._id": ObjectId(comment_doc["article_id"])},
+            {"$inc": {"latest.$.comment_count": 1}}
+        )
+        invalidate_pages("comments")
+        return
+
+    with _comment_lock:
+        _comment_buffer.append(comment_doc)
+        is_full = len(_comment_buffer) >= current_app.config["COMMENT_BUFFER_SIZE"]
+
+    # request tidak menulis ke DB; buffer penuh hanya membangunkan flusher
+    _comment_flusher.start()
+    if is_full:
+        _comment_flusher.wake()
+
+
+def _requeue_comments(batch):
+    # kembalikan ke depan buffer, dicoba lagi pada flush berikutnya
+    with _comment_lock:
+        _comment_buffer[:0] = batch
+
+
+def flush_comment_buffer():
+    """Tulis semua komentar yang tertampung dalam satu batch."""
+    with _comment_lock:
+        batch = _comment_buffer[:]
+        del _comment_buffer[:]
+
+    if not batch:
+        return 0
+
+    try:
+        db.comments.insert_many(batch, ordered=False)
+    except BulkWriteError as e:
+        # percobaan ulang setelah gagal sebagian: komentar yang sudah masuk
+        # (insert_many sudah memberi _id) hanya menghasilkan duplicate key
+        if e.details.get("writeConcernErrors") or any(
+                err["code"] != 11000 for err in e.details.get("writeErrors", [])):
+            _requeue_comments(batch)
+            raise
+    except PyMongoError:
+        _requeue_comments(batch)
+        raise
+
+    counts = Counter(c["article_id"] for c in batch)
+    db.publications.bulk_write([
+        UpdateOne({"_id": ObjectId(article_id)}, {"$inc": {"comment_count": n}})
+        for article_id, n in counts.items()
+    ], ordered=False)
+    db.publication_categories.bulk_write([
+        UpdateOne({"latest._id": ObjectId(article_id)}, {"$inc": {"latest.$.comment_count": n}})
+        for article_id, n in counts.items()
+    ], ordered=False)
+    invalidate_pages("comments")
+    return len(batch)
+
+
+_comment_flusher = BackgroundFlusher("comment", flush_comment_buffer, "COMMENT_FLUSH_INTERVAL")
+
+
+@click.command("backfill-comment-counts")
+@with_appcontext
+def backfill_comment_counts():
+    """Hitung ulang comment_count semua publikasi dari koleksi comments."""
+    counts = {
+        row["_id"]: row["count"]
+        for row in db.comments.aggregate([
+            {"$group": {"_id": "$article_id", "count": {"$sum": 1}}}
+        ])
+    }
+
+    ops = []
+    for pub in db.publications.find({}, {"_id": 1}):
+        ops.append(UpdateOne(
+            {"_id": pub["_id"]},
+            {"$set": {"comment_count": counts.get(str(pub["_id"]), 0)}}
+        ))
+        if len(ops) >= 1000:
+            db.publications.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        db.publications.bulk_write(ops, ordered=False)
+
+    click.echo(f"comment_count updated for {len(counts)} commented article(s).")
+
+
+# ─── Backfill koleksi turunan ───────────
+# publication_categories & media diisi inkremental oleh write path, jadi
+# "koleksi kosong" bukan tanda backfill sudah jalan (upload pertama setelah
+# deploy sudah mengisinya). rebuild_*() menulis marker di koleksi
+# `migrations`; read path membangun ulang sekali bila marker belum ada.
+_backfills_checked = set()
+
+
+def _mark_backfilled(name):
+    db.migrations.update_one(
+        {"_id": name}, {"$set": {"done_at": datetime.now(timezone.utc)}}, upsert=True
+    )
+
+
+def _ensure_backfilled(name, rebuild):
+    key = (db.name, name)
+    if key in _backfills_checked:
+        return
+    if not db.migrations.find_one({"_id": name}, {"_id": 1}):
+        rebuild()
+    _backfills_checked.add(key)
+
+
+# ----------------------------------------- #
+# 4c) HELPER: STATISTIK KATEGORI PUBLIKASI  #
+# ----------------------------------------- #
+# Koleksi `publication_categories` berisi satu dokumen per kategori:
+#   {_id: <kategori>, count: <jumlah artikel>, latest: [<3 ringkasan terbaru>]}
+# Diperbarui secara inkremental oleh add/edit/delete artikel sehingga
+# sidebar berita cukup membaca koleksi kecil ini.
+CATEGORY_LATEST_LIMIT = 3
+CATEGORY_SUMMARY_FIELDS = {"title": 1, "feature_image": 1, "created_at": 1, "comment_count": 1}
+
+
+def _category_summary(pub):
+    return {
+        "_id": pub["_id"],
+        "title": pub.get("title", ""),
+        "feature_image": pub.get("feature_image"),
+        "created_at": pub.get("created_at"),
+        "comment_count": pub.get("comment_count", 0)
+    }
+
+
+def _category_latest(category):
+    return [
+        _category_summary(pub)
+        for pub in db.publications.find({"category": category}, CATEGORY_SUMMARY_FIELDS)
+                                  .sort("created_at", -1)
+                                  .limit(CATEGORY_LATEST_LIMIT)
+    ]
+
+
+def refresh_category_latest(category):
+    """Susun ulang daftar artikel terbaru untuk satu kategori."""
+    db.publication_categories.update_one(
+        {"_id": category},
+        {"$set": {"latest": _category_latest(category)}},
+        upsert=True
+    )
+
+
+def category_stats_added(pub):
+    db.publication_categories.update_one(
+        {"_id": pub.get("category")},
+        {
+            "$inc": {"count": 1},
+            "$push": {"latest": {
+                "$each": [_category_summary(pub)],
+                "$sort": {"created_at": -1},
+                "$slice": CATEGORY_LATEST_LIMIT
+            }}
+        },
+        upsert=True
+    )
+
+
+def category_stats_removed(category):
+    db.publication_categories.update_one({"_id": category}, {"$inc": {"count": -1}})
+    refresh_category_latest(category)
+
+
+def category_stats_edited(old_category, new_category):
+    if old_category != new_category:
+        db.publication_categories.update_one({"_id": old_category}, {"$inc": {"count": -1}})
+        db.publication_categories.update_one({"_id": new_category}, {"$inc": {"count": 1}}, upsert=True)
+        refresh_category_latest(old_category)
+    refresh_category_latest(new_category)
+
+
+def rebuild_category_stats():
+    """Bangun ulang seluruh koleksi publication_categories dari publications."""
+    counts = list(db.publications.aggregate([
+        {"$group": {"_id": "$category", "count": {"$sum": 1}}}
+    ]))
+    # replace_one+upsert per kategori: aman bila dua request membangun ulang
+    # bersamaan (delete_many+insert_many bisa berakhir DuplicateKeyError)
+    for row in counts:
+        db.publication_categories.replace_one(
+            {"_id": row["_id"]},
+            {"count": row["count"], "latest": _category_latest(row["_id"])},
+            upsert=True
+        )
+    db.publication_categories.delete_many({"_id": {"$nin": [row["_id"] for row in counts]}})
+    _mark_backfilled("category_stats")
+    return len(counts)
+
+
+def get_category_stats():
+    """Semua kategori yang memiliki artikel, urut berdasarkan nama."""
+    _ensure_backfilled("category_stats", rebuild_category_stats)
+    return list(db.publication_categories.find({"count": {"$gt": 0}}).sort("_id", 1))
+
+
+@click.command("rebuild-category-stats")
+@with_appcontext
+def rebuild_category_stats_command():
+    """Hitung ulang koleksi publication_categories."""
+    total = rebuild_category_stats()
+    click.echo(f"Rebuilt stats for {total} categorie(s).")
+
+
+# ----------------------------------------- #
+# 4h) HELPER: VARIAN GAMBAR (THUMB & WEBP)  #
+# ----------------------------------------- #
+# Saat upload, gambar galeri & feature image dibuatkan beberapa ukuran
+# (WebP + JPEG) di folder yang sama: <nama>_<lebar>.webp / .jpg.
+# Dokumen menyimpan width/height asli dan daftar varian untuk srcset.
+IMAGE_VARIANT_WIDTHS = (400, 1200)
+
+
+def make_image_variants(folder, filename):
+    """Kembalikan {"width", "height", "variants"} untuk disimpan di dokumen."""
+    info = {"width": None, "height": None, "variants": []}
+    if Image is None:
+        return info
+
+    stem = splitext(filename)[0]
+    try:
+        with Image.open(os.path.join(folder, filename)) as im:
+            im = ImageOps.exif_transpose(im)
+            info["width"], info["height"] = im.size
+
+            # JPEG tidak punya alpha → tempel di atas latar putih
+            if im.mode in ("RGBA", "LA", "P"):
+                im = im.convert("RGBA")
+                flat = Image.new("RGB", im.size, (255, 255, 255))
+                flat.paste(im, mask=im.getchannel("A"))
+                im = flat
+            else:
+                im = im.convert("RGB")
+
+            for width in IMAGE_VARIANT_WIDTHS:
+                if info["variants"] and width >= info["width"]:
+                    break
+                resized = im.copy()
+                resized.thumbnail((width, width * 10), Image.LANCZOS)
+
+                webp_name = f"{stem}_{width}.webp"
+                jpeg_name = f"{stem}_{width}.jpg"
+                resized.save(os.path.join(folder, webp_name), "WEBP",
+                             quality=current_app.config["IMAGE_WEBP_QUALITY"], method=6)
+                resized.save(os.path.join(folder, jpeg_name), "JPEG",
+                             quality=current_app.config["IMAGE_JPEG_QUALITY"], optimize=True, progressive=True)
+                info["variants"].append({
+                    "width": resized.width,
+                    "height": resized.height,
+                    "webp": webp_name,
+                    "jpeg": jpeg_name
+                })
+    except (OSError, Image.DecompressionBombError) as e:
+        current_app.logger.warning("Could not build variants for %s: %s", filename, e)
+    return info
+
+
+def remove_image_variants(folder, variants):
+    for v in variants or []:
+        for fname in (v.get("webp"), v.get("jpeg")):
+            path = os.path.join(folder, fname or "")
+            if fname and os.path.exists(path):
+                os.remove(path)
+
+
+@click.command("build-image-variants")
+@with_appcontext
+def build_image_variants_command():
+    """Buat varian untuk gambar galeri & feature image yang belum punya."""
+    total = 0
+    for img in db.gallery.find({"variants": {"$exists": False}}, {"filename": 1}):
+        info = make_image_variants(current_app.config["UPLOAD_FOLDER_GALLERY"], img["filename"])
+        db.gallery.update_one({"_id": img["_id"]}, {"$set": info})
+        total += 1
+    for pub in db.publications.find(
+        {"feature_image": {"$ne": None}, "feature_image_variants": {"$exists": False}},
+        {"feature_image": 1}
+    ):
+        info = make_image_variants(current_app.config["UPLOAD_FOLDER_PUBLICATIONS"], pub["feature_image"])
+        db.publications.update_one({"_id": pub["_id"]}, {"$set": {
+            "feature_image_width": info["width"],
+            "feature_image_height": info["height"],
+            "feature_image_variants": info["variants"]
+        }})
+        total += 1
+    click.echo(f"Built variants for {total} image(s).")
+
+
+# ----------------------------------------- #
+# 4i) HELPER: MEDIA (GALERI + FEATURE IMAGE)#
+# ----------------------------------------- #
+# Koleksi `media` adalah read model gabungan gambar galeri dan feature
+# image publikasi (satu dokumen per gambar, _id = _id dokumen sumber),
+# sehingga sort, pencarian dan pagination halaman galeri berjalan di MongoDB.
+MEDIA_NEWEST_FIRST = [("uploaded_at", -1), ("_id", -1)]
+
+
+def _media_doc(source, doc):
+    if source == "gallery":
+        return {
+            "_id": doc["_id"],
+            "source": "gallery",
+            "filename": doc.get("filename"),
+            "title": doc.get("title", ""),
+            "category": "Other",
+            "uploaded_at": doc.get("uploaded_at"),
+            "width": doc.get("width"),
+            "height": doc.get("height"),
+            "variants": doc.get("variants", [])
+        }
+    return {
+        "_id": doc["_id"],
+        "source": "publication",
+        "filename": doc.get("feature_image"),
+        "title": doc.get("title", ""),
+        "category": doc.get("category") or "News",
+        "uploaded_at": doc.get("created_at"),
+        "width": doc.get("feature_image_width"),
+        "height": doc.get("feature_image_height"),
+        "variants": doc.get("feature_image_variants", [])
+    }
+
+
+def sync_media(source, doc):
+    """Samakan entri media dengan dokumen galeri/publikasi terbaru."""
+    if source == "publication" and not doc.get("feature_image"):
+        remove_media(doc["_id"])
+        return
+    media = _media_doc(source, doc)
+    media["search_terms"] = search_terms_for("media", media)
+    db.media.replace_one({"_id": media["_id"]}, media, upsert=True)
+    invalidate_search_cache()
+
+
+def remove_media(doc_id):
+    db.media.delete_one({"_id": doc_id})
+    invalidate_search_cache()
+
+
+def rebuild_media():
+    db.media.delete_many({})
+    total = 0
+    for img in db.gallery.find():
+        sync_media("gallery", img)
+        total += 1
+    for pub in db.publications.find({"feature_image": {"$ne": None}}):
+        sync_media("publication", pub)
+        total += 1
+    _mark_backfilled("media")
+    return total
+
+
+def ensure_media():
+    """Bangun koleksi media sekali per database bila belum pernah dibangun."""
+    _ensure_backfilled("media", rebuild_media)
+
+
+@click.command("rebuild-media")
+@with_appcontext
+def rebuild_media_command():
+    """Bangun ulang koleksi media dari gallery dan publications."""
+    total = rebuild_media()
+    click.echo(f"Rebuilt media collection with {total} image(s).")
+
+
+def init_app(app):
+    app.cli.add_command(backfill_comment_counts)
+    app.cli.add_command(rebuild_category_stats_command)
+    app.cli.add_command(build_image_variants_command)
+    app.cli.add_command(rebuild_media_command)
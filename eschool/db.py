@@ -0,0 +1,96 @@
+# eschool/db.py
+# MongoClient dibuat saat pertama dipakai, satu per proses. Client yang
+# dibuat sebelum fork (mis. di master gunicorn) tidak aman dipakai di
+# worker, jadi PID dicatat dan client dibuat ulang bila proses berganti.
+import os
+import threading
+
+from flask import current_app
+from pymongo import MongoClient, monitoring
+from werkzeug.local import LocalProxy
+
+# ─── Profiler command MongoDB ───────────
+# Listener pymongo mencatat setiap command ke profil request yang sedang
+# berjalan di thread ini (diisi/ditutup oleh hook di eschool.monitoring).
+_db_profile = threading.local()
+
+
+class RequestCommandListener(monitoring.CommandListener):
+    def started(self, event):
+        profile = getattr(_db_profile, "current", None)
+        if profile is not None:
+            target = event.command.get(event.command_name)
+            profile["pending"][event.request_id] = {
+                "command": event.command_name,
+                "collection": target if isinstance(target, str) else "",
+                "filter": str(event.command.get("filter", event.command.get("pipeline", "")))[:300],
+            }
+
+    def _finish(self, event, ok):
+        profile = getattr(_db_profile, "current", None)
+        if profile is None:
+            return
+        entry = profile["pending"].pop(event.request_id, None)
+        if entry is not None:
+            entry.update(ms=event.duration_micros / 1000, ok=ok)
+            profile["commands"].append(entry)
+
+    def succeeded(self, event):
+        self._finish(event, True)
+
+    def failed(self, event):
+        self._finish(event, False)
+
+
+# ─── Client per proses ──────────────────
+_connect_lock = threading.Lock()
+
+
+def _connect(config):
+    return MongoClient(
+        config["MONGODB_URI"],
+        maxPoolSize=config["MONGO_MAX_POOL_SIZE"],
+        minPoolSize=config["MONGO_MIN_POOL_SIZE"],
+        maxIdleTimeMS=config["MONGO_MAX_IDLE_TIME_MS"] or None,
+        connectTimeoutMS=config["MONGO_CONNECT_TIMEOUT_MS"],
+        serverSelectionTimeoutMS=config["MONGO_SERVER_SELECTION_TIMEOUT_MS"],
+        socketTimeoutMS=config["MONGO_SOCKET_TIMEOUT_MS"] or None,
+        waitQueueTimeoutMS=config["MONGO_WAIT_QUEUE_TIMEOUT_MS"] or None,
+        event_listeners=[RequestCommandListener()] if config["DB_PROFILER"] else [],
+    )
+
+
+def _mongo_state():
+    app = current_app._get_current_object()
+    state = app.extensions.get("mongo")
+    if state is None or state["pid"] != os.getpid():
+        with _connect_lock:
+            state = app.extensions.get("mongo")
+            if state is None or state["pid"] != os.getpid():
+                state = {"pid": os.getpid(), "client": _connect(app.config), "db": None}
+                app.extensions["mongo"] = state
+    return state
+
+
+def get_client():
+    return _mongo_state()["client"]
+
+
+def get_db():
+    """Database DB_NAME milik proses ini (DB_NAME boleh diganti saat runtime, mis. `flask bench`)."""
+    state = _mongo_state()
+    name = current_app.config["DB_NAME"]
+    if state["db"] is None or state["db"].name != name:
+        state["db"] = state["client"][name]
+    return state["db"]
+
+
+def close_client():
+    """Tutup client proses ini; query berikutnya membuka client baru."""
+    state = current_app.extensions.pop("mongo", None)
+    if state is not None and state["pid"] == os.getpid():
+        state["client"].close()
+
+
+client = LocalProxy(get_client)
+db = LocalProxy(get_db)
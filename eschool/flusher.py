@@ -0,0 +1,45 @@
+# eschool/flusher.py
+import threading
+
+from flask import current_app
+
+
+# ----------------------------------------- #
+# 4m) HELPER: THREAD FLUSH LATAR BELAKANG   #
+# ----------------------------------------- #
+# Dipakai buffer log audit & komentar: satu thread daemon per proses
+# memanggil flush() setiap <interval_key> detik (dari app.config), atau
+# lebih cepat bila wake() dipanggil. Thread dibuat saat entri pertama
+# masuk (setelah fork worker), bukan saat import.
+class BackgroundFlusher:
+    def __init__(self, name, flush, interval_key):
+        self.name = name
+        self.flush = flush
+        self.interval_key = interval_key
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, args=(current_app._get_current_object(),),
+                    name=f"{self.name}-flusher", daemon=True
+                )
+                self._thread.start()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _run(self, app):
+        while True:
+            self._wakeup.wait(app.config[self.interval_key])
+            self._wakeup.clear()
+            with app.app_context():
+                try:
+                    self.flush()
+                except Exception:
+                    app.logger.exception("Failed to flush %s buffer", self.name)
@@ -0,0 +1,205 @@
+# eschool/indexes.py
+from datetime import datetime, timezone
+
+import click
+from bson.objectid import ObjectId
+from flask import current_app
+from flask.cli import with_appcontext
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import PyMongoError, ConnectionFailure
+
+from .audit import unread_messages_query, unread_logs_query
+from .db import db
+
+# ----------------------------------------- #
+# 4d) INDEX MONGODB                         #
+# ----------------------------------------- #
+# Satu-satunya tempat mendefinisikan index yang dibutuhkan aplikasi.
+# ensure_indexes() aman dipanggil berulang (create_indexes idempoten).
+INDEXES = {
+    "publications": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_desc"),
+        IndexModel([("category", ASCENDING), ("created_at", DESCENDING)], name="category_created_at"),
+    ],
+    "publication_categories": [
+        IndexModel([("latest._id", ASCENDING)], name="latest_id"),
+    ],
+    "comments": [
+        IndexModel([("article_id", ASCENDING), ("created_at", ASCENDING)], name="article_id_created_at"),
+    ],
+    "contact_messages": [
+        IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+        IndexModel([("email", ASCENDING), ("created_at", DESCENDING)], name="email_created_at"),
+    ],
+    "admin_logs": [
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp_id_desc"),
+        IndexModel([("admin_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="admin_id_timestamp_id"),
+    ],
+    "classes": [
+        IndexModel([("title", ASCENDING)], name="title"),
+        IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+    ],
+    "subjects": [
+        IndexModel([("class_id", ASCENDING), ("title", ASCENDING)], name="class_id_title"),
+        IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+    ],
+    "materials": [
+        IndexModel([("subject_id", ASCENDING), ("created_at", DESCENDING)], name="subject_id_created_at"),
+        IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+    ],
+    "teachers": [
+        IndexModel([("teacher_id", ASCENDING)], name="teacher_id_unique", unique=True),
+        IndexModel([("name", ASCENDING)], name="name"),
+    ],
+    "admin": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+    ],
+    "gallery": [
+        IndexModel([("uploaded_at", DESCENDING)], name="uploaded_at_desc"),
+    ],
+    "login_throttle": [
+        IndexModel([("expire_at", ASCENDING)], name="expire_at_ttl", expireAfterSeconds=0),
+    ],
+    "upload_sessions": [
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at"),
+    ],
+    "media": [
+        IndexModel([("uploaded_at", DESCENDING), ("_id", DESCENDING)], name="uploaded_at_desc"),
+        IndexModel([("category", ASCENDING), ("uploaded_at", DESCENDING)], name="category_uploaded_at"),
+    ],
+    "extracurricular": [
+        IndexModel([("name", ASCENDING)], name="name"),
+    ],
+}
+
+# Field yang dicari beserta bobot relevansinya (dipakai untuk text index).
+SEARCH_FIELDS = {
+    "publications":    {"title": 10, "category": 5, "author": 3, "content": 1},
+    "teachers":        {"name": 10, "teacher_id": 8, "position": 5, "subject": 5, "email": 3},
+    "extracurricular": {"name": 10, "description": 1},
+    "classes":         {"title": 10, "description": 1},
+    "subjects":        {"title": 10, "description": 1},
+    "materials":       {"title": 10, "description": 1},
+    "media":           {"title": 10, "filename": 2},
+}
+# Field panjang hanya masuk text index, tidak ke daftar token prefix.
+SEARCH_FULLTEXT_ONLY = {"content"}
+
+for _coll, _weights in SEARCH_FIELDS.items():
+    INDEXES.setdefault(_coll, []).extend([
+        IndexModel([(f, TEXT) for f in _weights], weights=_weights,
+                   default_language="none", name="search_text"),
+        IndexModel([("search_terms", ASCENDING)], name="search_terms"),
+    ])
+
+
+def index_models():
+    """INDEXES ditambah index yang bergantung pada konfigurasi."""
+    models = {coll: list(m) for coll, m in INDEXES.items()}
+    # TTL index hanya dibuat bila retensi otomatis diaktifkan
+    ttl_days = current_app.config["AUDIT_LOG_TTL_DAYS"]
+    if ttl_days > 0:
+        models["admin_logs"].append(
+            IndexModel([("timestamp", ASCENDING)], name="timestamp_ttl",
+                       expireAfterSeconds=ttl_days * 86400)
+        )
+    return models
+
+
+def ensure_indexes():
+    """Buat semua index di INDEXES; kegagalan satu koleksi tidak menghentikan yang lain."""
+    for coll_name, models in index_models().items():
+        try:
+            db[coll_name].create_indexes(models)
+        except ConnectionFailure as e:
+            current_app.logger.warning("Skipping index creation, MongoDB unreachable: %s", e)
+            return
+        except PyMongoError as e:
+            current_app.logger.warning("Could not ensure indexes on %s: %s", coll_name, e)
+
+
+# Query representatif per route: (route, koleksi, filter, sort, limit)
+INDEX_CHECK_QUERIES = [
+    ("home",                     "publications",     {}, [("created_at", -1)], 3),
+    ("news_articles",            "publications",     {}, [("created_at", -1), ("_id", -1)], 5),
+    ("news_articles (sidebar)",  "publication_categories", {"count": {"$gt": 0}}, [("_id", 1)], 0),
+    ("single (comments)",        "comments",         {"article_id": "000000000000000000000000"}, [("created_at", 1)], 0),
+    ("single (related)",         "publications",     {"category": "News", "_id": {"$ne": ObjectId()}}, [("created_at", -1)], 3),
+    ("gallery",                  "media",            {}, [("uploaded_at", -1), ("_id", -1)], 12),
+    ("gallery (category)",       "media",            {"category": "News"}, [("uploaded_at", -1)], 12),
+    ("teachers",                 "teachers",         {}, [("name", 1)], 0),
+    ("materials_classes",        "classes",          {}, [("title", 1)], 0),
+    ("materials_subjects",       "subjects",         {"class_id": ObjectId()}, [("title", 1)], 0),
+    ("materials",                "materials",        {"subject_id": ObjectId()}, [("created_at", -1)], 0),
+    ("submit_contact_message",   "contact_messages", {"email": "a@b.c", "created_at": {"$gt": datetime.now(timezone.utc)}}, None, 1),
+    ("login",                    "admin",            {"username": "admin"}, None, 1),
+    ("dashboard (messages)",     "contact_messages", {}, [("created_at", -1)], 5),
+    ("dashboard (logs)",         "admin_logs",       {}, [("timestamp", -1)], 5),
+    ("notifications (messages)", "contact_messages", unread_messages_query(ObjectId(), datetime.min), [("created_at", -1)], 3),
+    ("notifications (logs)",     "admin_logs",       unread_logs_query(ObjectId(), datetime.min), [("timestamp", -1)], 3),
+    ("admin_teachers",           "teachers",         {}, [("name", 1)], 5),
+    ("edit_teacher",             "teachers",         {"teacher_id": "T001"}, None, 1),
+    ("admin_contact",            "contact_messages", {}, [("created_at", -1)], 5),
+    ("admin_logs",               "admin_logs",       {}, [("timestamp", -1), ("_id", -1)], 26),
+    ("admin_logs (by admin)",    "admin_logs",       {"admin_id": ObjectId()}, [("timestamp", -1), ("_id", -1)], 26),
+    ("admin_gallery",            "media",            {}, [("uploaded_at", -1), ("_id", -1)], 5),
+    ("admin_extracurricular",    "extracurricular",  {}, [("name", 1)], 5),
+    ("admin_materials (classes)",   "classes",       {}, [("created_at", -1)], 3),
+    ("admin_materials (subjects)",  "subjects",      {}, [("created_at", -1)], 3),
+    ("admin_materials (materials)", "materials",     {}, [("created_at", -1)], 5),
+    ("admin_list",               "admin",            {}, [("username", 1)], 5),
+]
+
+
+def _plan_stages(plan):
+    """Kumpulkan semua nama stage dari pohon winningPlan."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+@click.command("ensure-indexes")
+@with_appcontext
+def ensure_indexes_command():
+    """Buat semua index yang terdaftar di INDEXES."""
+    ensure_indexes()
+    click.echo(f"Ensured indexes on {len(INDEXES)} collection(s).")
+
+
+@click.command("check-indexes")
+@with_appcontext
+def check_indexes_command():
+    """Jalankan explain() pada query tiap route dan laporkan COLLSCAN / SORT."""
+    problems = 0
+    for route, coll_name, query, sort, limit in INDEX_CHECK_QUERIES:
+        cursor = db[coll_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+
+        plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+        stages = _plan_stages(plan)
+        flagged = [st for st in ("COLLSCAN", "SORT") if st in stages]
+
+        if flagged:
+            problems += 1
+            click.echo(f"[WARN] {route:<30} {coll_name:<22} {' + '.join(flagged)}")
+        else:
+            click.echo(f"[ OK ] {route:<30} {coll_name:<22} {' > '.join(reversed(stages))}")
+
+    click.echo(f"{problems} of {len(INDEX_CHECK_QUERIES)} queries fall back to COLLSCAN or in-memory SORT.")
+    if problems:
+        raise SystemExit(1)
+
+
+def init_app(app):
+    app.cli.add_command(ensure_indexes_command)
+    app.cli.add_command(check_indexes_command)
@@ -0,0 +1,803 @@
+# eschool/materials.py
+import os
+import time
+import shutil
+import mimetypes
+from math import ceil
+from os.path import join
+from urllib.parse import quote
+from datetime import datetime, timezone, timedelta
+
+import click
+from bson.objectid import ObjectId
+from flask import (
+    Blueprint, current_app, render_template, request,
+    redirect, url_for, session, flash,
+    send_from_directory, abort, jsonify
+)
+from pymongo.errors import PyMongoError
+from werkzeug.security import safe_join
+from werkzeug.utils import secure_filename, send_file as werkzeug_send_file
+
+from .audit import log_admin_action
+from .cache import cached_page
+from .config import STATIC_DIR
+from .db import db
+from .monitoring import record_upload
+from .pagination import get_page_arg, paginate
+from .search import search_collection, search_terms_for, invalidate_search_cache
+from .uploads import allowed_material, allowed_image, save_upload
+
+bp = Blueprint("materials", __name__, cli_group=None)
+
+
+# ------------------------------- #
+# 5a) PUBLIC: E-LEARNING          #
+# ------------------------------- #
+@bp.route("/materials/classes")
+@cached_page("materials")
+def materials_classes():
+    classes = list(db.classes.find().sort("title", 1))
+    return render_template("user/classes.html", active_page="materials_classes",  classes=classes)
+
+
+@bp.route("/materials/subjects/<class_id>")
+@cached_page("materials")
+def materials_subjects(class_id):
+    # dokumen kelas
+    cls = db.classes.find_one({"_id": ObjectId(class_id)})
+
+    # ⇢ konversi class_id URL (string) ke ObjectId terlebih dahulu
+    subjects = list(
+        db.subjects.find({"class_id": ObjectId(class_id)}).sort("title", 1)
+    )
+
+    return render_template(
+        "user/subjects.html",
+        class_data=cls,
+        subjects=subjects
+    )
+
+
+@bp.route("/materials/<subject_id>")
+@cached_page("materials")
+def materials(subject_id):
+    subject = db.subjects.find_one({"_id": ObjectId(subject_id)})
+    class_data = db.classes.find_one({"_id": ObjectId(subject["class_id"])})
+    mats = list(db.materials.find({"subject_id": ObjectId(subject_id)}).sort("created_at", -1))
+    return render_template(
+        "user/materials.html",
+        subject=subject,
+        class_id=class_data["_id"],
+        class_title=class_data["title"],
+        materials=mats
+    )
+
+
+@bp.route("/materials/detail/<material_id>")
+@cached_page("materials")
+def detail_material(material_id):
+    material = db.materials.find_one({"_id": ObjectId(material_id)})
+    subject = db.subjects.find_one({"_id": ObjectId(material["subject_id"])})
+    class_data = db.classes.find_one({"_id": ObjectId(subject["class_id"])})
+    more_materials = list(db.materials.find({
+        "subject_id": str(subject["_id"]),
+        "_id": {"$ne": ObjectId(material_id)}
+    }).sort("created_at", -1).limit(3))
+    return render_template(
+        "user/detail_materials.html",
+        material=material,
+        subject=subject,
+        class_id=class_data["_id"],
+        class_title=class_data["title"],
+        more_materials=more_materials
+    )
+
+
+# Streaming berkas materi (video/PDF). Flask/Werkzeug sudah menangani
+# Range (206), If-None-Match / If-Modified-Since / If-Range, dan memakai
+# wsgi.file_wrapper (sendfile) bila server menyediakannya. Mode offload
+# menyerahkan pengiriman byte ke proxy depan; aplikasi hanya cek akses.
+#   MATERIAL_OFFLOAD=""           → dikirim aplikasi
+#   MATERIAL_OFFLOAD="x-accel"    → header X-Accel-Redirect (nginx)
+#   MATERIAL_OFFLOAD="x-sendfile" → header X-Sendfile (Apache/lighttpd)
+@bp.route("/materials/file/<material_id>/<path:filename>")
+def material_file(material_id, filename):
+    try:
+        obj_id = ObjectId(material_id)
+    except Exception:
+        abort(404)
+
+    # Hanya berkas yang memang terdaftar pada materi ini yang boleh diunduh
+    if not db.materials.find_one({"_id": obj_id, "filenames": filename}, {"_id": 1}):
+        abort(404)
+
+    folder = current_app.config["UPLOAD_FOLDER_MATERIALS"]
+    path = safe_join(folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    as_attachment = request.args.get("download") == "1"
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    offload = current_app.config["MATERIAL_OFFLOAD"]
+
+    if offload == "x-accel":
+        response = current_app.response_class(mimetype=mimetype)
+        response.headers["X-Accel-Redirect"] = current_app.config["MATERIAL_ACCEL_PREFIX"] + quote(filename)
+        if as_attachment:
+            response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    if offload == "x-sendfile":
+        return werkzeug_send_file(
+            path, request.environ, mimetype=mimetype, as_attachment=as_attachment,
+            use_x_sendfile=True, conditional=True, max_age=current_app.config["MATERIAL_MAX_AGE"]
+        )
+
+    return send_from_directory(
+        folder, filename, mimetype=mimetype, as_attachment=as_attachment,
+        conditional=True, etag=True, max_age=current_app.config["MATERIAL_MAX_AGE"]
+    )
+
+
+# ---------------------------------------- #
+# 15) ADMIN: E-LEARNING ADMIN              #
+# ---------------------------------------- #
+@bp.route("/admin_materials")
+def admin_materials():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    # ────────────────────────────── query-string params ──────────────────────
+    page         = get_page_arg("page")           # materials page
+    class_page   = get_page_arg("class_page")     # classes  page
+    subject_page = get_page_arg("subject_page")   # subjects page
+
+    # keyword pencarian
+    search_query   = request.args.get("search", "").strip()
+    class_search   = request.args.get("class_search", "").strip()
+    subject_search = request.args.get("subject_search", "").strip()
+
+    # batas per-halaman
+    per_page         = 5      # materials
+    class_per_page   = 3      # classes
+    subject_per_page = 3      # subjects
+
+    # ──────────────────────── dropdown & lookup (field ringan saja) ──────────
+    classes_list = [
+        {**cls, "_id": str(cls["_id"])}
+        for cls in db.classes.find({}, {"title": 1}).sort("title", 1)
+    ]
+    subjects_list = [
+        {**subj, "_id": str(subj["_id"]), "class_id": str(subj.get("class_id", ""))}
+        for subj in db.subjects.find({}, {"title": 1, "class_id": 1}).sort("title", 1)
+    ]
+    class_map   = {c["_id"]: c for c in classes_list}
+    subject_map = {s["_id"]: s for s in subjects_list}
+
+    # ────────────────────────────── CLASSES ──────────────────────────────────
+    if class_search:
+        class_result = search_collection("classes", class_search, [("created_at", -1)], class_page, class_per_page)
+    else:
+        class_result = paginate(db.classes, {}, [("created_at", -1)], class_page, class_per_page)
+    classes_display = [{**cls, "_id": str(cls["_id"])} for cls in class_result["items"]]
+
+    # ────────────────────────────── SUBJECTS ─────────────────────────────────
+    if subject_search:
+        subject_result = search_collection("subjects", subject_search, [("created_at", -1)], subject_page, subject_per_page)
+    else:
+        subject_result = paginate(db.subjects, {}, [("created_at", -1)], subject_page, subject_per_page)
+    subjects_display = [
+        {**subj, "_id": str(subj["_id"]), "class_id": str(subj.get("class_id", ""))}
+        for subj in subject_result["items"]
+    ]
+
+    # ────────────────────────────── MATERIALS ────────────────────────────────
+    if search_query:
+        material_result = search_collection("materials", search_query, [("created_at", -1)], page, per_page)
+    else:
+        material_result = paginate(db.materials, {}, [("created_at", -1)], page, per_page)
+
+    materials_list = []
+    for mat in material_result["items"]:
+        mat["_id"]       = str(mat["_id"])
+        subj_id          = str(mat.get("subject_id", ""))
+        cls_id           = str(mat.get("class_id", ""))
+        mat["subject"]   = subject_map.get(subj_id, {}).get("title", "-")
+        mat["class_name"] = class_map.get(cls_id, {}).get("title", "-")
+        materials_list.append(mat)
+
+    # ────────────────────────────── render page ──────────────────────────────
+    return render_template(
+        "admin/materials.html",
+        active_page="admin_materials",
+
+        # dropdown & JS helper → list lengkap
+        classes=classes_list,
+        subjects=subjects_list,
+
+        # tabel (paginated)
+        classes_display=classes_display,
+        subjects_display=subjects_display,
+        materials=materials_list,
+
+        # pagination numbers
+        page=material_result["page"],         total_pages=material_result["total_pages"],
+        class_page=class_result["page"],      class_total_pages=class_result["total_pages"],
+        subject_page=subject_result["page"],  subject_total_pages=subject_result["total_pages"],
+        class_per_page=class_per_page,   subject_per_page=subject_per_page,
+
+        # kirim kembali kata kunci pencarian supaya <input> tetap terisi
+        search_query=search_query,
+        class_search=class_search,
+        subject_search=subject_search
+    )
+
+
+# ─── CLASS CRUD ─────────────────────────
+@bp.route("/add_class_materials", methods=["POST"])
+def add_class_materials():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    title       = request.form["title"].strip()
+    description = request.form.get("description", "").strip()
+    img         = request.files.get("image")
+    img_name    = ""
+
+    if img and img.filename:
+        if not allowed_image(img.filename):
+            flash("Image type not allowed", "danger")
+            return redirect(url_for("materials.admin_materials"))
+        # ⇢ rename with date-time
+        timestamp  = datetime.now().strftime("%Y%m%d%H%M%S")
+        _, ext     = os.path.splitext(secure_filename(img.filename))
+        img_name   = f"{timestamp}{ext}"
+        save_upload(img, join(current_app.config["UPLOAD_FOLDER_CLASSES"], img_name))
+
+    cls_doc = {
+        "title": title,
+        "description": description,
+        "image": img_name,
+        "created_at": datetime.now(timezone.utc),
+    }
+    cls_doc["search_terms"] = search_terms_for("classes", cls_doc)
+    cls_id = db.classes.insert_one(cls_doc).inserted_id
+    invalidate_search_cache()
+
+    log_admin_action(session["admin_id"], session["admin_username"], f"Added class {cls_id}")
+    flash("Class added", "success")
+    return redirect(url_for("materials.admin_materials"))
+
+
+@bp.route("/edit_class_materials/<class_id>", methods=["POST"])
+def edit_class_materials(class_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    cls = db.classes.find_one({"_id": ObjectId(class_id)})
+    if not cls:
+        flash("Class not found", "danger")
+        return redirect(url_for("materials.admin_materials"))
+
+    title       = request.form["title"].strip()
+    description = request.form.get("description", "").strip()
+    img         = request.files.get("image")
+
+    update = {
+        "title": title,
+        "description": description,
+        "updated_at": datetime.now(timezone.utc)
+    }
+    update["search_terms"] = search_terms_for("classes", update)
+
+    if img and img.filename:
+        if not allowed_image(img.filename):
+            flash("Image type not allowed", "danger")
+            return redirect(url_for("materials.admin_materials"))
+        # hapus gambar lama (jika ada)
+        if cls.get("image"):
+            old = join(current_app.config["UPLOAD_FOLDER_CLASSES"], cls["image"])
+            if os.path.exists(old):
+                os.remove(old)
+        # rename baru
+        timestamp  = datetime.now().strftime("%Y%m%d%H%M%S")
+        _, ext     = os.path.splitext(secure_filename(img.filename))
+        img_name   = f"{timestamp}{ext}"
+        save_upload(img, join(current_app.config["UPLOAD_FOLDER_CLASSES"], img_name))
+        update["image"] = img_name
+
+    db.classes.update_one({"_id": cls["_id"]}, {"$set": update})
+    invalidate_search_cache()
+    log_admin_action(session["admin_id"], session["admin_username"], f"Edited class {class_id}")
+    flash("Class updated", "success")
+    return redirect(url_for("materials.admin_materials"))
+
+
+@bp.route("/delete_class_materials/<class_id>", methods=["POST"])
+def delete_class_materials(class_id):
+    if "admin_id" not in session: return redirect(url_for("auth.login"))
+    cls=db.classes.find_one({'_id':ObjectId(class_id)})
+    if not cls: flash("Class not found","danger"); return redirect(url_for('materials.admin_materials'))
+    if cls.get('image'):
+        p=join(current_app.config['UPLOAD_FOLDER_CLASSES'],cls['image']);
+        if os.path.exists(p): os.remove(p)
+    db.classes.delete_one({'_id':cls['_id']})
+    invalidate_search_cache()
+    log_admin_action(session['admin_id'], session['admin_username'], f"Deleted class {class_id}")
+    flash("Class deleted","success")
+    return redirect(url_for('materials.admin_materials'))
+
+
+# ─── SUBJECT CRUD ───────────────────────
+@bp.route("/add_subject_materials", methods=["POST"])
+def add_subject_materials():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    title       = request.form["title"].strip()
+    description = request.form.get("description", "").strip()
+    class_id    = request.form.get("class_id")
+    img         = request.files.get("image")
+    img_name    = ""
+
+    if img and img.filename:
+        if not allowed_image(img.filename):
+            flash("Image type not allowed", "danger")
+            return redirect(url_for("materials.admin_materials"))
+        timestamp  = datetime.now().strftime("%Y%m%d%H%M%S")
+        _, ext     = os.path.splitext(secure_filename(img.filename))
+        img_name   = f"{timestamp}{ext}"
+        save_upload(img, join(current_app.config["UPLOAD_FOLDER_SUBJECTS"], img_name))
+
+    subj_doc = {
+        "class_id": ObjectId(class_id),
+        "title": title,
+        "description": description,
+        "image": img_name,
+        "created_at": datetime.now(timezone.utc)
+    }
+    subj_doc["search_terms"] = search_terms_for("subjects", subj_doc)
+    subj_id = db.subjects.insert_one(subj_doc).inserted_id
+    invalidate_search_cache()
+
+    log_admin_action(session["admin_id"], session["admin_username"], f"Added subject {subj_id}")
+    flash("Subject added", "success")
+    return redirect(url_for("materials.admin_materials"))
+
+
+@bp.route("/edit_subject_materials/<subject_id>", methods=["POST"])
+def edit_subject_materials(subject_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    subj = db.subjects.find_one({"_id": ObjectId(subject_id)})
+    if not subj:
+        flash("Subject not found", "danger")
+        return redirect(url_for("materials.admin_materials"))
+
+    title       = request.form["title"].strip()
+    description = request.form.get("description", "").strip()
+    class_id    = request.form.get("class_id")
+    img         = request.files.get("image")
+
+    update = {
+        "title": title,
+        "description": description,
+        "class_id": ObjectId(class_id),
+        "updated_at": datetime.now(timezone.utc)
+    }
+    update["search_terms"] = search_terms_for("subjects", update)
+
+    if img and img.filename:
+        if not allowed_image(img.filename):
+            flash("Image type not allowed", "danger")
+            return redirect(url_for("materials.admin_materials"))
+        if subj.get("image"):
+            old = join(current_app.config["UPLOAD_FOLDER_SUBJECTS"], subj["image"])
+            if os.path.exists(old):
+                os.remove(old)
+        timestamp  = datetime.now().strftime("%Y%m%d%H%M%S")
+        _, ext     = os.path.splitext(secure_filename(img.filename))
+        img_name   = f"{timestamp}{ext}"
+        save_upload(img, join(current_app.config["UPLOAD_FOLDER_SUBJECTS"], img_name))
+        update["image"] = img_name
+
+    db.subjects.update_one({"_id": subj["_id"]}, {"$set": update})
+    invalidate_search_cache()
+    log_admin_action(session["admin_id"], session["admin_username"], f"Edited subject {subject_id}")
+    flash("Subject updated", "success")
+    return redirect(url_for("materials.admin_materials"))
+
+
+@bp.route("/delete_subject_materials/<subject_id>", methods=["POST"])
+def delete_subject_materials(subject_id):
+    if "admin_id" not in session: return redirect(url_for("auth.login"))
+    subj=db.subjects.find_one({'_id':ObjectId(subject_id)})
+    if not subj: flash("Subject not found","danger"); return redirect(url_for('materials.admin_materials'))
+    if subj.get('image'):
+        p=join(current_app.config['UPLOAD_FOLDER_SUBJECTS'],subj['image']);
+        if os.path.exists(p): os.remove(p)
+    db.subjects.delete_one({'_id':subj['_id']})
+    invalidate_search_cache()
+    log_admin_action(session['admin_id'], session['admin_username'], f"Deleted subject {subject_id}")
+    flash("Subject deleted","success")
+    return redirect(url_for('materials.admin_materials'))
+
+
+# ─── MATERIAL CRUD ───────────────────────
+def _material_form_error(subject_id, class_id, files):
+    """Pesan error untuk form materi, atau None bila valid."""
+    if not (ObjectId.is_valid(subject_id or "") and ObjectId.is_valid(class_id or "")):
+        return "Invalid subject or class."
+    if not all(allowed_material(f.filename) for f in files):
+        return "One or more file types not allowed."
+    return None
+
+
+def _save_material_files(files):
+    """Simpan upload biasa ke folder materi; semua atau tidak sama sekali."""
+    saved = []
+    try:
+        for f in files:
+            ts = datetime.now().strftime("%Y%m%d%H%M%S")
+            _, ext = os.path.splitext(secure_filename(f.filename))
+            new_fn = f"{ts}{ext}"              # <-- only timestamp + extension
+            save_upload(f, os.path.join(current_app.config['UPLOAD_FOLDER_MATERIALS'], new_fn))
+            saved.append(new_fn)
+    except OSError:
+        _remove_material_files(saved)
+        raise
+    return saved
+
+
+def _remove_material_files(filenames):
+    for fn in filenames:
+        path = os.path.join(current_app.config['UPLOAD_FOLDER_MATERIALS'], fn)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@bp.route("/add_material", methods=["POST"])
+def add_material():
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    title       = request.form['title'].strip()
+    description = request.form.get('description', '').strip()
+    subject_id  = request.form.get('subject_id')
+    class_id    = request.form.get('class_id')
+    video_link  = request.form.get('video_link', '').strip()
+
+    # validasi dulu; sesi chunked upload baru diklaim setelah form valid
+    files = [f for f in request.files.getlist('files') if f and f.filename]
+    error = _material_form_error(subject_id, class_id, files)
+    if error:
+        flash(error, "danger")
+        return redirect(url_for("materials.admin_materials"))
+
+    chunked = finished_upload_filenames(request.form.getlist('upload_ids'))
+    saved = []
+    try:
+        saved = _save_material_files(files)
+        mat_doc = {
+            'subject_id': ObjectId(subject_id),
+            'class_id'  : ObjectId(class_id),
+            'title'      : title,
+            'description': description,
+            'filenames'  : saved + chunked,
+            'video_link' : video_link,
+            'created_at' : datetime.now(timezone.utc)
+        }
+        mat_doc['search_terms'] = search_terms_for("materials", mat_doc)
+        mat_id = db.materials.insert_one(mat_doc).inserted_id
+    except (OSError, PyMongoError):
+        _remove_material_files(saved)
+        release_upload_filenames(chunked)
+        raise
+    invalidate_search_cache()
+
+    log_admin_action(session['admin_id'], session['admin_username'], f"Added material {mat_id}")
+    flash("Material added successfully.", "success")
+    return redirect(url_for('materials.admin_materials'))
+
+
+@bp.route("/edit_material/<material_id>", methods=["POST"])
+def edit_material(material_id):
+    if "admin_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    mat = db.materials.find_one({'_id': ObjectId(material_id)})
+    if not mat:
+        flash("Material not found.", "danger")
+        return redirect(url_for('materials.admin_materials'))
+
+    title       = request.form['title'].strip()
+    description = request.form.get('description', '').strip()
+    subject_id  = request.form.get('subject_id')
+    class_id    = request.form.get('class_id')
+    video_link  = request.form.get('video_link', '').strip()
+
+    files = [f for f in request.files.getlist('files') if f and f.filename]
+    error = _material_form_error(subject_id, class_id, files)
+    if error:
+        flash(error, "danger")
+        return redirect(url_for("materials.admin_materials"))
+
+    update = {
+        'title'      : title,
+        'description': description,
+        'subject_id' : ObjectId(subject_id),
+        'class_id'   : ObjectId(class_id),
+        'video_link' : video_link,
+        'updated_at' : datetime.now(timezone.utc)
+    }
+    update['search_terms'] = search_terms_for("materials", update)
+
+    # jika ada upload baru, replace semua file lama; file lama baru dihapus
+    # setelah dokumen materi menunjuk ke set file yang baru
+    chunked = finished_upload_filenames(request.form.getlist('upload_ids'))
+    saved = []
+    try:
+        saved = _save_material_files(files)
+        if saved or chunked:
+            update['filenames'] = saved + chunked
+        db.materials.update_one({'_id': mat['_id']}, {'$set': update})
+    except (OSError, PyMongoError):
+        _remove_material_files(saved)
+        release_upload_filenames(chunked)
+        raise
+    if 'filenames' in update:
+        _remove_material_files(set(mat.get('filenames', [])) - set(update['filenames']))
+    invalidate_search_cache()
+    log_admin_action(session['admin_id'], session['admin_username'], f"Edited material {material_id}")
+    flash("Material updated.", "success")
+    return redirect(url_for('materials.admin_materials'))
+
+
+@bp.route("/delete_material/<material_id>", methods=["POST"])
+def delete_material(material_id):
+    if "admin_id" not in session: return redirect(url_for("auth.login"))
+    mat=db.materials.find_one({'_id':ObjectId(material_id)})
+    if not mat: flash("Material not found.","danger"); return redirect(url_for('materials.admin_materials'))
+    if mat.get('filename'):
+        p=join(current_app.config['UPLOAD_FOLDER_MATERIALS'],mat['filename']);
+        if os.path.exists(p): os.remove(p)
+    db.materials.delete_one({'_id':mat['_id']})
+    invalidate_search_cache()
+    log_admin_action(session['admin_id'], session['admin_username'], f"Deleted material {material_id}")
+    flash("Material deleted.","success")
+    return redirect(url_for('materials.admin_materials'))
+
+
+# ─── CHUNKED UPLOAD (berkas materi besar) ─
+# Alur: init → PUT chunk bernomor (boleh diulang / paralel) → finalize.
+# Setiap chunk ditulis langsung ke posisi offset-nya di file .part
+# (memori terbatas per blok), sehingga upload yang terputus cukup
+# melanjutkan chunk yang belum tercatat di `received`.
+UPLOAD_STREAM_BLOCK = 256 * 1024
+
+
+def _upload_session(upload_id):
+    try:
+        obj_id = ObjectId(upload_id)
+    except Exception:
+        return None
+    return db.upload_sessions.find_one({"_id": obj_id, "admin_id": ObjectId(session["admin_id"])})
+
+
+def _upload_status(sess):
+    return {
+        "upload_id": str(sess["_id"]),
+        "chunk_size": sess["chunk_size"],
+        "total_chunks": sess["total_chunks"],
+        "received": sorted(sess.get("received", [])),
+        "status": sess["status"],
+        "filename": sess.get("filename")
+    }
+
+
+def finished_upload_filenames(upload_ids):
+    """Nama file dari sesi chunked upload admin ini yang sudah di-finalize.
+
+    Sesi ditandai "attached" secara atomik, sehingga satu berkas hanya bisa
+    dilampirkan ke satu materi (edit/hapus materi lain tidak menghapusnya).
+    Panggil setelah form valid; bila penyimpanan gagal, lepas lagi dengan
+    release_upload_filenames()."""
+    filenames = []
+    for upload_id in upload_ids:
+        if not ObjectId.is_valid(upload_id):
+            continue
+        sess = db.upload_sessions.find_one_and_update(
+            {"_id": ObjectId(upload_id), "admin_id": ObjectId(session["admin_id"]), "status": "done"},
+            {"$set": {"status": "attached"}}
+        )
+        if sess:
+            filenames.append(sess["filename"])
+    return filenames
+
+
+def release_upload_filenames(filenames):
+    """Kembalikan sesi "attached" ke "done" bila materi batal disimpan."""
+    if filenames:
+        db.upload_sessions.update_many(
+            {"admin_id": ObjectId(session["admin_id"]), "filename": {"$in": filenames}, "status": "attached"},
+            {"$set": {"status": "done"}}
+        )
+
+
+@bp.route("/uploads/materials/init", methods=["POST"])
+def upload_material_init():
+    if "admin_id" not in session:
+        return jsonify(error="unauthorized"), 401
+
+    data = request.get_json(silent=True) or {}
+    original = secure_filename(str(data.get("filename", "")))
+    try:
+        size = int(data.get("size", 0))
+    except (TypeError, ValueError):
+        size = 0
+
+    if not original or not allowed_material(original):
+        return jsonify(error="File type not allowed."), 400
+    if size <= 0 or size > current_app.config["MATERIAL_MAX_UPLOAD_SIZE"]:
+        return jsonify(error="Invalid file size."), 400
+
+    chunk_size = current_app.config["MATERIAL_CHUNK_SIZE"]
+    sess = {
+        "_id": ObjectId(),
+        "admin_id": ObjectId(session["admin_id"]),
+        "original_filename": original,
+        "size": size,
+        "chunk_size": chunk_size,
+        "total_chunks": ceil(size / chunk_size),
+        "received": [],
+        "status": "uploading",
+        "created_at": datetime.now(timezone.utc)
+    }
+
+    # File sparse seukuran target; setiap chunk mengisi posisinya sendiri
+    with open(os.path.join(current_app.config["UPLOAD_FOLDER_PARTIAL"], f"{sess['_id']}.part"), "wb") as fh:
+        fh.truncate(size)
+    db.upload_sessions.insert_one(sess)
+    return jsonify(_upload_status(sess)), 201
+
+
+@bp.route("/uploads/materials/<upload_id>", methods=["GET"])
+def upload_material_status(upload_id):
+    if "admin_id" not in session:
+        return jsonify(error="unauthorized"), 401
+    sess = _upload_session(upload_id)
+    if not sess:
+        return jsonify(error="Upload not found."), 404
+    return jsonify(_upload_status(sess))
+
+
+@bp.route("/uploads/materials/<upload_id>/chunk/<int:index>", methods=["PUT"])
+def upload_material_chunk(upload_id, index):
+    if "admin_id" not in session:
+        return jsonify(error="unauthorized"), 401
+    sess = _upload_session(upload_id)
+    if not sess:
+        return jsonify(error="Upload not found."), 404
+    if sess["status"] != "uploading":
+        return jsonify(error="Upload already finalized."), 409
+    if index < 0 or index >= sess["total_chunks"]:
+        return jsonify(error="Chunk index out of range."), 400
+
+    offset   = index * sess["chunk_size"]
+    expected = min(sess["chunk_size"], sess["size"] - offset)
+    part     = os.path.join(current_app.config["UPLOAD_FOLDER_PARTIAL"], f"{sess['_id']}.part")
+
+    written = 0
+    started = time.perf_counter()
+    try:
+        fh = open(part, "r+b")
+    except FileNotFoundError:
+        # finalize (atau cleanup) memindahkan file .part setelah cek status di atas
+        return jsonify(error="Upload already finalized."), 409
+    with fh:
+        fh.seek(offset)
+        while written < expected:
+            block = request.stream.read(min(UPLOAD_STREAM_BLOCK, expected - written))
+            if not block:
+                break
+            fh.write(block)
+            written += len(block)
+
+    if written != expected or request.stream.read(1):
+        return jsonify(error=f"Chunk {index} must be exactly {expected} bytes."), 400
+    record_upload(written, time.perf_counter() - started)
+
+    db.upload_sessions.update_one({"_id": sess["_id"], "status": "uploading"}, {"$addToSet": {"received": index}})
+    return jsonify(upload_id=str(sess["_id"]), index=index, bytes=written)
+
+
+@bp.route("/uploads/materials/<upload_id>/finalize", methods=["POST"])
+def upload_material_finalize(upload_id):
+    if "admin_id" not in session:
+        return jsonify(error="unauthorized"), 401
+    sess = _upload_session(upload_id)
+    if not sess:
+        return jsonify(error="Upload not found."), 404
+    if sess["status"] in ("done", "attached"):
+        return jsonify(_upload_status(sess))
+
+    missing = sorted(set(range(sess["total_chunks"])) - set(sess.get("received", [])))
+    if missing:
+        return jsonify(error="Upload incomplete.", missing=missing[:100]), 409
+
+    # Klaim sesi secara atomik: finalize kedua (atau chunk yang terlambat)
+    # melihat status "finalizing" dan tidak menyentuh file .part lagi
+    claimed = db.upload_sessions.find_one_and_update(
+        {"_id": sess["_id"], "status": "uploading"},
+        {"$set": {"status": "finalizing"}}
+    )
+    if not claimed:
+        current = db.upload_sessions.find_one({"_id": sess["_id"]})
+        if current and current["status"] in ("done", "attached"):
+            return jsonify(_upload_status(current))
+        return jsonify(error="Upload is being finalized."), 409
+
+    ts = datetime.now().strftime("%Y%m%d%H%M%S")
+    _, ext = os.path.splitext(sess["original_filename"])
+    new_fn = f"{ts}_{str(sess['_id'])[-6:]}{ext}"
+    try:
+        shutil.move(
+            os.path.join(current_app.config["UPLOAD_FOLDER_PARTIAL"], f"{sess['_id']}.part"),
+            os.path.join(current_app.config["UPLOAD_FOLDER_MATERIALS"], new_fn)
+        )
+    except OSError:
+        db.upload_sessions.update_one({"_id": sess["_id"]}, {"$set": {"status": "uploading"}})
+        raise
+
+    # Opsional: langsung lampirkan ke materi yang sudah ada
+    material_id = (request.get_json(silent=True) or {}).get("material_id")
+    attach = bool(
+        material_id and ObjectId.is_valid(material_id)
+        and db.materials.find_one({"_id": ObjectId(material_id)}, {"_id": 1})
+    )
+    status = "attached" if attach else "done"
+    db.upload_sessions.update_one(
+        {"_id": sess["_id"]},
+        {"$set": {"status": status, "filename": new_fn, "finished_at": datetime.now(timezone.utc)}}
+    )
+    if attach:
+        db.materials.update_one({"_id": ObjectId(material_id)}, {"$push": {"filenames": new_fn}})
+        log_admin_action(session["admin_id"], session["admin_username"], f"Attached file to material {material_id}")
+
+    sess.update(status=status, filename=new_fn)
+    return jsonify(_upload_status(sess))
+
+
+@bp.cli.command("cleanup-uploads")
+def cleanup_uploads_command():
+    """Hapus sesi chunked upload yang tidak selesai melewati batas waktu."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=current_app.config["UPLOAD_SESSION_TTL_HOURS"])
+    stale = list(db.upload_sessions.find(
+        {"status": {"$in": ["uploading", "finalizing"]}, "created_at": {"$lt": cutoff}}, {"_id": 1}
+    ))
+    for sess in stale:
+        part = os.path.join(current_app.config["UPLOAD_FOLDER_PARTIAL"], f"{sess['_id']}.part")
+        if os.path.exists(part):
+            os.remove(part)
+    db.upload_sessions.delete_many({"_id": {"$in": [s["_id"] for s in stale]}})
+    db.upload_sessions.delete_many({"status": {"$in": ["done", "attached"]}, "created_at": {"$lt": cutoff}})
+    click.echo(f"Removed {len(stale)} stale upload(s).")
+
+
+@bp.cli.command("move-material-files")
+def move_material_files_command():
+    """Pindahkan berkas materi lama dari static/images/materials ke UPLOAD_FOLDER_MATERIALS."""
+    legacy = join(STATIC_DIR, "images/materials")
+    folder = current_app.config["UPLOAD_FOLDER_MATERIALS"]
+    if not os.path.isdir(legacy) or os.path.abspath(legacy) == os.path.abspath(folder):
+        click.echo("Nothing to move.")
+        return
+    moved = 0
+    for name in os.listdir(legacy):
+        src = join(legacy, name)
+        if os.path.isfile(src) and not os.path.exists(join(folder, name)):
+            shutil.move(src, join(folder, name))
+            moved += 1
+    click.echo(f"Moved {moved} material file(s) to {folder}.")
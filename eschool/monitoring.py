@@ -0,0 +1,212 @@
+# eschool/monitoring.py
+import os
+import hmac
+import time
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+from flask import (
+    Response, abort, current_app, request,
+    before_render_template, template_rendered
+)
+
+from .db import _db_profile
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess as prometheus_multiprocess
+except ImportError:  # prometheus_client opsional: tanpa paket ini /metrics nonaktif
+    prometheus_client = None
+
+# ----------------------------------------- #
+# 4k) PROFILER QUERY PER REQUEST            #
+# ----------------------------------------- #
+# Jumlah command, total waktu DB dan command terlambat per request
+# dikirim lewat header Server-Timing; request di atas SLOW_REQUEST_MS
+# dicatat ke log. Riwayat terakhir bisa dilihat superadmin di
+# /admin/debug/queries.
+PROFILER_SKIP_ENDPOINTS = {"static", "static_build", "admin.debug_queries"}
+
+
+def profile_history():
+    """Riwayat profil request terakhir di worker ini (terbaru dulu)."""
+    return current_app.extensions["profile_history"]
+
+
+def start_request_profile():
+    if current_app.config["DB_PROFILER"]:
+        _db_profile.current = {"pending": {}, "commands": [], "start": time.perf_counter()}
+
+
+def finish_request_profile(response):
+    profile = getattr(_db_profile, "current", None)
+    if profile is None:
+        return response
+
+    total_ms = (time.perf_counter() - profile["start"]) * 1000
+    commands = profile["commands"]
+    db_ms = sum(c["ms"] for c in commands)
+    slowest = max(commands, key=lambda c: c["ms"], default=None)
+
+    response.headers["Server-Timing"] = (
+        f'db;dur={db_ms:.1f};desc="{len(commands)} queries", app;dur={total_ms:.1f}'
+    )
+
+    if total_ms >= current_app.config["SLOW_REQUEST_MS"]:
+        current_app.logger.warning(
+            "Slow request %s %s: %.0f ms total, %d queries, %.0f ms db, slowest %s",
+            request.method, request.full_path, total_ms, len(commands), db_ms,
+            f"{slowest['command']} {slowest['collection']} {slowest['ms']:.0f} ms" if slowest else "-"
+        )
+
+    if request.endpoint not in PROFILER_SKIP_ENDPOINTS:
+        profile_history().appendleft({
+            "at": datetime.now(timezone.utc),
+            "method": request.method,
+            "path": request.full_path.rstrip("?"),
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "total_ms": total_ms,
+            "db_ms": db_ms,
+            "commands": commands,
+        })
+    return response
+
+
+def clear_request_profile(exc=None):
+    _db_profile.current = None
+
+
+# ----------------------------------------- #
+# 4l) METRICS PROMETHEUS                    #
+# ----------------------------------------- #
+# Latensi & status per endpoint, request aktif, waktu render Jinja,
+# waktu command MongoDB dan throughput upload, dalam format Prometheus
+# di /metrics. Akses butuh header `Authorization: Bearer <METRICS_TOKEN>`
+# dan IP di METRICS_ALLOWED_IPS; tanpa METRICS_TOKEN endpoint ini 404
+# (di belakang nginx semua request tampak dari 127.0.0.1).
+# Dengan beberapa worker, set PROMETHEUS_MULTIPROC_DIR ke direktori
+# kosong yang sama untuk semua worker; /metrics lalu menggabungkan
+# nilai dari seluruh proses.
+METRICS_AVAILABLE = prometheus_client is not None
+METRICS_MULTIPROC = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+if METRICS_AVAILABLE:
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        "eschool_request_duration_seconds", "Request latency per endpoint",
+        ["endpoint", "method"]
+    )
+    REQUEST_COUNT = prometheus_client.Counter(
+        "eschool_requests_total", "Requests per endpoint and status",
+        ["endpoint", "method", "status"]
+    )
+    REQUESTS_ACTIVE = prometheus_client.Gauge(
+        "eschool_requests_active", "Requests currently in progress",
+        multiprocess_mode="livesum"
+    )
+    TEMPLATE_LATENCY = prometheus_client.Histogram(
+        "eschool_template_render_seconds", "Jinja render time per template",
+        ["template"]
+    )
+    DB_LATENCY = prometheus_client.Histogram(
+        "eschool_db_command_seconds", "MongoDB command time",
+        ["command"], buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5)
+    )
+    REQUEST_DB_TIME = prometheus_client.Histogram(
+        "eschool_request_db_seconds", "Total MongoDB time per request",
+        ["endpoint"]
+    )
+    UPLOAD_BYTES = prometheus_client.Counter(
+        "eschool_upload_bytes_total", "Bytes written by file uploads", ["endpoint"]
+    )
+    UPLOAD_SECONDS = prometheus_client.Counter(
+        "eschool_upload_seconds_total", "Time spent writing file uploads", ["endpoint"]
+    )
+
+_metrics_local = threading.local()
+
+
+def metrics_enabled():
+    return current_app.extensions.get("metrics", False)
+
+
+def record_upload(nbytes, seconds):
+    if metrics_enabled():
+        endpoint = request.endpoint or "unknown"
+        UPLOAD_BYTES.labels(endpoint).inc(nbytes)
+        UPLOAD_SECONDS.labels(endpoint).inc(seconds)
+
+
+def _template_render_started(sender, template, context, **extra):
+    _metrics_local.__dict__.setdefault("renders", []).append(time.perf_counter())
+
+
+def _template_render_finished(sender, template, context, **extra):
+    renders = getattr(_metrics_local, "renders", None)
+    if renders:
+        TEMPLATE_LATENCY.labels(template.name or "string").observe(time.perf_counter() - renders.pop())
+
+
+def start_request_metrics():
+    _metrics_local.start = time.perf_counter()
+    REQUESTS_ACTIVE.inc()
+
+
+def record_request_metrics(response):
+    endpoint = request.endpoint or "unmatched"
+    start = getattr(_metrics_local, "start", None)
+    if start is not None:
+        REQUEST_LATENCY.labels(endpoint, request.method).observe(time.perf_counter() - start)
+    REQUEST_COUNT.labels(endpoint, request.method, str(response.status_code)).inc()
+
+    profile = getattr(_db_profile, "current", None)
+    if profile is not None:
+        for c in profile["commands"]:
+            DB_LATENCY.labels(c["command"]).observe(c["ms"] / 1000)
+        REQUEST_DB_TIME.labels(endpoint).observe(sum(c["ms"] for c in profile["commands"]) / 1000)
+    return response
+
+
+def finish_request_metrics(exc=None):
+    if getattr(_metrics_local, "start", None) is not None:
+        _metrics_local.start = None
+        REQUESTS_ACTIVE.dec()
+
+
+def _metrics_authorized():
+    token = current_app.config["METRICS_TOKEN"]
+    if not token or request.remote_addr not in current_app.config["METRICS_ALLOWED_IPS"]:
+        return False
+    auth = request.authorization
+    return (auth is not None and auth.type == "bearer"
+            and hmac.compare_digest((auth.token or "").encode(), token.encode()))
+
+
+def metrics():
+    if not metrics_enabled() or not _metrics_authorized():
+        abort(404)
+
+    if METRICS_MULTIPROC:
+        registry = prometheus_client.CollectorRegistry()
+        prometheus_multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(prometheus_client.generate_latest(registry),
+                    mimetype=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def init_app(app):
+    app.extensions["profile_history"] = deque(maxlen=app.config["PROFILER_HISTORY"])
+    app.before_request(start_request_profile)
+    app.after_request(finish_request_profile)
+    app.teardown_request(clear_request_profile)
+
+    app.extensions["metrics"] = METRICS_AVAILABLE and app.config["METRICS"]
+    if app.extensions["metrics"]:
+        before_render_template.connect(_template_render_started, app)
+        template_rendered.connect(_template_render_finished, app)
+        app.before_request(start_request_metrics)
+        app.after_request(record_request_metrics)
+        app.teardown_request(finish_request_metrics)
+    app.add_url_rule("/metrics", "metrics", metrics)
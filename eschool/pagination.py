@@ -0,0 +1,86 @@
+# eschool/pagination.py
+import re
+import json
+import base64
+import binascii
+from datetime import datetime
+from math import ceil
+
+from bson.objectid import ObjectId
+from flask import request
+
+
+# ----------------------------------------- #
+# 4e) HELPER: KEYSET (CURSOR) PAGINATION    #
+# ----------------------------------------- #
+# Token cursor bersifat opak bagi klien: base64 dari posisi
+# (created_at, _id) dokumen batas plus nomor halaman tujuannya.
+def encode_cursor(doc, page, sort_field="created_at"):
+    payload = {
+        "v": doc[sort_field].isoformat(),
+        "id": str(doc["_id"]),
+        "p": page
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Kembalikan (nilai sort, ObjectId, halaman) atau None bila token rusak."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        return (
+            datetime.fromisoformat(payload["v"]),
+            ObjectId(payload["id"]),
+            max(int(payload["p"]), 1)
+        )
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        return None
+
+
+def keyset_filter(value, obj_id, direction, sort_field="created_at"):
+    """Filter untuk dokumen setelah ("after") / sebelum ("before") posisi cursor."""
+    op = "$lt" if direction == "after" else "$gt"
+    return {"$or": [
+        {sort_field: {op: value}},
+        {sort_field: value, "_id": {op: obj_id}}
+    ]}
+
+
+# ----------------------------------------- #
+# 4f) HELPER: PAGINASI DI SISI MONGODB      #
+# ----------------------------------------- #
+def get_page_arg(name="page"):
+    try:
+        return max(int(request.args.get(name, 1)), 1)
+    except ValueError:
+        return 1
+
+
+def paginate(collection, query=None, sort=None, page=1, per_page=5, projection=None):
+    """Filter, sort, skip/limit dan count dijalankan di MongoDB; hanya
+    baris halaman aktif yang diambil."""
+    query = query or {}
+    total = collection.count_documents(query)
+    total_pages = max(ceil(total / per_page), 1)
+    page = min(max(page, 1), total_pages)
+
+    cursor = collection.find(query, projection)
+    if sort:
+        cursor = cursor.sort(sort)
+    items = list(cursor.skip((page - 1) * per_page).limit(per_page))
+
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": total_pages
+    }
+
+
+def regex_search(fields, keyword):
+    """Filter $or pencarian case-insensitive; keyword di-escape."""
+    pattern = re.escape(keyword)
+    return {"$or": [{f: {"$regex": pattern, "$options": "i"}} for f in fields]}
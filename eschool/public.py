@@ -0,0 +1,334 @@
+# eschool/public.py
+import re
+from math import ceil
+from datetime import datetime, timezone, timedelta
+
+from bson.objectid import ObjectId
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+
+from .cache import cached_page, get_singleton
+from .content import MEDIA_NEWEST_FIRST, ensure_media, get_category_stats, save_comment
+from .db import db
+from .pagination import encode_cursor, decode_cursor, keyset_filter, get_page_arg, paginate
+from .search import search_collection
+from .security import get_recaptcha_verifier
+
+bp = Blueprint("public", __name__, cli_group=None)
+
+
+# ------------------------------- #
+# 5) PUBLIC (FRONTEND) ROUTES     #
+# ------------------------------- #
+@bp.route("/")
+@cached_page("publications")
+def home():
+    facilities = list(db.facilities.find())
+    about_data = db.about.find_one()
+    publications = list(db.publications.find().sort("created_at", -1).limit(3))
+    return render_template(
+        "user/index.html",
+        about=about_data,
+        active_page="home",
+        facilities=facilities,
+        publications=publications
+    )
+
+
+@bp.route("/about")
+@cached_page()
+def about():
+    about_data = db.about.find_one()
+    return render_template("user/about.html", about=about_data, active_page="about")
+
+
+@bp.route("/extracurricular")
+@cached_page("extracurricular")
+def extracurricular_page():
+    data = list(db.extracurricular.find())
+    return render_template("user/extracurricular.html", active_page="extracurricular_page", extracurriculars=data)
+
+
+@bp.route("/extracurricular/<extracurricular_id>")
+@cached_page("extracurricular")
+def extracurricular_detail(extracurricular_id):
+    try:
+        obj_id = ObjectId(extracurricular_id)
+    except:
+        return redirect(url_for("public.extracurricular_page"))
+
+    extracurricular = db.extracurricular.find_one({"_id": obj_id})
+    if not extracurricular:
+        return redirect(url_for("public.extracurricular_page"))
+
+    other_extracurriculars = list(db.extracurricular.find({"_id": {"$ne": obj_id}}).limit(3))
+
+    return render_template(
+        "user/detail_extracurricular.html",
+        extracurricular_data=extracurricular,
+        other_classes=other_extracurriculars,
+        active_page="extracurricular",
+        detail_type="extracurricular"
+    )
+
+
+@bp.route("/teachers")
+@cached_page("teachers")
+def teachers():
+    # Ambil daftar guru dari DB, urutkan berdasarkan nama
+    teacher_docs = list(db.teachers.find().sort("name", 1))
+    return render_template(
+        "user/teachers.html",
+        active_page="teacher",
+        teachers=teacher_docs
+    )
+
+
+@bp.route("/gallery")
+@cached_page("media")
+def gallery():
+    ensure_media()
+
+    # Filter kategori & pagination di MongoDB (koleksi media)
+    category = request.args.get("category", "").strip()
+    query = {"category": category} if category else {}
+    result = paginate(db.media, query, MEDIA_NEWEST_FIRST, get_page_arg(), per_page=12)
+
+    return render_template(
+        "user/gallery.html",
+        active_page="gallery",
+        galleries=result["items"],
+        category=category,
+        page=result["page"],
+        total_pages=result["total_pages"]
+    )
+
+
+@bp.route("/news_articles")
+@cached_page("publications", "comments")
+def news_articles():
+    per_page = 5
+    newest_first = [("created_at", -1), ("_id", -1)]
+
+    # Sidebar: jumlah & artikel terbaru per kategori (dari publication_categories)
+    category_stats = get_category_stats()
+    category_counts = {c["_id"]: c["count"] for c in category_stats}
+    latest_by_category = {c["_id"]: c.get("latest", []) for c in category_stats}
+
+    # Total artikel diambil dari statistik kategori (tanpa count_documents)
+    total_articles = sum(category_counts.values())
+    total_pages = ceil(total_articles / per_page)
+
+    # ?after=/?before= → keyset; ?page=N (link lama) → skip biasa
+    after  = decode_cursor(request.args.get("after", ""))
+    before = decode_cursor(request.args.get("before", ""))
+
+    if after:
+        value, obj_id, page = after
+        all_articles = list(
+            db.publications.find(keyset_filter(value, obj_id, "after"))
+                           .sort(newest_first).limit(per_page)
+        )
+    elif before:
+        value, obj_id, page = before
+        all_articles = list(
+            db.publications.find(keyset_filter(value, obj_id, "before"))
+                           .sort([("created_at", 1), ("_id", 1)]).limit(per_page)
+        )
+        all_articles.reverse()
+    else:
+        try:
+            page = max(int(request.args.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+        all_articles = list(
+            db.publications.find().sort(newest_first)
+                           .skip((page - 1) * per_page).limit(per_page)
+        )
+
+    next_cursor = prev_cursor = None
+    if all_articles and page < total_pages:
+        next_cursor = encode_cursor(all_articles[-1], page + 1)
+    if all_articles and page > 1:
+        prev_cursor = encode_cursor(all_articles[0], page - 1)
+
+    # Buat pagination
+    if total_pages <= 5:
+        pages = list(range(1, total_pages + 1))
+    elif page <= 3:
+        pages = list(range(1, 6))
+    elif page >= total_pages - 2:
+        pages = list(range(total_pages - 4, total_pages + 1))
+    else:
+        pages = list(range(page - 2, page + 3))
+
+    return render_template(
+        "user/news_articles.html",
+        active_page="news_articles",
+        articles=all_articles,
+        category_counts=category_counts,
+        latest_by_category=latest_by_category,
+        page=page,
+        pages=pages,
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor
+    )
+
+
+@bp.route("/single/<article_id>", methods=["GET", "POST"])
+@cached_page("publications", "comments")
+def single(article_id):
+    try:
+        obj_id = ObjectId(article_id)
+    except:
+        return "Invalid article ID", 404
+
+    article = db.publications.find_one({"_id": obj_id})
+    if not article:
+        return "Article not found", 404
+
+    if request.method == "POST":
+        name = request.form.get("name", "").strip()
+        email = request.form.get("email", "").strip()
+        message = request.form.get("message", "").strip()
+
+        comment_doc = {
+            "article_id": article_id,
+            "name": name,
+            "email": email,
+            "text": message,
+            "avatar_url": None,
+            "created_at": datetime.now(timezone.utc)
+        }
+        save_comment(comment_doc)
+        flash("Comment submitted successfully.", "success")
+        return redirect(url_for("public.single", article_id=article_id))
+
+    comments_list = list(
+        db.comments.find({"article_id": article_id}).sort("created_at", 1)
+    )
+    for c in comments_list:
+        c["created_at_formatted"] = c["created_at"].strftime("%d %b %Y at %I:%M %p")
+
+    # Related posts (exclude current)
+    related_docs = list(
+        db.publications.find({
+            "_id": {"$ne": obj_id},
+            "category": article.get("category")
+        }).sort("created_at", -1).limit(3)
+    )
+    related_posts = []
+    for r in related_docs:
+        r["comments_count"] = r.get("comment_count", 0)
+        related_posts.append(r)
+
+    # Latest posts dari kategori yang sama
+    latest_posts = list(
+        db.publications.find({
+            "_id": {"$ne": obj_id},
+            "category": article.get("category")
+        }).sort("created_at", -1).limit(3)
+    )
+
+    stats_counts = {c["_id"]: c["count"] for c in get_category_stats()}
+    category_counts = {
+        cat: stats_counts.get(cat, 0)
+        for cat in ["News", "Articles", "Announcement", "Event"]
+    }
+
+    return render_template(
+        "user/single.html",
+        article=article,
+        related_posts=related_posts,
+        comments=comments_list,
+        category_counts=category_counts,
+        latest_posts=latest_posts,
+        active_page="single"
+    )
+
+@bp.route("/contact")
+def contact():
+    contact_data = db.contact.find_one() or {}
+
+    return render_template(
+        "user/contact.html",
+        active_page="contact",
+        contact=contact_data
+    )
+
+@bp.route("/search")
+def search():
+    keyword = request.args.get("q", "").strip()
+    results = {"publications": [], "materials": [], "teachers": []}
+
+    if keyword:
+        results["publications"] = search_collection(
+            "publications", keyword, [("created_at", -1)], per_page=6)["items"]
+        results["materials"] = search_collection(
+            "materials", keyword, [("created_at", -1)], per_page=6)["items"]
+        results["teachers"] = search_collection(
+            "teachers", keyword, [("name", 1)], per_page=6)["items"]
+
+    return render_template(
+        "user/search.html",
+        active_page="search",
+        keyword=keyword,
+        results=results
+    )
+
+
+@bp.route("/send_message", methods=["POST"])
+def submit_contact_message():
+    name    = request.form.get("name", "").strip()
+    email   = request.form.get("email", "").strip()
+    subject = request.form.get("subject", "").strip()
+    message = request.form.get("message", "").strip()
+    recaptcha_response = request.form.get("g-recaptcha-response")
+
+    # Validasi reCAPTCHA
+    if not recaptcha_response:
+        flash("Verifikasi CAPTCHA diperlukan.", "danger")
+        return redirect(url_for("public.contact"))
+
+    if not get_recaptcha_verifier().verify(recaptcha_response, request.remote_addr):
+        flash("Verifikasi CAPTCHA gagal. Silakan coba lagi.", "danger")
+        return redirect(url_for("public.contact"))
+
+    # Validasi email
+    if not re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email):
+        flash("Alamat email tidak valid.", "danger")
+        return redirect(url_for("public.contact"))
+
+    # Cek duplikat pesan dalam 5 menit
+    if db.contact_messages.find_one({"email": email, "created_at": {"$gt": datetime.now(timezone.utc) - timedelta(minutes=5)}}):
+        flash("Anda sudah mengirim pesan. Silakan tunggu beberapa menit.", "warning")
+        return redirect(url_for("public.contact"))
+
+    # Simpan pesan
+    db.contact_messages.insert_one({
+        "name": name,
+        "email": email,
+        "subject": subject,
+        "message": message,
+        "created_at": datetime.now(timezone.utc)
+    })
+
+    flash("Pesan Anda berhasil dikirim.", "success")
+    return redirect(url_for("public.contact"))
+
+
+# ------------------------------- #
+# 5b) CONTEXT TEMPLATE GLOBAL     #
+# ------------------------------- #
+@bp.app_context_processor
+def inject_settings():
+    settings = get_singleton("settings")
+    return {'settings': settings}
+
+
+@bp.app_context_processor
+def inject_globals():
+    settings = {k: v for k, v in get_singleton("settings").items() if k != "_id"}
+    contact  = {k: v for k, v in get_singleton("contact").items() if k != "_id"}
+    about    = {k: v for k, v in get_singleton("about").items() if k != "_id"}
+    return dict(settings=settings, contact=contact, about=about)
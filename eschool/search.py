@@ -0,0 +1,133 @@
+# eschool/search.py
+import re
+import time
+import threading
+from collections import OrderedDict
+from math import ceil
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+from .db import db
+from .indexes import SEARCH_FIELDS, SEARCH_FULLTEXT_ONLY
+
+# ----------------------------------------- #
+# 4g) HELPER: PENCARIAN                     #
+# ----------------------------------------- #
+# Kata utuh dicari lewat text index (diurutkan berdasarkan textScore).
+# Jika tidak ada hasil, setiap kata diperlakukan sebagai prefix dan
+# dicocokkan ke field `search_terms` (regex berjangkar ^ → tetap pakai index).
+# Daftar _id hasil disimpan di cache LRU kecil; halaman hasil diambil ulang
+# dari DB sehingga perubahan/penghapusan dokumen tetap terlihat.
+SEARCH_MAX_TERMS = 200
+
+_search_cache = OrderedDict()
+_search_version = 0
+_search_lock = threading.Lock()
+
+
+def tokenize(text):
+    return re.findall(r"\w+", re.sub(r"<[^>]+>", " ", text or "").lower())
+
+
+def search_terms_for(collection_name, doc):
+    """Token unik dari field yang dapat dicari; disimpan di doc["search_terms"].
+
+    Fungsi murni. Write path memanggil invalidate_search_cache() setelah
+    dokumen tersimpan, agar request lain tidak mengisi ulang cache dengan
+    data lama di antara keduanya."""
+    terms = set()
+    for field in SEARCH_FIELDS[collection_name]:
+        if field not in SEARCH_FULLTEXT_ONLY:
+            terms.update(tokenize(str(doc.get(field) or "")))
+    return sorted(terms)[:SEARCH_MAX_TERMS]
+
+
+def invalidate_search_cache():
+    global _search_version
+    with _search_lock:
+        _search_version += 1
+        _search_cache.clear()
+
+
+def _search_ids(collection_name, keyword, default_sort):
+    key = (collection_name, keyword.lower(), _search_version)
+    now = time.monotonic()
+    with _search_lock:
+        cached = _search_cache.get(key)
+        if cached and cached[0] > now:
+            _search_cache.move_to_end(key)
+            return cached[1]
+
+    coll  = db[collection_name]
+    limit = current_app.config["SEARCH_MAX_RESULTS"]
+    try:
+        ids = [
+            d["_id"] for d in coll.find(
+                {"$text": {"$search": keyword}},
+                {"_id": 1, "score": {"$meta": "textScore"}}
+            ).sort([("score", {"$meta": "textScore"})]).limit(limit)
+        ]
+    except OperationFailure as e:
+        # text index belum ada (DB baru, `flask ensure-indexes` belum jalan)
+        current_app.logger.warning("Text search on %s failed, using prefix search: %s", collection_name, e)
+        ids = []
+
+    tokens = tokenize(keyword)
+    if not ids and tokens:
+        prefix_query = {"$and": [
+            {"search_terms": {"$regex": "^" + re.escape(t)}} for t in tokens
+        ]}
+        ids = [d["_id"] for d in coll.find(prefix_query, {"_id": 1}).sort(default_sort).limit(limit)]
+
+    with _search_lock:
+        _search_cache[key] = (now + current_app.config["SEARCH_CACHE_TTL"], ids)
+        while len(_search_cache) > current_app.config["SEARCH_CACHE_SIZE"]:
+            _search_cache.popitem(last=False)
+    return ids
+
+
+def search_collection(collection_name, keyword, default_sort, page=1, per_page=5):
+    """Seperti paginate(), tetapi untuk hasil pencarian yang diurutkan relevansi."""
+    ids = _search_ids(collection_name, keyword, default_sort)
+    total = len(ids)
+    total_pages = max(ceil(total / per_page), 1)
+    page = min(max(page, 1), total_pages)
+
+    page_ids = ids[(page - 1) * per_page:page * per_page]
+    docs = {d["_id"]: d for d in db[collection_name].find({"_id": {"$in": page_ids}})}
+
+    return {
+        "items": [docs[i] for i in page_ids if i in docs],
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": total_pages
+    }
+
+
+@click.command("rebuild-search-terms")
+@with_appcontext
+def rebuild_search_terms_command():
+    """Isi ulang field search_terms untuk semua koleksi yang dapat dicari."""
+    for coll_name, fields in SEARCH_FIELDS.items():
+        ops = []
+        for doc in db[coll_name].find({}, {f: 1 for f in fields}):
+            ops.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {"search_terms": search_terms_for(coll_name, doc)}}
+            ))
+            if len(ops) >= 1000:
+                db[coll_name].bulk_write(ops, ordered=False)
+                ops = []
+        if ops:
+            db[coll_name].bulk_write(ops, ordered=False)
+        click.echo(f"search_terms rebuilt for {coll_name}.")
+    invalidate_search_cache()
+
+
+def init_app(app):
+    app.cli.add_command(rebuild_search_terms_command)
@@ -0,0 +1,188 @@
+# eschool/security.py
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from datetime import datetime, timezone, timedelta
+
+import bcrypt
+from flask import current_app
+from pymongo import UpdateOne
+
+from .db import db
+
+# ─── Verifikasi reCAPTCHA ────────────────
+# Satu session HTTP (keep-alive, pool koneksi) per proses, timeout ketat,
+# dan circuit breaker: setelah RECAPTCHA_BREAKER_THRESHOLD kegagalan
+# berturut-turut, Google tidak dipanggil selama RECAPTCHA_BREAKER_COOLDOWN
+# detik dan hasilnya ditentukan oleh RECAPTCHA_FAIL_OPEN.
+# RECAPTCHA_VERIFIER=stub memakai verifier lokal untuk load test offline.
+RECAPTCHA_VERIFY_URL = "https://www.google.com/recaptcha/api/siteverify"
+
+
+class RecaptchaVerifier:
+    """Verifikasi token ke Google siteverify."""
+
+    def __init__(self, config, logger):
+        # `requests` baru diimpor saat form kontak pertama diverifikasi,
+        # bukan saat worker boot
+        import requests
+        self.requests = requests
+        self.config = config
+        self.logger = logger
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=10)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+
+    def verify(self, token, remote_ip=None):
+        with self._lock:
+            if time.monotonic() < self._open_until:
+                return self.config["RECAPTCHA_FAIL_OPEN"]
+
+        try:
+            resp = self.session.post(
+                RECAPTCHA_VERIFY_URL,
+                data={"secret": self.config["RECAPTCHA_SECRET_KEY"], "response": token, "remoteip": remote_ip},
+                timeout=(self.config["RECAPTCHA_CONNECT_TIMEOUT"], self.config["RECAPTCHA_READ_TIMEOUT"])
+            )
+            resp.raise_for_status()
+            success = bool(resp.json().get("success"))
+        except (self.requests.RequestException, ValueError) as e:
+            self._record_failure(e)
+            return self.config["RECAPTCHA_FAIL_OPEN"]
+
+        with self._lock:
+            self._failures = 0
+        return success
+
+    def _record_failure(self, error):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.config["RECAPTCHA_BREAKER_THRESHOLD"]:
+                self._open_until = time.monotonic() + self.config["RECAPTCHA_BREAKER_COOLDOWN"]
+                self._failures = 0
+                self.logger.error("reCAPTCHA circuit open for %ss: %s",
+                                  self.config["RECAPTCHA_BREAKER_COOLDOWN"], error)
+            else:
+                self.logger.warning("reCAPTCHA verification failed: %s", error)
+
+
+class StubRecaptchaVerifier:
+    """Verifier lokal tanpa jaringan: token apa pun lolos kecuali "fail"."""
+
+    def __init__(self, config, logger):
+        self.config = config
+
+    def verify(self, token, remote_ip=None):
+        return token != "fail"
+
+
+RECAPTCHA_VERIFIERS = {"google": RecaptchaVerifier, "stub": StubRecaptchaVerifier}
+
+
+def get_recaptcha_verifier():
+    app = current_app._get_current_object()
+    if "recaptcha" not in app.extensions:
+        verifier_cls = RECAPTCHA_VERIFIERS[app.config["RECAPTCHA_VERIFIER"]]
+        app.extensions["recaptcha"] = verifier_cls(app.config, app.logger)
+    return app.extensions["recaptcha"]
+
+
+# ─── Hash password & throttling login ────
+# bcrypt sengaja mahal (~250 ms CPU). Semua hash/verify dijalankan di
+# executor kecil dengan batas antrean, sehingga lonjakan percobaan login
+# tidak menghabiskan worker; percobaan gagal dihitung per username dan
+# per IP (jendela tetap di koleksi login_throttle, berlaku lintas proses)
+# dan ditolak sebelum bcrypt dipanggil. Di belakang reverse proxy, set
+# TRUSTED_PROXIES agar IP yang dihitung adalah IP klien (X-Forwarded-For).
+_password_pool = None
+_password_pool_lock = threading.Lock()
+
+
+class PasswordBusy(Exception):
+    """Antrean hashing penuh atau terlalu lama; request sebaiknya ditolak (503)."""
+
+
+def handle_password_busy(e):
+    return "Server is busy. Please try again shortly.", 503, {"Retry-After": "5"}
+
+
+def _password_resources():
+    # executor + semaphore dibuat saat login pertama di proses ini
+    global _password_pool
+    if _password_pool is None:
+        with _password_pool_lock:
+            if _password_pool is None:
+                workers = current_app.config["PASSWORD_WORKERS"]
+                _password_pool = (
+                    ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt"),
+                    threading.BoundedSemaphore(workers + current_app.config["PASSWORD_QUEUE_MAX"]),
+                )
+    return _password_pool
+
+
+def _run_bcrypt(fn, *args):
+    executor, slots = _password_resources()
+    if not slots.acquire(blocking=False):
+        raise PasswordBusy()
+    try:
+        future = executor.submit(fn, *args)
+    except BaseException:
+        slots.release()
+        raise
+    # slot baru dilepas saat job selesai/dibatalkan, bukan saat request
+    # berhenti menunggu; antrean executor tetap dibatasi oleh semaphore
+    future.add_done_callback(lambda f: slots.release())
+    try:
+        return future.result(timeout=current_app.config["PASSWORD_TIMEOUT"])
+    except FuturesTimeout:
+        future.cancel()   # hanya berhasil bila job masih di antrean
+        raise PasswordBusy()
+
+
+def hash_password(password):
+    salt = bcrypt.gensalt(rounds=current_app.config["BCRYPT_ROUNDS"])
+    return _run_bcrypt(bcrypt.hashpw, password.encode("utf-8"), salt).decode()
+
+
+def check_password(password, password_hash):
+    return _run_bcrypt(bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def needs_rehash(password_hash):
+    # format: $2b$<cost>$<salt+hash>
+    try:
+        return int(password_hash.split("$")[2]) != current_app.config["BCRYPT_ROUNDS"]
+    except (IndexError, ValueError):
+        return True
+
+
+def _throttle_ids(username, ip):
+    window = int(time.time()) // current_app.config["LOGIN_WINDOW_SECONDS"]
+    return f"user:{username.lower()}:{window}", f"ip:{ip}:{window}"
+
+
+def login_throttled(username, ip):
+    """True bila username atau IP sudah melewati batas gagal di jendela ini."""
+    user_key, ip_key = _throttle_ids(username, ip)
+    counts = {d["_id"]: d["fails"] for d in db.login_throttle.find({"_id": {"$in": [user_key, ip_key]}})}
+    return (counts.get(user_key, 0) >= current_app.config["LOGIN_MAX_FAILS_USER"]
+            or counts.get(ip_key, 0) >= current_app.config["LOGIN_MAX_FAILS_IP"])
+
+
+def record_login_failure(username, ip):
+    expire_at = datetime.now(timezone.utc) + timedelta(seconds=current_app.config["LOGIN_WINDOW_SECONDS"])
+    db.login_throttle.bulk_write([
+        UpdateOne({"_id": key}, {"$inc": {"fails": 1}, "$setOnInsert": {"expire_at": expire_at}}, upsert=True)
+        for key in _throttle_ids(username, ip)
+    ], ordered=False)
+
+
+def clear_login_failures(username, ip):
+    db.login_throttle.delete_one({"_id": _throttle_ids(username, ip)[0]})
+
+
+def init_app(app):
+    app.register_error_handler(PasswordBusy, handle_password_busy)
@@ -0,0 +1,32 @@
+# eschool/uploads.py
+import os
+import time
+
+from .monitoring import record_upload
+
+# ⇢ Ekstensi file yang diizinkan
+ALLOWED_MATERIAL_EXT = {"pdf", "ppt", "pptx", "doc", "docx", "mp4"}
+ALLOWED_IMAGE_EXT    = {"png", "jpg", "jpeg", "gif"}
+
+
+# ⇢ Fungsi validasi ekstensi
+def allowed_material(filename):
+    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_MATERIAL_EXT
+
+
+def allowed_image(filename):
+    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_IMAGE_EXT
+
+
+def save_upload(file_storage, path):
+    """file.save() dengan pencatatan byte & durasi (rate = bytes/detik)."""
+    start = time.perf_counter()
+    file_storage.save(path)
+    record_upload(os.path.getsize(path), time.perf_counter() - start)
+
+
+def init_app(app):
+    # Folder upload dibuat sekali saat app dibuat, bukan saat import
+    for key, folder in app.config.items():
+        if key.startswith("UPLOAD_FOLDER_"):
+            os.makedirs(folder, exist_ok=True)
@@ -0,0 +1,110 @@
+# gunicorn.conf.py
+# Launcher produksi: `gunicorn app:app` (file ini dibaca otomatis dari
+# direktori kerja). Prefork: satu master + WEB_WORKERS proses, masing-masing
+# dengan WEB_THREADS thread (gthread). Reload tanpa downtime dengan
+# `kill -HUP <pid master>`: worker baru memuat kode terbaru, worker lama
+# menyelesaikan request yang sedang berjalan sampai graceful_timeout.
+#
+# Default dihitung dari jumlah CPU dan WEB_IO_RATIO, yaitu porsi waktu
+# request yang dihabiskan menunggu I/O (MongoDB, disk, reCAPTCHA):
+#   workers = jumlah CPU          → satu proses per core untuk porsi CPU
+#   threads = 1 / (1 - io_ratio)  → thread yang bisa menunggu I/O bergantian
+# Contoh: 4 CPU, io_ratio 0.75 → 4 worker × 4 thread = 16 request bersamaan.
+import os
+import sys
+import shutil
+import subprocess
+from os.path import join, dirname, abspath
+
+from dotenv import load_dotenv
+
+# Paket eschool sengaja tidak diimpor di master (lihat preload_app);
+# .env dibaca di sini agar WEB_* dan MONGO_* dari .env ikut dipakai.
+ROOT_DIR = dirname(abspath(__file__))
+load_dotenv(join(ROOT_DIR, ".env"))
+
+CPU_COUNT = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+WEB_IO_RATIO = min(max(float(os.environ.get("WEB_IO_RATIO", 0.75)), 0.0), 0.95)
+
+bind = os.environ.get("WEB_BIND", f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+workers = int(os.environ.get("WEB_WORKERS", CPU_COUNT))
+threads = int(os.environ.get("WEB_THREADS", max(1, min(32, round(1 / (1 - WEB_IO_RATIO))))))
+worker_class = "gthread"
+
+# Kode aplikasi dimuat di tiap worker, bukan di master, agar HUP memuat
+# ulang kode dan tidak ada client MongoDB yang terbuka sebelum fork.
+preload_app = False
+
+# Worker diganti setelah sejumlah request untuk membatasi pertumbuhan memori
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("WEB_MAX_REQUESTS_JITTER", 200))
+timeout = int(os.environ.get("WEB_TIMEOUT", 60))
+graceful_timeout = int(os.environ.get("WEB_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("WEB_KEEPALIVE", 5))
+
+# Batas header HTTP; batas body/upload ada di MAX_CONTENT_LENGTH (config.py)
+limit_request_line = int(os.environ.get("WEB_LIMIT_REQUEST_LINE", 4094))
+limit_request_fields = int(os.environ.get("WEB_LIMIT_REQUEST_FIELDS", 100))
+limit_request_field_size = int(os.environ.get("WEB_LIMIT_REQUEST_FIELD_SIZE", 8190))
+
+accesslog = os.environ.get("WEB_ACCESS_LOG", "-")
+errorlog = "-"
+
+# ─── Pool MongoDB per worker ────────────
+# Setiap worker punya client sendiri; pool cukup untuk semua thread request
+# plus thread latar (flusher audit & komentar, bcrypt). Total koneksi ke
+# MongoDB ≈ workers × MONGO_MAX_POOL_SIZE.
+os.environ.setdefault("MONGO_MAX_POOL_SIZE", str(threads + 4))
+
+# ─── Index MongoDB ──────────────────────
+# Dibuat sekali saat master start, di proses terpisah (`flask ensure-indexes`)
+# agar master tetap tidak mengimpor eschool; worker & HUP tidak mengulanginya.
+WEB_ENSURE_INDEXES = os.environ.get("WEB_ENSURE_INDEXES", "1") == "1"
+
+# ─── Metrics lintas worker ──────────────
+# /metrics menggabungkan nilai dari semua worker lewat direktori bersama
+if workers > 1:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", join(ROOT_DIR, "instance", "prometheus"))
+
+
+def on_starting(server):
+    if WEB_ENSURE_INDEXES:
+        result = subprocess.run(
+            [sys.executable, "-m", "flask", "--app", "app", "ensure-indexes"],
+            cwd=ROOT_DIR, env={**os.environ, "ENSURE_INDEXES": "0"}
+        )
+        if result.returncode:
+            server.log.warning("flask ensure-indexes exited with %s", result.returncode)
+
+    # nilai dari proses master sebelumnya tidak berlaku lagi
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def _flush_worker(worker):
+    from eschool import flush_buffers
+
+    if hasattr(worker, "wsgi") and hasattr(worker.wsgi, "app_context"):
+        flush_buffers(worker.wsgi)
+
+
+def worker_exit(server, worker):
+    """Worker berhenti normal (HUP, max_requests, shutdown): tulis buffer."""
+    _flush_worker(worker)
+
+
+def worker_abort(worker):
+    """Worker dihentikan karena timeout: coba selamatkan buffer."""
+    _flush_worker(worker)
+
+
+def child_exit(server, worker):
+    # dipanggil di master; hapus gauge live milik worker yang sudah mati
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        try:
+            from prometheus_client import multiprocess
+        except ImportError:
+            return
+        multiprocess.mark_process_dead(worker.pid)
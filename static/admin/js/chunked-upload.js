@@ -0,0 +1,131 @@
+/*
+  Chunked upload untuk berkas materi.
+  Form dengan atribut data-chunked-upload akan mengunggah setiap file
+  per potongan (chunk) ke /uploads/materials/..., lalu hanya mengirim
+  upload_ids ke server. Upload yang terputus dilanjutkan dari chunk
+  terakhir yang diterima (status disimpan di localStorage).
+*/
+'use strict';
+(function () {
+  var BASE = '/uploads/materials';
+  var PARALLEL = 3;
+
+  function storageKey(file) {
+    return 'chunked-upload:' + file.name + ':' + file.size + ':' + file.lastModified;
+  }
+
+  function request(method, url, body, headers) {
+    return fetch(url, {
+      method: method,
+      body: body,
+      headers: headers || {},
+      credentials: 'same-origin'
+    }).then(function (res) {
+      return res.json().then(function (data) {
+        if (!res.ok) throw new Error(data.error || ('HTTP ' + res.status));
+        return data;
+      });
+    });
+  }
+
+  function startSession(file) {
+    var key = storageKey(file);
+    var saved = localStorage.getItem(key);
+    var fresh = function () {
+      return request('POST', BASE + '/init',
+        JSON.stringify({ filename: file.name, size: file.size }),
+        { 'Content-Type': 'application/json' }
+      ).then(function (status) {
+        localStorage.setItem(key, status.upload_id);
+        return status;
+      });
+    };
+    if (!saved) return fresh();
+    // lanjutkan sesi lama bila masih ada di server dan belum dipakai materi lain
+    return request('GET', BASE + '/' + saved).then(function (status) {
+      return status.status === 'attached' ? fresh() : status;
+    }, fresh);
+  }
+
+  function uploadFile(file, onProgress) {
+    return startSession(file).then(function (status) {
+      if (status.status === 'done') return status;
+
+      var received = {};
+      status.received.forEach(function (i) { received[i] = true; });
+      var pending = [];
+      for (var i = 0; i < status.total_chunks; i++) {
+        if (!received[i]) pending.push(i);
+      }
+      var done = status.total_chunks - pending.length;
+
+      function worker() {
+        if (!pending.length) return Promise.resolve();
+        var index = pending.shift();
+        var start = index * status.chunk_size;
+        var blob = file.slice(start, Math.min(start + status.chunk_size, file.size));
+        return request('PUT', BASE + '/' + status.upload_id + '/chunk/' + index, blob,
+          { 'Content-Type': 'application/octet-stream' }
+        ).then(function () {
+          done += 1;
+          onProgress(done / status.total_chunks);
+          return worker();
+        });
+      }
+
+      var workers = [];
+      for (var w = 0; w < PARALLEL; w++) workers.push(worker());
+      return Promise.all(workers).then(function () {
+        return request('POST', BASE + '/' + status.upload_id + '/finalize');
+      });
+    }).then(function (status) {
+      localStorage.removeItem(storageKey(file));
+      return status.upload_id;
+    });
+  }
+
+  function handleSubmit(e) {
+    var form = e.target;
+    var input = form.querySelector('input[type="file"][name="files"]');
+    if (!input || !input.files.length) return;
+    e.preventDefault();
+
+    var button = form.querySelector('[type="submit"]');
+    var label = button ? button.textContent : '';
+    var files = Array.prototype.slice.call(input.files);
+    if (button) button.disabled = true;
+
+    files.reduce(function (chain, file, n) {
+      return chain.then(function (ids) {
+        return uploadFile(file, function (ratio) {
+          if (button) {
+            button.textContent = 'Mengunggah ' + (n + 1) + '/' + files.length +
+              ' (' + Math.round(ratio * 100) + '%)';
+          }
+        }).then(function (id) { return ids.concat([id]); });
+      });
+    }, Promise.resolve([])).then(function (ids) {
+      ids.forEach(function (id) {
+        var hidden = document.createElement('input');
+        hidden.type = 'hidden';
+        hidden.name = 'upload_ids';
+        hidden.value = id;
+        form.appendChild(hidden);
+      });
+      input.value = '';
+      form.submit();
+    }).catch(function (err) {
+      alert('Upload gagal: ' + err.message + '. Kirim ulang untuk melanjutkan.');
+      if (button) {
+        button.disabled = false;
+        button.textContent = label;
+      }
+    });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('form[data-chunked-upload]').forEach(function (form) {
+      form.addEventListener('submit', handleSubmit);
+    });
+  });
+})();